@@ -0,0 +1,537 @@
+from datetime import datetime
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+COLUMNS = ['Company/Position', 'Website', 'Application Date', 'Interview Round', 'Last Contact', 'Status']
+
+STATUS_COLORS = {
+    'Applied': '#4a90e2',    # Blue
+    'Interview': '#f5a623',  # Orange
+    'Rejected': '#d0021b',   # Red
+    'Accepted': '#7ed321'    # Green
+}
+
+# Sort options of the trees: combo box text -> (ApplicationRecord field, descending)
+SORT_OPTIONS = {
+    'Date (Newest First)': ('application_date', True),
+    'Date (Oldest First)': ('application_date', False),
+    'Position (A-Z)': ('position', False),
+    'Position (Z-A)': ('position', True),
+    'Status (A-Z)': ('status', False),
+    'Status (Z-A)': ('status', True),
+    'Interview Round (High-Low)': ('interview_round', True),
+    'Interview Round (Low-High)': ('interview_round', False),
+}
+
+# Order of the applications delivered by Database.iter_companies_with_applications by default
+DEFAULT_SORT_ORDER = ('application_date', True)
+
+# Typed sort keys per field. The application ID breaks ties, so every order is total
+# and matches the ORDER BY of Database.iter_companies_with_applications.
+SORT_KEYS = {
+    'application_date': lambda record: (record.applied_at, record.id),
+    'position': lambda record: (record.position, record.id),
+    'status': lambda record: (record.status, record.id),
+    'interview_round': lambda record: (record.interview_round, record.id),
+}
+
+
+# Company sort options: combo box text -> (CompanyNode field, descending). The aggregates
+# come from the company_stats table and cover all of a company's applications.
+COMPANY_SORT_OPTIONS = {
+    'Name (A-Z)': ('name', False),
+    'Latest Activity': ('last_activity', True),
+    'Most Interview Rounds': ('max_interview_round', True),
+    'Most Applications': ('application_count', True),
+}
+
+# Order of the companies delivered by Database.iter_companies_with_applications by default
+DEFAULT_COMPANY_SORT_ORDER = ('name', False)
+
+# Typed sort keys for company nodes; like SORT_KEYS they match the database's ORDER BY
+COMPANY_SORT_KEYS = {
+    'name': lambda node: node.name,
+    'last_activity': lambda node: (node.last_activity, node.company_id),
+    'max_interview_round': lambda node: (node.max_interview_round, node.company_id),
+    'application_count': lambda node: (node.application_count, node.company_id),
+}
+
+
+def parse_date(text):
+    """
+    Parse a stored 'YYYY-MM-DD HH:MM:SS' (or 'YYYY-MM-DD') date for sorting.
+    Args:
+        text (str): The date as stored in the database.
+    Returns:
+        datetime: The date as a naive local time (dates with a UTC offset are converted, so
+            they compare with the rest), or datetime.min if it is missing or malformed.
+    """
+    try:
+        value = datetime.fromisoformat(text)
+    except (TypeError, ValueError):
+        return datetime.min
+    if value.tzinfo is not None:
+        try:
+            value = value.astimezone().replace(tzinfo=None)
+        except (OverflowError, ValueError):
+            return datetime.min
+    return value
+
+
+class ApplicationRecord:
+    """
+    Compact storage for a single application row.
+    The typed sort values (applied_at, an int interview_round) are computed once here,
+    so sorting never parses display text.
+    """
+    __slots__ = ('id', 'company_id', 'position', 'application_date', 'applied_at',
+                 'interview_round', 'last_contact_date', 'status')
+
+    def __init__(self, id, company_id, position, application_date,
+                 interview_round, last_contact_date, status):
+        self.id = id
+        self.company_id = company_id
+        self.position = position
+        self.application_date = application_date
+        self.applied_at = parse_date(application_date)
+        self.interview_round = interview_round or 0
+        self.last_contact_date = last_contact_date
+        self.status = status
+
+    def column_text(self, column):
+        """
+        Get the display text of this application for a tree column.
+        Args:
+            column (int): Column index, see COLUMNS.
+        Returns:
+            str: The text to display.
+        """
+        if column == 0:
+            return self.position
+        if column == 2:
+            return self.application_date
+        if column == 3:
+            return str(self.interview_round)
+        if column == 4:
+            return str(self.last_contact_date or '')
+        if column == 5:
+            return self.status
+        return ''
+
+
+class CompanyNode:
+    """
+    Top-level tree node holding a company and its applications.
+    Applications are kept in memory but only exposed to the view once the node is fetched.
+    The company's aggregates (see Database.get_company_stats) are kept for sorting.
+    """
+    __slots__ = ('company_id', 'name', 'website', 'applications', 'fetched', 'row',
+                 'application_count', 'max_interview_round', 'last_activity')
+
+    def __init__(self, company_id, name, website, applications=None, stats=(0, 0, None)):
+        self.company_id = company_id
+        self.name = name
+        self.website = website or ''
+        self.applications = applications if applications is not None else []
+        self.fetched = False
+        self.row = 0
+        self.set_stats(stats)
+
+    def set_stats(self, stats):
+        """
+        Store the company's aggregates.
+        Args:
+            stats (tuple): (application_count, max_interview_round, last_activity).
+        """
+        application_count, max_interview_round, last_activity = stats
+        self.application_count = application_count
+        self.max_interview_round = max_interview_round
+        self.last_activity = parse_date(last_activity)
+
+
+def build_company_nodes(companies):
+    """
+    Split companies and their applications into nodes for the active and rejected trees.
+    A company gets a node in each tree that has at least one of its applications.
+    Args:
+        companies (iterable): (company_id, name, description, website_url, applications, stats)
+            tuples, as returned by Database.get_companies_with_applications.
+    Returns:
+        tuple: (active_nodes, rejected_nodes), lists of CompanyNode in input order.
+    """
+    active_nodes = []
+    rejected_nodes = []
+    for company_id, company_name, company_description, website, applications, stats in companies:
+        # Company nodes are created on demand, once per tree
+        active_node = None
+        rejected_node = None
+        for application_id, position, application_date, interview_round, last_contact, status in applications:
+            record = ApplicationRecord(application_id, company_id, position, application_date,
+                                       interview_round, last_contact, status)
+            # Choose which tree to display in
+            if status == 'Rejected':
+                if rejected_node is None:
+                    rejected_node = CompanyNode(company_id, company_name, website, stats=stats)
+                    rejected_nodes.append(rejected_node)
+                rejected_node.applications.append(record)
+            else:
+                if active_node is None:
+                    active_node = CompanyNode(company_id, company_name, website, stats=stats)
+                    active_nodes.append(active_node)
+                active_node.applications.append(record)
+    return active_nodes, rejected_nodes
+
+
+class ApplicationTreeModel(QAbstractItemModel):
+    """
+    Two-level item model of companies and their applications.
+    Company rows are always present; a company's application rows are populated
+    lazily (canFetchMore/fetchMore) when its node is first expanded.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sort_order = DEFAULT_SORT_ORDER  # (field, descending) of the applications in every company
+        self.company_sort_order = DEFAULT_COMPANY_SORT_ORDER  # (field, descending) of the company rows
+        self.companies = []
+        self.company_nodes = {}
+        self.application_nodes = {}
+
+    # Structure
+
+    def set_companies(self, companies):
+        """
+        Replace the model contents.
+        Args:
+            companies (list): List of CompanyNode, in display order.
+        """
+        self.beginResetModel()
+        self.companies = list(companies)
+        self.company_nodes = {}
+        self.application_nodes = {}
+        for row, node in enumerate(self.companies):
+            node.row = row
+            self.company_nodes[node.company_id] = node
+            for record in node.applications:
+                self.application_nodes[record.id] = node
+        self.endResetModel()
+
+    def append_companies(self, companies, sort_order=DEFAULT_SORT_ORDER,
+                         company_sort_order=DEFAULT_COMPANY_SORT_ORDER):
+        """
+        Add company rows at the end of the model, e.g. while data is still loading.
+        Args:
+            companies (list): List of CompanyNode not yet in the model.
+            sort_order (tuple): (field, descending) the applications are already sorted by;
+                they are only re-sorted if the model uses another order.
+            company_sort_order (tuple): (field, descending) the companies are listed in, continuing
+                the rows already in the model. If the model uses another order, all rows are re-sorted.
+        """
+        if not companies:
+            return
+        if sort_order != self.sort_order:
+            field, descending = self.sort_order
+            for node in companies:
+                node.applications.sort(key=SORT_KEYS[field], reverse=descending)
+        first = len(self.companies)
+        self.beginInsertRows(QModelIndex(), first, first + len(companies) - 1)
+        for row, node in enumerate(companies, start=first):
+            node.row = row
+            self.companies.append(node)
+            self.company_nodes[node.company_id] = node
+            for record in node.applications:
+                self.application_nodes[record.id] = node
+        self.endInsertRows()
+        if company_sort_order != self.company_sort_order:
+            # The order was changed while loading, so the new rows are out of place
+            field, descending = self.company_sort_order
+            self.company_sort_order = company_sort_order
+            self.sort_companies(field, descending)
+
+    def _renumber(self, start=0):
+        for row in range(start, len(self.companies)):
+            self.companies[row].row = row
+
+    def _company_row(self, node):
+        """
+        Get the row a company node belongs at in the current company order, ignoring the node itself.
+        """
+        field, descending = self.company_sort_order
+        key = COMPANY_SORT_KEYS[field]
+        node_key = key(node)
+        row = 0
+        for company in self.companies:
+            if company is node:
+                continue
+            company_key = key(company)
+            if (company_key < node_key) if descending else (company_key > node_key):
+                break
+            row += 1
+        return row
+
+    def company_node(self, company_id):
+        """
+        Get the node of a company, or None if the company has no row in this model.
+        """
+        return self.company_nodes.get(company_id)
+
+    def company_index(self, node):
+        """
+        Get the model index of a company node.
+        """
+        return self.createIndex(node.row, 0)
+
+    def application_index(self, application_id):
+        """
+        Get the model index of an application, or an invalid index if it is not (yet) exposed.
+        """
+        node = self.application_nodes.get(application_id)
+        if node is None or not node.fetched:
+            return QModelIndex()
+        for row, record in enumerate(node.applications):
+            if record.id == application_id:
+                return self.createIndex(row, 0, node)
+        return QModelIndex()
+
+    def record(self, index):
+        """
+        Get the application record for an index, or None for company rows and invalid indexes.
+        """
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if node is None:
+            return None
+        return node.applications[index.row()]
+
+    def node(self, index):
+        """
+        Get the company node for an index, or None for application rows and invalid indexes.
+        """
+        if not index.isValid() or index.internalPointer() is not None:
+            return None
+        return self.companies[index.row()]
+
+    def insert_application(self, company_id, company_name, website, record):
+        """
+        Insert one application, creating its company row in name order if needed.
+        The application is placed according to the model's sort order.
+        Args:
+            company_id (int): The ID of the company.
+            company_name (str): Name of the company.
+            website (str): Website URL of the company (may be None).
+            record (ApplicationRecord): The application to insert.
+        Returns:
+            CompanyNode: The node the application was inserted into.
+        """
+        node = self.company_nodes.get(company_id)
+        if node is None:
+            node = CompanyNode(company_id, company_name, website)
+            row = self._company_row(node)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.companies.insert(row, node)
+            self.company_nodes[company_id] = node
+            self._renumber(row)
+            self.endInsertRows()
+
+        field, descending = self.sort_order
+        key = SORT_KEYS[field]
+        new_key = key(record)
+        row = len(node.applications)
+        for i, existing in enumerate(node.applications):
+            existing_key = key(existing)
+            if (existing_key < new_key) if descending else (existing_key > new_key):
+                row = i
+                break
+        if node.fetched:
+            self.beginInsertRows(self.company_index(node), row, row)
+        node.applications.insert(row, record)
+        self.application_nodes[record.id] = node
+        if node.fetched:
+            self.endInsertRows()
+        return node
+
+    def remove_application(self, application_id):
+        """
+        Remove one application. The company row is removed too if it has no applications left.
+        Args:
+            application_id (int): The ID of the application.
+        Returns:
+            tuple: (record, company_removed), or (None, False) if the application is not in this model.
+        """
+        node = self.application_nodes.pop(application_id, None)
+        if node is None:
+            return None, False
+        row = next(i for i, record in enumerate(node.applications) if record.id == application_id)
+        if node.fetched:
+            self.beginRemoveRows(self.company_index(node), row, row)
+        record = node.applications.pop(row)
+        if node.fetched:
+            self.endRemoveRows()
+        if node.applications:
+            return record, False
+        self.beginRemoveRows(QModelIndex(), node.row, node.row)
+        del self.companies[node.row]
+        del self.company_nodes[node.company_id]
+        self._renumber(node.row)
+        self.endRemoveRows()
+        return record, True
+
+    def update_company_stats(self, company_id, stats):
+        """
+        Store new aggregates for a company and move its row to match the company order.
+        Args:
+            company_id (int): The ID of the company.
+            stats (tuple): (application_count, max_interview_round, last_activity).
+        """
+        node = self.company_nodes.get(company_id)
+        if node is None:
+            return
+        node.set_stats(stats)
+        row = self._company_row(node)
+        if row == node.row:
+            return
+        # beginMoveRows takes the destination row before the move
+        if not self.beginMoveRows(QModelIndex(), node.row, node.row, QModelIndex(),
+                                  row + 1 if row > node.row else row):
+            return
+        old_row = node.row
+        del self.companies[old_row]
+        self.companies.insert(row, node)
+        self._renumber(min(old_row, row))
+        self.endMoveRows()
+
+    def sort_companies(self, field, descending):
+        """
+        Sort the company rows by name or an aggregate, keeping selection and expansion state.
+        Uses the aggregates stored on the nodes, so no applications are scanned.
+        Args:
+            field (str): Field to sort by, a key of COMPANY_SORT_KEYS.
+            descending (bool): Whether to sort in descending order.
+        """
+        if (field, descending) == self.company_sort_order:
+            return
+        self.company_sort_order = (field, descending)
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        # Application indexes point at their node and keep their row; company rows move
+        tracked = [(self.node(index), index.column()) for index in persistent]
+        self.companies.sort(key=COMPANY_SORT_KEYS[field], reverse=descending)
+        self._renumber()
+        new_indexes = []
+        for index, (node, column) in zip(persistent, tracked):
+            new_indexes.append(index if node is None else self.createIndex(node.row, column))
+        self.changePersistentIndexList(persistent, new_indexes)
+        self.layoutChanged.emit()
+
+    def sort_applications(self, field, descending):
+        """
+        Sort the applications within every company, keeping selection and expansion state.
+        Emits a single layout change; does nothing if the model is already in this order.
+        Args:
+            field (str): Field to sort by, a key of SORT_KEYS.
+            descending (bool): Whether to sort in descending order.
+        """
+        if (field, descending) == self.sort_order:
+            return
+        self.sort_order = (field, descending)
+        key = SORT_KEYS[field]
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        tracked = [(self.record(index), index.column()) for index in persistent]
+        for node in self.companies:
+            node.applications.sort(key=key, reverse=descending)
+        new_indexes = []
+        for index, (record, column) in zip(persistent, tracked):
+            if record is None:
+                new_indexes.append(index)
+            else:
+                node = self.application_nodes[record.id]
+                new_indexes.append(self.createIndex(node.applications.index(record), column, node))
+        self.changePersistentIndexList(persistent, new_indexes)
+        self.layoutChanged.emit()
+
+    # QAbstractItemModel interface
+
+    def index(self, row, column, parent=QModelIndex()):
+        # Bounds are checked here rather than with hasIndex, which would call back into
+        # rowCount and columnCount; the view asks for indexes on every layout
+        if row < 0 or not 0 <= column < len(COLUMNS):
+            return QModelIndex()
+        if not parent.isValid():
+            if row < len(self.companies):
+                return self.createIndex(row, column)
+            return QModelIndex()
+        if parent.internalPointer() is not None or parent.column() != 0:
+            return QModelIndex()
+        node = self.companies[parent.row()]
+        if node.fetched and row < len(node.applications):
+            return self.createIndex(row, column, node)
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.companies)
+        if parent.internalPointer() is not None or parent.column() != 0:
+            return 0
+        node = self.companies[parent.row()]
+        return len(node.applications) if node.fetched else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self.companies)
+        if parent.internalPointer() is not None or parent.column() != 0:
+            return False
+        return bool(self.companies[parent.row()].applications)
+
+    def canFetchMore(self, parent):
+        node = self.node(parent)
+        return node is not None and not node.fetched and bool(node.applications)
+
+    def fetchMore(self, parent):
+        node = self.node(parent)
+        if node is None or node.fetched:
+            return
+        self.beginInsertRows(parent, 0, len(node.applications) - 1)
+        node.fetched = True
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        node = index.internalPointer()
+        if node is None:
+            company = self.companies[index.row()]
+            if role == Qt.ItemDataRole.DisplayRole:
+                if column == 0:
+                    return company.name
+                if column == 1:
+                    return company.website
+                return ''
+            if role == Qt.ItemDataRole.UserRole:
+                return company.company_id
+            return None
+        record = node.applications[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return record.column_text(column)
+        if role == Qt.ItemDataRole.ForegroundRole and column == 5:
+            return QColor(STATUS_COLORS.get(record.status, '#000000'))
+        if role == Qt.ItemDataRole.UserRole:
+            return record.id
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
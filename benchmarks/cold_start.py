@@ -0,0 +1,147 @@
+"""
+Cold-start benchmark for the job application tracker.
+Starts the app in fresh Python processes on the Qt offscreen platform (no display
+needed) and measures, from the start of each process:
+
+    import_ms       time to import main (PyQt and the app modules)
+    show_ms         time until the main window is constructed and shown
+    first_rows_ms   time until the first companies appear in the tree
+    loaded_ms       time until loading has finished
+
+It also checks that the HTTP client stack (requests) is not imported at startup.
+Usage:
+
+    python benchmarks/cold_start.py --runs 5 --db job_tracker.db --budget-show-ms 500
+
+Exits with status 1 if a budget is exceeded or requests was imported, so it can run in CI.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Start of the measurement in the child process, before the app or PyQt is imported
+START = time.perf_counter()
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be loaded before they are first used
+LAZY_MODULES = ('requests', 'enrichment', 'opencorporates')
+
+METRICS = ('import_ms', 'show_ms', 'first_rows_ms', 'loaded_ms')
+
+
+def measure(start):
+    """
+    Start the app in this process and measure the startup milestones.
+    Runs in the child process, with the working directory holding the database.
+    Args:
+        start (float): time.perf_counter() value at process start.
+    Returns:
+        dict: Milliseconds since start for each of METRICS, plus the loaded module check.
+    """
+    sys.path.insert(0, REPO_ROOT)
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication([])
+    import main
+    imported = time.perf_counter()
+
+    window = main.JobTrackerApp()
+    window.show()
+    shown = time.perf_counter()
+
+    first_rows = None
+    while window.task_worker is not None:
+        app.processEvents()
+        if first_rows is None and window.model.rowCount():
+            first_rows = time.perf_counter()
+    loaded = time.perf_counter()
+    if first_rows is None:
+        first_rows = loaded  # Empty database
+
+    result = {
+        'import_ms': (imported - start) * 1000,
+        'show_ms': (shown - start) * 1000,
+        'first_rows_ms': (first_rows - start) * 1000,
+        'loaded_ms': (loaded - start) * 1000,
+        'companies': window.model.rowCount() + window.rejected_model.rowCount(),
+        'eager_modules': [name for name in LAZY_MODULES if name in sys.modules],
+    }
+    window.close()
+    return result
+
+
+def run_child(workdir):
+    """
+    Run one measurement in a fresh interpreter.
+    Args:
+        workdir (str): Working directory of the app (holds job_tracker.db).
+    Returns:
+        dict: The child's measurement.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                            cwd=workdir, env=env, capture_output=True, text=True, check=True).stdout
+    # The measurement is the last line; Qt may print warnings before it
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    """
+    Summarize the runs by median, min and max of each metric.
+    """
+    return {metric: {'median': statistics.median(run[metric] for run in runs),
+                     'min': min(run[metric] for run in runs),
+                     'max': max(run[metric] for run in runs)}
+            for metric in METRICS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure cold-start time of the app')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh processes to start')
+    parser.add_argument('--db', help='Database to start with (copied; default: an empty database)')
+    parser.add_argument('--json', metavar='FILE', help='Also write the results to this JSON file')
+    parser.add_argument('--budget-show-ms', type=float, help='Fail if the median show_ms exceeds this')
+    parser.add_argument('--budget-first-rows-ms', type=float,
+                        help='Fail if the median first_rows_ms exceeds this')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(START)))
+        return 0
+
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.db:
+            shutil.copy(args.db, os.path.join(workdir, 'job_tracker.db'))
+        for _ in range(args.runs):
+            runs.append(run_child(workdir))
+
+    summary = summarize(runs)
+    eager_modules = sorted({name for run in runs for name in run['eager_modules']})
+    print(f"{runs[0]['companies']} companies, {args.runs} runs (median / min / max ms)")
+    for metric, values in summary.items():
+        print(f"  {metric:<14} {values['median']:8.1f} {values['min']:8.1f} {values['max']:8.1f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'runs': runs, 'summary': summary}, f, indent=2)
+
+    failures = []
+    if eager_modules:
+        failures.append(f"modules loaded at startup: {', '.join(eager_modules)}")
+    for metric, budget in (('show_ms', args.budget_show_ms), ('first_rows_ms', args.budget_first_rows_ms)):
+        if budget is not None and summary[metric]['median'] > budget:
+            failures.append(f"{metric} {summary[metric]['median']:.1f} exceeds budget {budget:.1f}")
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Synthetic dataset generator for benchmarks.
+Builds a job_tracker.db with a chosen number of applications. Company and position
+popularity follow a Zipf-like skew: a few companies and positions get many
+applications and most get a handful, as in a real job search.
+
+    python benchmarks/generate.py 100000 --output data/job_tracker.db --seed 1
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+# Scales used by the benchmark suite
+SCALES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+
+# Average number of applications per company
+APPLICATIONS_PER_COMPANY = 8
+
+# Zipf exponents of company and position popularity
+COMPANY_SKEW = 0.8
+POSITION_SKEW = 1.1
+
+# Applications are spread over this many days before GENERATED_UNTIL
+DATE_RANGE_DAYS = 730
+GENERATED_UNTIL = datetime(2024, 12, 31)
+
+NAME_PREFIXES = ['Acme', 'Blue', 'Bright', 'Cloud', 'Core', 'Data', 'Delta', 'Echo', 'Falcon', 'First',
+                 'Global', 'Green', 'Hyper', 'Iron', 'Lumen', 'Meta', 'North', 'Nova', 'Open', 'Peak',
+                 'Pixel', 'Prime', 'Quantum', 'Red', 'River', 'Silver', 'Smart', 'Solar', 'Stone', 'Swift']
+NAME_STEMS = ['bridge', 'byte', 'craft', 'field', 'forge', 'gate', 'grid', 'hub', 'labs', 'line',
+              'logic', 'mark', 'mind', 'path', 'point', 'scale', 'shift', 'soft', 'stack', 'works']
+NAME_SUFFIXES = ['Inc', 'LLC', 'Ltd', 'GmbH', 'Group', 'Systems', 'Technologies', 'Solutions']
+
+POSITION_LEVELS = ['', 'Junior ', 'Senior ', 'Staff ', 'Lead ', 'Principal ']
+POSITION_TITLES = ['Software Engineer', 'Backend Engineer', 'Frontend Engineer', 'Full Stack Developer',
+                   'Data Engineer', 'Data Scientist', 'Machine Learning Engineer', 'DevOps Engineer',
+                   'Site Reliability Engineer', 'QA Engineer', 'Mobile Developer', 'Security Engineer',
+                   'Product Manager', 'Engineering Manager', 'Data Analyst', 'Solutions Architect',
+                   'Technical Writer', 'UX Designer', 'Platform Engineer', 'Embedded Engineer']
+
+# (status, weight, maximum interview round)
+STATUSES = [('Applied', 60, 0), ('Interview', 15, 4), ('Rejected', 22, 3), ('Accepted', 3, 5)]
+
+BATCH_SIZE = 10000
+
+
+def company_names(count):
+    """
+    Generate distinct, plausible company names.
+    Args:
+        count (int): Number of names.
+    Returns:
+        list: Company names (str).
+    """
+    combinations = itertools.product(NAME_PREFIXES, NAME_STEMS, NAME_SUFFIXES)
+    names = []
+    for number in itertools.count(1):
+        for prefix, stem, suffix in combinations:
+            names.append(f'{prefix}{stem} {suffix}' if number == 1 else f'{prefix}{stem} {suffix} {number}')
+            if len(names) == count:
+                return names
+        combinations = itertools.product(NAME_PREFIXES, NAME_STEMS, NAME_SUFFIXES)
+    return names
+
+
+def zipf_weights(count, skew):
+    """
+    Cumulative Zipf weights for random.choices: item k is chosen with probability ~ 1 / k**skew.
+    """
+    return list(itertools.accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def generate_rows(applications, seed=0):
+    """
+    Generate application rows in the layout of Database.add_applications_many.
+    Args:
+        applications (int): Number of applications.
+        seed (int): Random seed; the same seed always gives the same rows.
+    Yields:
+        tuple: (company_name, position, description, website, application_date,
+            interview_round, last_contact_date, status).
+    """
+    rng = random.Random(seed)
+    companies = company_names(max(1, applications // APPLICATIONS_PER_COMPANY))
+    rng.shuffle(companies)
+    positions = [level + title for title in POSITION_TITLES for level in POSITION_LEVELS]
+    rng.shuffle(positions)
+    company_weights = zipf_weights(len(companies), COMPANY_SKEW)
+    position_weights = zipf_weights(len(positions), POSITION_SKEW)
+    status_weights = [weight for _, weight, _ in STATUSES]
+
+    for _ in range(applications):
+        company = rng.choices(companies, cum_weights=company_weights)[0]
+        position = rng.choices(positions, cum_weights=position_weights)[0]
+        status, _, max_round = rng.choices(STATUSES, weights=status_weights)[0]
+        applied = GENERATED_UNTIL - timedelta(days=rng.randrange(DATE_RANGE_DAYS),
+                                              seconds=rng.randrange(86400))
+        last_contact = None
+        if status != 'Applied':
+            last_contact = (applied + timedelta(days=rng.randrange(1, 60))).strftime('%Y-%m-%d %H:%M:%S')
+        slug = company.split()[0].lower()
+        yield (company, position, f'{company} builds software.', f'https://{slug}.example.com',
+               applied.strftime('%Y-%m-%d %H:%M:%S'), rng.randint(0, max_round), last_contact, status)
+
+
+def generate_database(path, applications, seed=0):
+    """
+    Create a database file filled with synthetic applications.
+    Args:
+        path (str): Path of the database file; an existing file is replaced.
+        applications (int): Number of applications.
+        seed (int): Random seed.
+    Returns:
+        float: Seconds taken.
+    """
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db = Database(path)
+    rows = generate_rows(applications, seed)
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        db.add_applications_many(batch)
+    db.conn.execute('ANALYZE')
+    # Closing the last connection checkpoints the WAL into the database file
+    db.close()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic job_tracker.db')
+    parser.add_argument('applications', help=f"Number of applications, or one of {', '.join(SCALES)}")
+    parser.add_argument('--output', default='job_tracker.db', help='Path of the database to create')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args(argv)
+    applications = SCALES.get(args.applications.lower()) or int(args.applications)
+    elapsed = generate_database(args.output, applications, args.seed)
+    print(f'Generated {applications} applications in {args.output} ({elapsed:.1f}s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
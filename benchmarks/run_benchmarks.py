@@ -0,0 +1,255 @@
+"""
+Benchmark suite for the database and the UI hot paths.
+Generates (or reuses) synthetic databases at each scale, then times the key
+operations headless on the Qt offscreen platform:
+
+    python benchmarks/run_benchmarks.py --scales 1k 10k --output bench.json
+    python benchmarks/run_benchmarks.py --scales 10k --baseline bench.json
+
+Results are written as JSON (one entry per scale and benchmark) so runs on
+different commits can be compared with --baseline.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from generate import SCALES, generate_database
+
+DEFAULT_REPEAT = 5
+
+
+def timed(function, repeat, setup=None):
+    """
+    Time a function.
+    Args:
+        function (callable): Called once per repetition.
+        repeat (int): Number of repetitions.
+        setup (callable, optional): Called with the repetition number before each repetition,
+            outside the timing.
+    Returns:
+        list: Duration of each repetition in milliseconds.
+    """
+    durations = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def database_benchmarks(db):
+    """
+    Benchmarks of Database calls.
+    Returns:
+        list: (name, function, setup) tuples.
+    """
+    companies = itertools.count()
+    return [
+        ('get_all_applications_grouped', db.get_all_applications_grouped, None),
+        # Uncached, so results stay comparable with runs before the query cache
+        ('get_unique_positions', db.get_unique_positions, lambda i: db.clear_query_cache()),
+        ('get_unique_positions_cached', db.get_unique_positions, None),
+        ('add_application', lambda: db.add_application(f'Benchmark Company {next(companies)}',
+                                                       'Benchmark Engineer'), None),
+    ]
+
+
+def ui_benchmarks(app, window):
+    """
+    Benchmarks of the main window's hot paths.
+    Returns:
+        list: (name, function, setup) tuples.
+    """
+    def load():
+        window.load_applications()
+        while window.task_worker is not None:
+            app.processEvents()
+
+    def filter_applications():
+        window.filter_applications()
+        # Include the views' relayout of the shown and hidden rows
+        app.processEvents()
+
+    def set_status_filter(i):
+        window.status_filter.blockSignals(True)
+        window.status_filter.setCurrentText('Interview' if i % 2 == 0 else 'All')
+        window.status_filter.blockSignals(False)
+
+    def set_status_filter_uncached(i):
+        set_status_filter(i)
+        window.filter_engine.clear_cache()
+
+    def set_search_text(i):
+        # Alternate between searching and clearing the search, so every repetition changes rows
+        window.search_input.blockSignals(True)
+        window.search_input.setText('eng' if i % 2 == 0 else '')
+        window.search_input.blockSignals(False)
+
+    def search():
+        window.search_applications()
+        app.processEvents()
+
+    def set_sort_option(i):
+        window.sort_combo.blockSignals(True)
+        window.sort_combo.setCurrentText('Position (A-Z)' if i % 2 == 0 else 'Date (Newest First)')
+        window.sort_combo.blockSignals(False)
+
+    def refresh_completers():
+        # Force a refresh as if the suggestion indexes had changed
+        window.company_model_version = None
+        window.position_model_version = None
+        window.update_company_completer()
+        window.update_position_completer()
+
+    return [
+        ('load_applications', load, None),
+        ('filter_applications', filter_applications, set_status_filter),
+        ('filter_applications_uncached', filter_applications, set_status_filter_uncached),
+        ('search_applications', search, set_search_text),
+        ('sort_applications', window.sort_all_applications, set_sort_option),
+        ('completer_refresh', refresh_completers, None),
+    ]
+
+
+def summarize(durations):
+    return {
+        'repeat': len(durations),
+        'min_ms': min(durations),
+        'median_ms': statistics.median(durations),
+        'mean_ms': statistics.fmean(durations),
+        'max_ms': max(durations),
+    }
+
+
+def run_scale(app, applications, database_path, repeat):
+    """
+    Run all benchmarks against a working copy of a generated database.
+    Args:
+        app (QApplication): The application object.
+        applications (int): Number of applications in the database.
+        database_path (str): Generated database to copy.
+        repeat (int): Repetitions per benchmark.
+    Returns:
+        list: One result dict per benchmark.
+    """
+    import main
+    from database import Database
+
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        working_copy = os.path.join(workdir, 'job_tracker.db')
+        shutil.copy(database_path, working_copy)
+        # The app keeps its cache files in the current directory
+        os.chdir(workdir)
+        try:
+            db = Database(working_copy)
+            for name, function, setup in database_benchmarks(db):
+                results.append({'scale': applications, 'benchmark': name,
+                                **summarize(timed(function, repeat, setup))})
+            db.close()
+
+            window = main.JobTrackerApp(working_copy)
+            while window.task_worker is not None:
+                app.processEvents()
+            for name, function, setup in ui_benchmarks(app, window):
+                results.append({'scale': applications, 'benchmark': name,
+                                **summarize(timed(function, repeat, setup))})
+            window.close()
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def environment():
+    """
+    Describe the environment of a run, so results from different commits can be matched up.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+    }
+
+
+def print_results(results, baseline=None):
+    """
+    Print a table of median timings, with the change against a baseline run if given.
+    """
+    previous = {}
+    if baseline:
+        previous = {(result['scale'], result['benchmark']): result['median_ms'] for result in baseline['results']}
+    for result in results:
+        line = f"{result['scale']:>8} {result['benchmark']:<30} {result['median_ms']:10.2f} ms"
+        old = previous.get((result['scale'], result['benchmark']))
+        if old:
+            line += f"  ({(result['median_ms'] - old) / old:+.0%} vs baseline)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the database and UI benchmarks')
+    parser.add_argument('--scales', nargs='+', default=['1k', '10k'],
+                        help=f"Application counts to test, as numbers or {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Repetitions per benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the generated data')
+    parser.add_argument('--data-dir', help='Keep generated databases here and reuse them on later runs')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Earlier JSON results to compare against')
+    args = parser.parse_args(argv)
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication([])
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    data_dir = args.data_dir or tempfile.mkdtemp()
+    results = []
+    try:
+        for scale in args.scales:
+            applications = SCALES.get(scale.lower()) or int(scale)
+            database_path = os.path.join(data_dir, f'jobs_{applications}_seed{args.seed}.db')
+            if not os.path.exists(database_path):
+                elapsed = generate_database(database_path, applications, args.seed)
+                print(f'Generated {applications} applications ({elapsed:.1f}s)', file=sys.stderr)
+            results.extend(run_scale(app, applications, database_path, args.repeat))
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir)
+
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
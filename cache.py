@@ -1,48 +1,324 @@
 import json
 import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
+from metrics import DEFAULT_METRICS
+
+# Default number of entries kept in the in-memory LRU front
+DEFAULT_MEMORY_ENTRIES = 1000
+
+# Write-behind mode: seconds between flushes, and number of dirty entries that triggers an early flush
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_FLUSH_THRESHOLD = 200
+
+# Default time to live of negative entries ("not found" results), in seconds
+DEFAULT_NEGATIVE_TTL = 24 * 60 * 60
+
+# Default time an expired entry is still served as stale while it is refreshed, in seconds
+DEFAULT_STALE_TTL = 7 * 24 * 60 * 60
+
+# Status of a cache lookup
+FRESH = 'fresh'        # Unexpired description
+STALE = 'stale'        # Expired description, still usable while a refresh runs
+NEGATIVE = 'negative'  # Unexpired "not found" (or error) result; data is the message
+MISS = 'miss'          # Nothing usable cached
+
+# Each migration is a list of statements; the cache file's user_version is the number applied
+CACHE_MIGRATIONS = [
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS company_cache (
+            name TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_company_cache_expires ON company_cache (expires_at)',
+    ],
+    [
+        'ALTER TABLE company_cache ADD COLUMN negative INTEGER NOT NULL DEFAULT 0',
+    ],
+]
+
+
 class CompanyCache:
-    def __init__(self, cache_file='company_cache.json', cache_duration_days=30):
+    """
+    Cache of company descriptions stored in a SQLite side file, with a per-entry
+    expiry time and a bounded in-memory LRU front for repeated lookups.
+    Writes touch a single row; expiry is checked lazily on read, and unusable
+    entries are removed with one indexed DELETE by clear_expired.
+
+    In write-behind mode set() only updates memory and marks the entry dirty; a
+    background thread persists dirty entries in batches, each batch in one SQLite
+    transaction so a crash mid-flush leaves the file intact. Call close() (or flush())
+    before exiting so the last entries are saved.
+
+    Negative entries record that a lookup found nothing (or failed), with a shorter
+    time to live, so unknown companies are not looked up again on every view.
+    Positive entries stay usable for stale_ttl seconds after expiring: lookup()
+    reports them as STALE so the caller can show them while refreshing.
+
+    Once close() has run, lookups report a miss and writes are ignored, so late
+    callers (such as lookups finishing while the window closes) cannot reach the
+    closed cache file.
+    """
+    def __init__(self, cache_file='company_cache.db', cache_duration_days=30,
+                 max_memory_entries=DEFAULT_MEMORY_ENTRIES, json_file='company_cache.json',
+                 write_behind=False, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 flush_threshold=DEFAULT_FLUSH_THRESHOLD, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 stale_ttl=DEFAULT_STALE_TTL, metrics=None):
+        """
+        Args:
+            cache_file (str): Path of the SQLite cache file.
+            cache_duration_days (float): Default time to live of an entry, in days.
+            max_memory_entries (int): Maximum number of entries kept in memory.
+            json_file (str, optional): Legacy JSON cache migrated on first use, then removed.
+            write_behind (bool): Persist entries in background batches instead of on every set.
+            flush_interval (float): Seconds between background flushes in write-behind mode.
+            flush_threshold (int): Number of dirty entries that triggers an early flush.
+            negative_ttl (float): Default time to live of negative entries, in seconds.
+            stale_ttl (float): Seconds an expired description is still served as stale.
+            metrics (Metrics, optional): Registry for hit/miss and eviction counters.
+        """
         self.cache_file = cache_file
         self.cache_duration = timedelta(days=cache_duration_days)
-        self.cache = self._load_cache()
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.max_memory_entries = max_memory_entries
+        self.metrics = metrics or DEFAULT_METRICS
+        self.memory = OrderedDict()  # name -> (data, expires_at, negative), least recently used first
+        self.dirty = {}              # name -> (data, expires_at, negative) not yet written to the file
+        self.lock = threading.RLock()
+        # The connection is shared with the flusher thread; self.lock serialises its use
+        self.conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self.migrate()
+        if json_file and os.path.exists(json_file):
+            self.migrate_json(json_file)
+
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.flush_requested = threading.Event()
+        self.closed = False
+        self.flusher = None
+        if write_behind:
+            self.flusher = threading.Thread(target=self._flush_loop, name='CompanyCacheFlusher', daemon=True)
+            self.flusher.start()
 
-    def _load_cache(self):
-        if os.path.exists(self.cache_file):
+    def migrate(self):
+        """
+        Apply pending schema migrations to the cache file, each in its own transaction.
+        """
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, statements in enumerate(CACHE_MIGRATIONS[version:], start=version + 1):
+            self.conn.execute('BEGIN')
             try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return {}
-        return {}
+                for statement in statements:
+                    self.conn.execute(statement)
+                self.conn.execute(f'PRAGMA user_version = {number}')
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
 
-    def _save_cache(self):
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.cache, f)
+    def migrate_json(self, json_file):
+        """
+        Copy the entries of a legacy JSON cache file into the SQLite cache and delete the file.
+        Entries keep their original age; unreadable files are removed without migrating.
+        Args:
+            json_file (str): Path of the JSON cache file.
+        Returns:
+            int: The number of entries migrated.
+        """
+        try:
+            with open(json_file, 'r') as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            entries = {}
+        rows = []
+        for name, entry in entries.items():
+            try:
+                cached_at = datetime.fromisoformat(entry['timestamp'])
+                data = entry['data']
+            except (KeyError, TypeError, ValueError):
+                continue
+            rows.append((name, data, (cached_at + self.cache_duration).timestamp()))
+        with self.conn:
+            # Entries already in the SQLite cache are newer than the JSON file
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO company_cache (name, data, expires_at) VALUES (?, ?, ?)', rows)
+        os.remove(json_file)
+        return len(rows)
+
+    def _remember(self, company_name, entry):
+        self.memory[company_name] = entry
+        self.memory.move_to_end(company_name)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+            self.metrics.increment('cache.evictions')
+
+    def lookup(self, company_name):
+        """
+        Look up a cached entry and report how usable it is.
+        Args:
+            company_name (str): Name of the company.
+        Returns:
+            tuple: (data, status) where status is FRESH, STALE, NEGATIVE or MISS;
+                data is the description, the negative entry's message, or None on a miss.
+        """
+        with self.lock:
+            if self.closed:
+                return None, MISS
+            entry = self.memory.get(company_name) or self.dirty.get(company_name)
+            if entry is None:
+                self.metrics.increment('cache.disk_reads')
+                entry = self.conn.execute('SELECT data, expires_at, negative FROM company_cache WHERE name = ?',
+                                          (company_name,)).fetchone()
+            else:
+                self.metrics.increment('cache.memory_hits')
+            if entry is not None:
+                self._remember(company_name, entry)
+        data, status = self._status(entry)
+        self.metrics.increment(f'cache.{status}')
+        return data, status
+
+    def _status(self, entry):
+        if entry is None:
+            return None, MISS
+        data, expires_at, negative = entry
+        now = time.time()
+        if now < expires_at:
+            return data, NEGATIVE if negative else FRESH
+        if not negative and now < expires_at + self.stale_ttl:
+            return data, STALE
+        return None, MISS
 
     def get(self, company_name):
-        if company_name in self.cache:
-            cache_entry = self.cache[company_name]
-            cache_time = datetime.fromisoformat(cache_entry['timestamp'])
-            if datetime.now() - cache_time < self.cache_duration:
-                return cache_entry['data']
-        return None
-
-    def set(self, company_name, data):
-        self.cache[company_name] = {
-            'timestamp': datetime.now().isoformat(),
-            'data': data
-        }
-        self._save_cache()
+        """
+        Get a fresh cached description.
+        Args:
+            company_name (str): Name of the company.
+        Returns:
+            str: The cached description, or None if missing, expired or negative.
+        """
+        data, status = self.lookup(company_name)
+        return data if status == FRESH else None
+
+    def set(self, company_name, data, ttl=None):
+        """
+        Cache a description.
+        Args:
+            company_name (str): Name of the company.
+            data (str): The data to cache.
+            ttl (float, optional): Time to live in seconds; defaults to the cache duration.
+        """
+        if ttl is None:
+            ttl = self.cache_duration.total_seconds()
+        self._store(company_name, (data, time.time() + ttl, 0))
+
+    def set_negative(self, company_name, message, ttl=None):
+        """
+        Cache that a lookup found nothing or failed, so it is not repeated until the entry expires.
+        Replaces any description cached for the company.
+        Args:
+            company_name (str): Name of the company.
+            message (str): Why the lookup failed, reported on later lookups.
+            ttl (float, optional): Time to live in seconds; defaults to negative_ttl.
+        """
+        if ttl is None:
+            ttl = self.negative_ttl
+        self._store(company_name, (message, time.time() + ttl, 1))
+
+    def _store(self, company_name, entry):
+        with self.lock:
+            if self.closed:
+                self.metrics.increment('cache.writes_after_close')
+                return
+            self.metrics.increment('cache.writes')
+            self._remember(company_name, entry)
+            if not self.write_behind:
+                self._write({company_name: entry})
+                return
+            self.dirty[company_name] = entry
+            if len(self.dirty) >= self.flush_threshold:
+                self.flush_requested.set()
+
+    def _write(self, entries):
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO company_cache (name, data, expires_at, negative) VALUES (?, ?, ?, ?)',
+                [(name, *entry) for name, entry in entries.items()])
+
+    def flush(self):
+        """
+        Write all dirty entries to the cache file in one transaction.
+        Returns:
+            int: The number of entries written.
+        """
+        with self.lock:
+            if not self.dirty:
+                return 0
+            dirty, self.dirty = self.dirty, {}
+            try:
+                self._write(dirty)
+            except sqlite3.Error:
+                # Keep the entries (unless overwritten meanwhile) for the next flush
+                self.dirty = {**dirty, **self.dirty}
+                self.metrics.increment('cache.flush_errors')
+                raise
+            self.metrics.increment('cache.flushes')
+            self.metrics.increment('cache.flushed_entries', len(dirty))
+            return len(dirty)
+
+    def _flush_loop(self):
+        """
+        Background flusher: flush every flush_interval seconds, or earlier when requested.
+        """
+        while not self.closed:
+            self.flush_requested.wait(self.flush_interval)
+            self.flush_requested.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # Retried on the next flush
 
     def clear_expired(self):
-        now = datetime.now()
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if now - datetime.fromisoformat(entry['timestamp']) > self.cache_duration
-        ]
-        for key in expired_keys:
-            del self.cache[key]
-        if expired_keys:
-            self._save_cache() 
\ No newline at end of file
+        """
+        Remove entries that can no longer be used: expired negative entries, and
+        descriptions that expired more than stale_ttl seconds ago.
+        Returns:
+            int: The number of entries removed from the cache file.
+        """
+        now = time.time()
+        stale_cutoff = now - self.stale_ttl
+        with self.lock:
+            self.flush()
+            for company_name in [name for name, (_, expires_at, negative) in self.memory.items()
+                                 if expires_at <= (now if negative else stale_cutoff)]:
+                del self.memory[company_name]
+            with self.conn:
+                # The range on expires_at uses the index; the rest filters within it
+                cursor = self.conn.execute('''
+                    DELETE FROM company_cache
+                    WHERE expires_at <= ? AND (negative = 1 OR expires_at <= ?)
+                ''', (now, stale_cutoff))
+            self.metrics.increment('cache.expired_removed', cursor.rowcount)
+            return cursor.rowcount
+
+    def close(self):
+        """
+        Stop the background flusher, write the remaining dirty entries and close the cache file.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self.flusher is not None:
+            self.flush_requested.set()
+            self.flusher.join()
+        with self.lock:
+            self.flush()
+            self.conn.close()
@@ -0,0 +1,189 @@
+"""
+Command-line interface for the job application tracker.
+Runs headless (no QApplication), e.g.:
+
+    python cli.py import applications.csv
+    python cli.py --db ~/jobs/job_tracker.db import applications.csv
+    python cli.py export rejected.csv --status Rejected --from 2024-01-01
+    python cli.py enrich --rate 2 --burst 5 --metrics enrich-metrics.json
+"""
+import argparse
+import codecs
+import sys
+from datetime import date
+
+from cache import CompanyCache
+from database import DEFAULT_DATABASE_PATH, Database
+import exporter
+import importer
+from metrics import DEFAULT_METRICS
+
+
+def iso_date(value):
+    """
+    Argument type for dates given as YYYY-MM-DD.
+    Returns:
+        str: The date in YYYY-MM-DD form, as compared with the stored application dates.
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a valid date.
+    """
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid date {value!r}, expected YYYY-MM-DD') from None
+
+
+def status_name(value):
+    """
+    Argument type for application statuses, matched regardless of case like the importer does.
+    Returns:
+        str: The status as stored, one of importer.STATUSES.
+    Raises:
+        argparse.ArgumentTypeError: If the status is unknown.
+    """
+    status = importer.STATUS_NAMES.get(value.lower())
+    if status is None:
+        raise argparse.ArgumentTypeError(
+            f"unknown status {value!r}, expected one of {', '.join(importer.STATUSES)}")
+    return status
+
+
+def text_encoding(value):
+    """
+    Argument type for text encoding names.
+    Returns:
+        str: The encoding name.
+    Raises:
+        argparse.ArgumentTypeError: If Python does not know the encoding.
+    """
+    try:
+        codecs.lookup(value)
+    except LookupError:
+        raise argparse.ArgumentTypeError(f'unknown encoding {value!r}') from None
+    return value
+
+
+def run_import(args):
+    """
+    Import applications from a CSV, JSON Lines or JSON file, printing progress to stderr.
+    """
+    db = Database(args.db)
+
+    def report(progress):
+        print(f'\r{progress}', end='', file=sys.stderr, flush=True)
+
+    result = importer.import_file(db, args.file, format=args.format,
+                                  chunk_size=args.chunk_size, progress_callback=report,
+                                  encoding=args.encoding)
+    print(file=sys.stderr)
+    for line, reason in result.skipped_lines:
+        print(f'Skipped line {line}: {reason}', file=sys.stderr)
+    if result.skipped > len(result.skipped_lines):
+        print(f'... and {result.skipped - len(result.skipped_lines)} more skipped rows', file=sys.stderr)
+    print(f'Imported {result.rows} applications ({result.skipped} skipped) '
+          f'in {result.elapsed:.2f}s')
+    return 0
+
+
+def run_export(args):
+    """
+    Export applications to CSV, JSON Lines or the columnar format, printing progress to stderr.
+    """
+    db = Database(args.db)
+
+    def report(rows):
+        print(f'\r{rows} rows exported', end='', file=sys.stderr, flush=True)
+
+    count = exporter.export_file(db, args.file, format=args.format, statuses=args.status,
+                                 date_from=args.date_from, date_to=args.date_to,
+                                 progress_callback=report)
+    print(file=sys.stderr)
+    print(f'Exported {count} applications to {args.file}')
+    return 0
+
+
+def run_enrich(args):
+    """
+    Look up descriptions for all companies without one, printing progress to stderr.
+    """
+    import opencorporates
+    db = Database(args.db)
+    cache = CompanyCache(write_behind=True)
+    client = opencorporates.OpenCorporatesClient(
+        rate=args.rate if args.rate is not None else opencorporates.DEFAULT_RATE,
+        burst=args.burst if args.burst is not None else opencorporates.DEFAULT_BURST,
+        max_retries=args.max_retries)
+
+    def report(done, total, company_name, error):
+        if error is not None:
+            print(f'\n{company_name}: {error}', file=sys.stderr)
+        print(f'\r{done}/{total} companies looked up', end='', file=sys.stderr, flush=True)
+
+    try:
+        results = opencorporates.enrich_database(db, client, cache, progress_callback=report)
+    finally:
+        client.close()
+        cache.close()
+    print(file=sys.stderr)
+    print(f'Stored descriptions for {len(results)} companies')
+    if args.metrics:
+        DEFAULT_METRICS.dump(args.metrics)
+        print(f'Metrics written to {args.metrics}')
+    return 0
+
+
+def build_parser():
+    """
+    Build the argument parser with one subcommand per operation.
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(description='Job application tracker command-line tools')
+    parser.add_argument('--db', default=DEFAULT_DATABASE_PATH,
+                        help=f'Path of the database file (default: {DEFAULT_DATABASE_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='Import applications from CSV or JSON Lines')
+    import_parser.add_argument('file', help='Path of the .csv, .jsonl or .json file to import')
+    import_parser.add_argument('--format', choices=['csv', 'jsonl', 'json'],
+                               help='Input format (detected from the file extension by default)')
+    import_parser.add_argument('--chunk-size', type=int, default=importer.DEFAULT_CHUNK_SIZE,
+                               help='Rows written per transaction')
+    import_parser.add_argument('--encoding', type=text_encoding, default=importer.DEFAULT_ENCODING,
+                               help='Text encoding of the file, e.g. cp1252 (default: UTF-8)')
+    import_parser.set_defaults(func=run_import)
+
+    export_parser = subparsers.add_parser('export', help='Export applications to CSV, JSON Lines or columnar')
+    export_parser.add_argument('file', help='Path of the .csv, .jsonl or .jtc file to write')
+    export_parser.add_argument('--format', choices=exporter.FORMATS,
+                               help='Output format (detected from the file extension by default)')
+    export_parser.add_argument('--status', action='append', type=status_name,
+                               help=f"Only export applications with this status (may be repeated): "
+                                    f"{', '.join(importer.STATUSES)}")
+    export_parser.add_argument('--from', dest='date_from', metavar='YYYY-MM-DD', type=iso_date,
+                               help='Only export applications made on or after this date')
+    export_parser.add_argument('--to', dest='date_to', metavar='YYYY-MM-DD', type=iso_date,
+                               help='Only export applications made on or before this date')
+    export_parser.set_defaults(func=run_export)
+
+    enrich_parser = subparsers.add_parser('enrich', help='Look up descriptions for companies that have none')
+    # Defaults come from opencorporates, which is only imported when enriching
+    enrich_parser.add_argument('--rate', type=float,
+                               help='Maximum API requests per second (default: 1)')
+    enrich_parser.add_argument('--burst', type=int,
+                               help='Maximum number of API requests sent back to back (default: 1)')
+    enrich_parser.add_argument('--max-retries', type=int, default=4,
+                               help='Retries per company on rate limiting and server errors')
+    enrich_parser.add_argument('--metrics', metavar='FILE',
+                               help='Write cache and API metrics to this JSON file when done')
+    enrich_parser.set_defaults(func=run_enrich)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
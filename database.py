@@ -1,47 +1,555 @@
+import itertools
+import re
 import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import groupby
+from metrics import DEFAULT_METRICS
+
+# Database file used when no path is given, relative to the current directory
+DEFAULT_DATABASE_PATH = 'job_tracker.db'
+
+# Path that opens a private in-memory database (shared by the threads of one Database)
+MEMORY_DATABASE_PATH = ':memory:'
+
+# PRAGMAs applied to every connection. WAL lets other threads read while one thread
+# writes, and with WAL synchronous=NORMAL only risks the last commits on power loss.
+CONNECTION_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,  # Bytes of the file read through memory mapping
+    'cache_size': -64 * 1024,  # Negative means KiB, so 64 MiB of page cache per connection
+    'busy_timeout': 5000,  # Milliseconds to wait for a lock held by another connection
+    'temp_store': 'MEMORY',
+}
+
+# Numbers the in-memory databases so each Database gets its own
+_memory_databases = itertools.count(1)
+
+# Number of rows fetched from SQLite per round trip by the streaming iterators
+DEFAULT_BATCH_SIZE = 500
+
+# Maximum number of values bound in a single IN (...) lookup
+MAX_LOOKUP_VARIABLES = 500
+
+# Number of query results kept by the query cache (see Database._cached), least recently used
+# first out; search results are keyed by their text, so the cache would otherwise keep growing
+QUERY_CACHE_SIZE = 256
+
+# Aggregates of company_stats computed from the applications table, used to fill and repair it
+COMPANY_STATS_SELECT = '''SELECT company_id, COUNT(*), COALESCE(MAX(interview_round), 0),
+               MAX(COALESCE(last_contact_date, application_date))
+        FROM applications'''
+
+# Schema migrations, applied in order. Migration N upgrades a database from
+# PRAGMA user_version N-1 to N. Never edit a released migration; append a new one.
+MIGRATIONS = [
+    # 1: Base tables (no-op for databases created before versioning)
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS companies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            description TEXT,
+            website_url TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL,
+            position TEXT NOT NULL,
+            application_date TIMESTAMP NOT NULL,
+            interview_round INTEGER DEFAULT 0,
+            last_contact_date TIMESTAMP,
+            status TEXT DEFAULT 'Applied',
+            FOREIGN KEY (company_id) REFERENCES companies (id)
+        )
+        ''',
+    ],
+    # 2: Covering indexes for the grouped/per-company listings, distinct positions and status counts
+    [
+        'DROP INDEX IF EXISTS idx_applications_company_id',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_applications_company_date ON applications (
+            company_id, application_date, id, position, interview_round, last_contact_date, status
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_applications_position ON applications (position)',
+        'CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status)',
+    ],
+    # 3: Full-text search index over company name/description and position, one row per
+    #    application (rowid = application id), kept in sync by triggers
+    [
+        '''
+        CREATE VIRTUAL TABLE application_search USING fts5 (
+            company, description, position, tokenize = 'unicode61 remove_diacritics 2'
+        )
+        ''',
+        '''
+        INSERT INTO application_search (rowid, company, description, position)
+        SELECT a.id, c.name, c.description, a.position
+        FROM applications a
+        JOIN companies c ON c.id = a.company_id
+        ''',
+        '''
+        CREATE TRIGGER application_search_insert AFTER INSERT ON applications BEGIN
+            INSERT INTO application_search (rowid, company, description, position)
+            SELECT new.id, c.name, c.description, new.position FROM companies c WHERE c.id = new.company_id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER application_search_delete AFTER DELETE ON applications BEGIN
+            DELETE FROM application_search WHERE rowid = old.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER application_search_update AFTER UPDATE OF company_id, position ON applications BEGIN
+            DELETE FROM application_search WHERE rowid = old.id;
+            INSERT INTO application_search (rowid, company, description, position)
+            SELECT new.id, c.name, c.description, new.position FROM companies c WHERE c.id = new.company_id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER application_search_company_update AFTER UPDATE OF name, description ON companies BEGIN
+            DELETE FROM application_search
+            WHERE rowid IN (SELECT id FROM applications WHERE company_id = new.id);
+            INSERT INTO application_search (rowid, company, description, position)
+            SELECT a.id, new.name, new.description, a.position FROM applications a WHERE a.company_id = new.id;
+        END
+        ''',
+    ],
+    # 4: Per-company aggregates (application count, highest interview round, latest activity)
+    #    for ordering companies. Inserts update them in place; updates and deletes recompute
+    #    the affected company from the covering index.
+    [
+        '''
+        CREATE TABLE company_stats (
+            company_id INTEGER PRIMARY KEY,
+            application_count INTEGER NOT NULL,
+            max_interview_round INTEGER NOT NULL,
+            last_activity TIMESTAMP NOT NULL
+        )
+        ''',
+        f'''
+        INSERT INTO company_stats (company_id, application_count, max_interview_round, last_activity)
+        {COMPANY_STATS_SELECT} GROUP BY company_id
+        ''',
+        '''
+        CREATE TRIGGER company_stats_insert AFTER INSERT ON applications BEGIN
+            INSERT INTO company_stats (company_id, application_count, max_interview_round, last_activity)
+            VALUES (new.company_id, 1, COALESCE(new.interview_round, 0),
+                    COALESCE(new.last_contact_date, new.application_date))
+            ON CONFLICT (company_id) DO UPDATE SET
+                application_count = application_count + 1,
+                max_interview_round = MAX(max_interview_round, excluded.max_interview_round),
+                last_activity = MAX(last_activity, excluded.last_activity);
+        END
+        ''',
+        f'''
+        CREATE TRIGGER company_stats_update
+        AFTER UPDATE OF company_id, application_date, interview_round, last_contact_date ON applications BEGIN
+            DELETE FROM company_stats WHERE company_id IN (old.company_id, new.company_id);
+            INSERT INTO company_stats (company_id, application_count, max_interview_round, last_activity)
+            {COMPANY_STATS_SELECT} WHERE company_id IN (old.company_id, new.company_id) GROUP BY company_id;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER company_stats_delete AFTER DELETE ON applications BEGIN
+            DELETE FROM company_stats WHERE company_id = old.company_id;
+            INSERT INTO company_stats (company_id, application_count, max_interview_round, last_activity)
+            {COMPANY_STATS_SELECT} WHERE company_id = old.company_id GROUP BY company_id;
+        END
+        ''',
+    ],
+    # 5: Indexes on the company aggregates, so listing companies by one of them walks the index
+    #    instead of sorting the whole listing. The rowid (company_id) breaks ties in index order.
+    [
+        'CREATE INDEX IF NOT EXISTS idx_company_stats_last_activity ON company_stats (last_activity)',
+        'CREATE INDEX IF NOT EXISTS idx_company_stats_max_interview_round ON company_stats (max_interview_round)',
+        'CREATE INDEX IF NOT EXISTS idx_company_stats_application_count ON company_stats (application_count)',
+    ],
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Application columns the grouped listing can be ordered by within each company
+SORT_COLUMNS = ('application_date', 'position', 'status', 'interview_round')
+
+# Company columns (name or a company_stats aggregate) the grouped listing can order companies by
+COMPANY_SORT_COLUMNS = ('name', 'last_activity', 'max_interview_round', 'application_count')
+
+GROUPED_APPLICATIONS_COLUMNS = '''
+    SELECT 
+        c.id as company_id,
+        c.name as company_name,
+        c.description as company_description,
+        a.id as application_id,
+        a.position,
+        a.application_date,
+        a.interview_round,
+        a.last_contact_date,
+        a.status,
+        c.website_url,
+        COALESCE(s.application_count, 0),
+        COALESCE(s.max_interview_round, 0),
+        s.last_activity
+'''
+
+GROUPED_APPLICATIONS_SELECT = f'''{GROUPED_APPLICATIONS_COLUMNS}
+    FROM companies c
+    LEFT JOIN company_stats s ON s.company_id = c.id
+    LEFT JOIN applications a ON c.id = a.company_id
+'''
+
+# Listing ordered by an aggregate: company_stats drives the join, so SQLite can walk the
+# aggregate's index. It only has companies with applications; see COMPANIES_WITHOUT_STATS_SELECT.
+AGGREGATE_GROUPED_APPLICATIONS_SELECT = f'''{GROUPED_APPLICATIONS_COLUMNS}
+    FROM company_stats s
+    JOIN companies c ON c.id = s.company_id
+    JOIN applications a ON c.id = a.company_id
+'''
+
+# Companies without applications (and so without aggregates), in the grouped listing's row layout
+COMPANIES_WITHOUT_STATS_SELECT = '''
+    SELECT c.id, c.name, c.description, NULL, NULL, NULL, NULL, NULL, NULL, c.website_url, 0, 0, NULL
+    FROM companies c
+    WHERE NOT EXISTS (SELECT 1 FROM company_stats s WHERE s.company_id = c.id)
+'''
+
+
+def grouped_applications_query(order_by='application_date', descending=True,
+                               company_order_by='name', company_descending=False):
+    """
+    Build the grouped listing query: companies ordered by name or an aggregate, then their
+    applications ordered by a column. IDs break ties in the same direction, so the order is total.
+    When ordering by an aggregate, companies without applications are left out; they are
+    listed by companies_without_stats_query.
+    Args:
+        order_by (str): One of SORT_COLUMNS.
+        descending (bool): Whether applications are listed in descending order.
+        company_order_by (str): One of COMPANY_SORT_COLUMNS.
+        company_descending (bool): Whether companies are listed in descending order.
+    Returns:
+        str: The query.
+    """
+    if order_by not in SORT_COLUMNS:
+        raise ValueError(f'Cannot sort applications by {order_by!r}')
+    if company_order_by not in COMPANY_SORT_COLUMNS:
+        raise ValueError(f'Cannot sort companies by {company_order_by!r}')
+    direction = 'DESC' if descending else 'ASC'
+    company_direction = 'DESC' if company_descending else 'ASC'
+    if company_order_by == 'name':
+        select = GROUPED_APPLICATIONS_SELECT
+        company_order = f'c.name {company_direction}'
+    else:
+        select = AGGREGATE_GROUPED_APPLICATIONS_SELECT
+        company_order = f's.{company_order_by} {company_direction}, s.company_id {company_direction}'
+    return f'{select}    ORDER BY {company_order}, a.{order_by} {direction}, a.id {direction}\n'
+
+
+def companies_without_stats_query(descending=False):
+    """
+    Build the query listing companies without applications, ordered by ID, in the row layout
+    of grouped_applications_query. Their aggregates are NULL in SQL terms, so they come before
+    the other companies in ascending aggregate order and after them in descending order.
+    Args:
+        descending (bool): Whether companies are listed in descending order.
+    Returns:
+        str: The query.
+    """
+    return f"{COMPANIES_WITHOUT_STATS_SELECT}    ORDER BY c.id {'DESC' if descending else 'ASC'}\n"
+
+
+GROUPED_APPLICATIONS_QUERY = grouped_applications_query()
+
+COMPANY_APPLICATIONS_QUERY = '''
+    SELECT 
+        a.id,
+        a.position,
+        a.application_date,
+        a.interview_round,
+        a.last_contact_date,
+        a.status
+    FROM applications a
+    WHERE a.company_id = ?
+    ORDER BY a.application_date DESC
+'''
+
+UNIQUE_POSITIONS_QUERY = 'SELECT DISTINCT position FROM applications ORDER BY position'
+
+STATUS_COUNTS_QUERY = 'SELECT status, COUNT(*) FROM applications GROUP BY status'
+
+# Words of a search string; each becomes a prefix term of the full-text query
+SEARCH_TERM_PATTERN = re.compile(r'\w+')
+
+# Queries that must be served by an index: name -> (query, sample parameters, index name).
+# Checked with EXPLAIN QUERY PLAN by Database.verify_query_plans.
+INDEXED_QUERIES = {
+    'grouped_listing': (GROUPED_APPLICATIONS_QUERY, (), 'idx_applications_company_date'),
+    'grouped_by_latest_activity': (grouped_applications_query(company_order_by='last_activity',
+                                                              company_descending=True),
+                                   (), 'idx_company_stats_last_activity'),
+    'grouped_by_most_rounds': (grouped_applications_query(company_order_by='max_interview_round',
+                                                          company_descending=True),
+                               (), 'idx_company_stats_max_interview_round'),
+    'grouped_by_most_applications': (grouped_applications_query(company_order_by='application_count',
+                                                                company_descending=True),
+                                     (), 'idx_company_stats_application_count'),
+    'company_listing': (COMPANY_APPLICATIONS_QUERY, (0,), 'idx_applications_company_date'),
+    'unique_positions': (UNIQUE_POSITIONS_QUERY, (), 'idx_applications_position'),
+    'status_counts': (STATUS_COUNTS_QUERY, (), 'idx_applications_status'),
+}
 
 class Database:
     """
     Handles all database operations for the job application tracker.
     Manages tables for companies and applications, and provides methods to add, update, and retrieve data.
     """
-    def __init__(self):
+    def __init__(self, path=DEFAULT_DATABASE_PATH, profile=None, metrics=None):
+        """
+        Initialize the database connection and create or upgrade the schema.
+        Each thread that uses the Database gets its own connection (see conn), so
+        background workers can share the object with the UI thread.
+        Args:
+            path (str): Path of the database file, or ':memory:' for an in-memory database.
+            profile (dict, optional): PRAGMAs overriding those in CONNECTION_PROFILE.
+            metrics (Metrics, optional): Registry for the query cache hit/miss counters.
         """
-        Initialize the database connection and create tables if they do not exist.
+        self.path = path
+        self.profile = dict(CONNECTION_PROFILE, **(profile or {}))
+        self.memory_uri = None
+        if path == MEMORY_DATABASE_PATH:
+            # A named shared-cache database, so every thread's connection sees the same data
+            self.memory_uri = f'file:job_tracker_{next(_memory_databases)}?mode=memory&cache=shared'
+        self.connections = {}  # Thread ident -> that thread's connection
+        self.connections_lock = threading.Lock()
+        self.local = threading.local()
+        self.metrics = metrics or DEFAULT_METRICS
+        # Read-through cache of small, frequently repeated queries (see _cached). Each entry
+        # remembers the generations of the tables it read; committed writes bump them.
+        # 'application_search' is only bumped by writes that change the full-text index, so
+        # searches stay cached across status and round updates.
+        self.query_cache = OrderedDict()  # (query name, *args) -> (generations, result)
+        self.generations = {'companies': 0, 'applications': 0, 'application_search': 0}
+        self.query_cache_lock = threading.Lock()
+        self.migrate()
+
+    def connect(self):
+        """
+        Open a new connection to the database with the connection profile applied.
+        Returns:
+            sqlite3.Connection: The connection.
         """
-        self.conn = sqlite3.connect('job_tracker.db')
-        self.create_tables()
+        if self.memory_uri:
+            conn = sqlite3.connect(self.memory_uri, uri=True, check_same_thread=False)
+            # Readers of a shared-cache database otherwise lock out writers on other threads
+            conn.execute('PRAGMA read_uncommitted = 1')
+        else:
+            # Each connection is only used by one thread at a time, but close() may run on any thread
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+        for name, value in self.profile.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
 
-    def create_tables(self):
+    @property
+    def conn(self):
+        """
+        The calling thread's connection, opened on first use.
         """
-        Create the companies and applications tables if they do not already exist.
-        The companies table stores unique company information.
-        The applications table stores job application details and references companies.
+        ident = threading.get_ident()
+        conn = self.connections.get(ident)
+        if conn is None:
+            conn = self.connect()
+            with self.connections_lock:
+                self.connections[ident] = conn
+        return conn
+
+    @property
+    def transaction_depth(self):
+        """
+        Nesting depth of transaction() blocks on the calling thread.
+        """
+        return getattr(self.local, 'transaction_depth', 0)
+
+    @transaction_depth.setter
+    def transaction_depth(self, depth):
+        self.local.transaction_depth = depth
+
+    def get_schema_version(self):
+        """
+        Get the schema version of the database.
+        Returns:
+            int: The value of PRAGMA user_version (0 for a new or pre-versioning database).
+        """
+        return self.conn.execute('PRAGMA user_version').fetchone()[0]
+
+    def migrate(self):
+        """
+        Bring the schema up to date by applying every pending migration in MIGRATIONS.
+        Each migration runs in its own transaction together with its user_version bump,
+        so an interrupted upgrade leaves the database at the last completed version.
+        Raises:
+            RuntimeError: If the database was created by a newer version of the application.
+        """
+        version = self.get_schema_version()
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f'Database schema version {version} is newer than supported version {SCHEMA_VERSION}')
+        for number in range(version + 1, SCHEMA_VERSION + 1):
+            cursor = self.conn.cursor()
+            # DDL does not open a transaction implicitly, so start one explicitly
+            cursor.execute('BEGIN')
+            try:
+                for statement in MIGRATIONS[number - 1]:
+                    cursor.execute(statement)
+                cursor.execute(f'PRAGMA user_version = {number}')
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
+    def explain_query_plan(self, query, params=()):
+        """
+        Get the query plan SQLite chooses for a query.
+        Args:
+            query (str): The SQL query.
+            params (tuple): Parameters for the query.
+        Returns:
+            list: The plan detail strings (e.g. 'SCAN applications USING COVERING INDEX ...').
         """
         cursor = self.conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS companies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                description TEXT,
-                website_url TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS applications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_id INTEGER NOT NULL,
-                position TEXT NOT NULL,
-                application_date TIMESTAMP NOT NULL,
-                interview_round INTEGER DEFAULT 0,
-                last_contact_date TIMESTAMP,
-                status TEXT DEFAULT 'Applied',
-                FOREIGN KEY (company_id) REFERENCES companies (id)
-            )
-        ''')
-        self.conn.commit()
+        cursor.execute('EXPLAIN QUERY PLAN ' + query, params)
+        return [row[3] for row in cursor.fetchall()]
+
+    def verify_query_plans(self):
+        """
+        Check with EXPLAIN QUERY PLAN that each query in INDEXED_QUERIES uses its index and
+        returns its rows in index order, without sorting them in a temporary B-tree.
+        Returns:
+            dict: Mapping of query name to (uses_index, plan) where uses_index is a bool
+                and plan is the list returned by explain_query_plan.
+        """
+        results = {}
+        for name, (query, params, index) in INDEXED_QUERIES.items():
+            plan = self.explain_query_plan(query, params)
+            uses_index = (any(f'INDEX {index}' in detail for detail in plan)
+                          and not any(detail.startswith('USE TEMP B-TREE') for detail in plan))
+            results[name] = (uses_index, plan)
+        return results
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single transaction (and a single commit).
+        Mutators called inside the block do not commit on their own. Blocks may be nested:
+        only the outermost one commits, and a nested block runs in a savepoint, so an
+        exception leaving it rolls back just its own writes. An exception leaving the
+        outermost block rolls the whole transaction back.
+        Example:
+            with db.transaction():
+                db.add_application('Acme', 'Engineer')
+                db.add_application('Acme', 'Analyst')
+        """
+        depth = self.transaction_depth
+        savepoint = f'transaction_{depth}'
+        if depth:
+            self.conn.execute(f'SAVEPOINT {savepoint}')
+        elif not self.conn.in_transaction:
+            self.conn.execute('BEGIN')
+        self.transaction_depth = depth + 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth = depth
+            if depth:
+                self.conn.execute(f'ROLLBACK TO {savepoint}')
+                self.conn.execute(f'RELEASE {savepoint}')
+            else:
+                self.conn.rollback()
+                self._invalidate_written()
+            raise
+        self.transaction_depth = depth
+        if depth:
+            self.conn.execute(f'RELEASE {savepoint}')
+        else:
+            self.conn.commit()
+            self._invalidate_written()
+
+    def _commit(self, *tables):
+        """
+        Commit the current write unless it is part of an enclosing transaction() block.
+        Args:
+            *tables (str): Tables the write changed, whose cached query results become stale.
+        """
+        self._mark_written(*tables)
+        if self.transaction_depth == 0:
+            self.conn.commit()
+            self._invalidate_written()
+
+    def _mark_written(self, *tables):
+        """
+        Record tables changed on this thread. Their cached query results are invalidated when the
+        write is committed or rolled back; other threads keep reading the old rows until then.
+        """
+        written = getattr(self.local, 'written_tables', None)
+        if written is None:
+            written = self.local.written_tables = set()
+        written.update(tables)
+
+    def _invalidate_written(self):
+        """
+        Bump the generation of every table recorded by _mark_written on this thread.
+        """
+        written = getattr(self.local, 'written_tables', None)
+        if not written:
+            return
+        with self.query_cache_lock:
+            for table in written:
+                self.generations[table] += 1
+        written.clear()
+
+    def _cached(self, name, tables, query, *args):
+        """
+        Read-through cache for a query result, reused until one of the tables it reads is written.
+        Queries made inside a transaction bypass the cache, since they may see uncommitted rows.
+        Args:
+            name (str): Query name, used in the cache key and the hit/miss counters.
+            tables (tuple): Tables the query reads.
+            query (callable): Runs the query; called with args on a miss.
+            *args: Query arguments, part of the cache key.
+        Returns:
+            The (possibly cached) result. Callers must not modify it.
+        """
+        if self.transaction_depth or self.conn.in_transaction:
+            return query(*args)
+        key = (name,) + args
+        with self.query_cache_lock:
+            # Taken before querying, so a write committed meanwhile leaves this entry stale
+            generations = tuple(self.generations[table] for table in tables)
+            entry = self.query_cache.get(key)
+            if entry is not None and entry[0] == generations:
+                self.query_cache.move_to_end(key)
+        if entry is not None and entry[0] == generations:
+            self.metrics.increment(f'query_cache.{name}.hits')
+            return entry[1]
+        self.metrics.increment(f'query_cache.{name}.misses')
+        result = query(*args)
+        with self.query_cache_lock:
+            self.query_cache[key] = (generations, result)
+            self.query_cache.move_to_end(key)
+            if len(self.query_cache) > QUERY_CACHE_SIZE:
+                self.query_cache.popitem(last=False)
+        return result
+
+    def clear_query_cache(self):
+        """
+        Drop all cached query results, e.g. after another process changed the database file.
+        """
+        with self.query_cache_lock:
+            self.query_cache.clear()
 
     def add_application(self, company_name, position, company_description=None, company_website=None):
         """
@@ -69,18 +577,213 @@ class Database:
             INSERT INTO applications (company_id, position, application_date, status)
             VALUES (?, ?, ?, ?)
         ''', (company_id, position, current_time, 'Applied'))
-        self.conn.commit()
+        self._commit('companies', 'applications', 'application_search')
         return cursor.lastrowid
 
+    def add_applications_many(self, rows):
+        """
+        Add many applications in a single transaction.
+        Companies are upserted and their IDs resolved set-wise, then all applications
+        are inserted with one executemany call.
+        Args:
+            rows (iterable): Tuples of (company_name, position, company_description, company_website,
+                application_date, interview_round, last_contact_date, status). Trailing fields may be
+                omitted; missing or None values default to no description/website, the current time,
+                round 0, no last contact and 'Applied'.
+        Returns:
+            int: The number of applications added.
+        """
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = [tuple(row) + (None,) * (8 - len(row)) for row in rows]
+        if not rows:
+            return 0
+
+        # First description/website seen for each company wins, as with INSERT OR IGNORE
+        companies = {}
+        for row in rows:
+            if row[0] not in companies:
+                companies[row[0]] = (row[0], row[2], row[3])
+
+        with self.transaction():
+            self._mark_written('companies', 'applications', 'application_search')
+            cursor = self.conn.cursor()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO companies (name, description, website_url)
+                VALUES (?, ?, ?)
+            ''', companies.values())
+            company_ids = {}
+            names = list(companies)
+            for start in range(0, len(names), MAX_LOOKUP_VARIABLES):
+                chunk = names[start:start + MAX_LOOKUP_VARIABLES]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f'SELECT name, id FROM companies WHERE name IN ({placeholders})', chunk)
+                company_ids.update(cursor.fetchall())
+            cursor.executemany('''
+                INSERT INTO applications
+                    (company_id, position, application_date, interview_round, last_contact_date, status)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                (company_ids[company_name], position, application_date or current_time,
+                 interview_round or 0, last_contact_date, status or 'Applied')
+                for (company_name, position, _, _, application_date, interview_round,
+                     last_contact_date, status) in rows
+            ))
+        return len(rows)
+
     def get_all_applications_grouped(self):
         """
         Retrieve all applications, grouped by company, with company and application details.
         Returns:
-            list: List of tuples containing company and application data.
+            list: List of tuples containing company and application data
+                (company_id, company_name, company_description, application_id, position,
+                application_date, interview_round, last_contact_date, status, website_url,
+                application_count, max_interview_round, last_activity), the last three from company_stats.
+        """
+        return list(self.iter_applications_grouped())
+
+    def iter_applications_grouped(self, batch_size=DEFAULT_BATCH_SIZE, order_by='application_date',
+                                  descending=True, company_order_by='name', company_descending=False):
+        """
+        Stream the rows of get_all_applications_grouped without materialising the full result.
+        Rows are fetched from SQLite in batches, so memory use is bounded by batch_size.
+        Args:
+            batch_size (int): Number of rows fetched per round trip.
+            order_by (str): Column the applications of each company are ordered by, one of SORT_COLUMNS.
+            descending (bool): Whether to order them in descending order (default: newest first).
+            company_order_by (str): Column companies are ordered by, one of COMPANY_SORT_COLUMNS.
+            company_descending (bool): Whether to order companies in descending order.
+        Yields:
+            tuple: Same row layout as get_all_applications_grouped.
+        """
+        order = (order_by, descending, company_order_by, company_descending)
+        if order == ('application_date', True, 'name', False):
+            queries = [GROUPED_APPLICATIONS_QUERY]
+        else:
+            queries = [grouped_applications_query(*order)]
+        if company_order_by != 'name':
+            without_stats = companies_without_stats_query(company_descending)
+            queries = queries + [without_stats] if company_descending else [without_stats] + queries
+        for query in queries:
+            cursor = self.conn.cursor()
+            cursor.execute(query)
+            yield from self._iter_cursor(cursor, batch_size)
+
+    def get_companies_with_applications(self):
+        """
+        Retrieve every company together with its applications in a single query.
+        Returns:
+            list: List of (company_id, name, description, website_url, applications, stats) tuples,
+                ordered by company name. applications is a list of
+                (id, position, application_date, interview_round, last_contact_date, status)
+                tuples, newest first (empty for companies without applications). stats is
+                (application_count, max_interview_round, last_activity), see get_company_stats.
+        """
+        return list(self.iter_companies_with_applications())
+
+    def iter_companies_with_applications(self, batch_size=DEFAULT_BATCH_SIZE, order_by='application_date',
+                                         descending=True, company_order_by='name', company_descending=False):
+        """
+        Stream every company together with its applications, one company at a time.
+        Args:
+            batch_size (int): Number of rows fetched per round trip.
+            order_by (str): Column the applications of each company are ordered by, one of SORT_COLUMNS.
+            descending (bool): Whether to order them in descending order (default: newest first).
+            company_order_by (str): Column companies are ordered by, one of COMPANY_SORT_COLUMNS.
+            company_descending (bool): Whether to order companies in descending order.
+        Yields:
+            tuple: Same layout as get_companies_with_applications.
+        """
+        rows = self.iter_applications_grouped(batch_size, order_by, descending,
+                                              company_order_by, company_descending)
+        for company_id, rows in groupby(rows, key=lambda row: row[0]):
+            rows = list(rows)
+            first = rows[0]
+            applications = [row[3:9] for row in rows if row[3] is not None]
+            yield company_id, first[1], first[2], first[9], applications, first[10:13]
+
+    def get_company_applications(self, company_id):
+        """
+        Retrieve all applications for a specific company.
+        Args:
+            company_id (int): The ID of the company.
+        Returns:
+            list: List of tuples containing application data for the company.
+        """
+        return list(self.iter_company_applications(company_id))
+
+    def iter_company_applications(self, company_id, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Stream the applications of a specific company in batches.
+        Args:
+            company_id (int): The ID of the company.
+            batch_size (int): Number of rows fetched per round trip.
+        Yields:
+            tuple: Same row layout as get_company_applications.
         """
         cursor = self.conn.cursor()
-        cursor.execute('''
-            SELECT 
+        cursor.execute(COMPANY_APPLICATIONS_QUERY, (company_id,))
+        yield from self._iter_cursor(cursor, batch_size)
+
+    def iter_applications(self, statuses=None, date_from=None, date_to=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Stream applications joined with their company, optionally filtered, in batches.
+        Args:
+            statuses (iterable, optional): Only include applications with one of these statuses.
+            date_from (str, optional): Only include applications made on or after this date (YYYY-MM-DD).
+            date_to (str, optional): Only include applications made on or before this date (YYYY-MM-DD).
+            batch_size (int): Number of rows fetched per round trip.
+        Yields:
+            tuple: (company_name, position, company_description, website_url, application_date,
+                interview_round, last_contact_date, status), ordered by company name and
+                application date. This is the row layout accepted by add_applications_many.
+        """
+        conditions = []
+        params = []
+        if statuses:
+            statuses = list(statuses)
+            conditions.append(f"a.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if date_from:
+            conditions.append('a.application_date >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append("a.application_date < date(?, '+1 day')")
+            params.append(date_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT
+                c.name,
+                a.position,
+                c.description,
+                c.website_url,
+                a.application_date,
+                a.interview_round,
+                a.last_contact_date,
+                a.status
+            FROM companies c
+            JOIN applications a ON c.id = a.company_id
+            {where}
+            ORDER BY c.name, a.application_date, a.id
+        ''', params)
+        yield from self._iter_cursor(cursor, batch_size)
+
+    def get_applications_page(self, after=None, limit=DEFAULT_BATCH_SIZE):
+        """
+        Retrieve one page of applications using keyset (seek) pagination.
+        Rows are ordered by (company name, application_date, application id), and each page
+        starts right after the given key instead of using OFFSET, so every page costs the same
+        no matter how deep into the result it is.
+        Args:
+            after (tuple, optional): Key of the last row of the previous page,
+                as returned by page_key. None for the first page.
+            limit (int): Maximum number of rows to return.
+        Returns:
+            list: List of tuples with the same layout as get_all_applications_grouped.
+                Companies without applications are not included.
+        """
+        query = '''
+            SELECT
                 c.id as company_id,
                 c.name as company_name,
                 c.description as company_description,
@@ -89,24 +792,83 @@ class Database:
                 a.application_date,
                 a.interview_round,
                 a.last_contact_date,
-                a.status
+                a.status,
+                c.website_url
             FROM companies c
-            LEFT JOIN applications a ON c.id = a.company_id
-            ORDER BY c.name, a.application_date DESC
-        ''')
+            JOIN applications a ON c.id = a.company_id
+        '''
+        params = ()
+        if after is not None:
+            company_name, application_date, application_id = after
+            # The c.name range lets SQLite seek on the companies name index
+            query += '''
+            WHERE c.name >= ?
+              AND (c.name > ? OR (a.application_date, a.id) > (?, ?))
+            '''
+            params = (company_name, company_name, application_date, application_id)
+        query += '''
+            ORDER BY c.name, a.application_date, a.id
+            LIMIT ?
+        '''
+        cursor = self.conn.cursor()
+        cursor.execute(query, params + (limit,))
         return cursor.fetchall()
 
-    def get_company_applications(self, company_id):
+    @staticmethod
+    def page_key(row):
         """
-        Retrieve all applications for a specific company.
+        Get the keyset pagination key of a row returned by get_applications_page.
         Args:
-            company_id (int): The ID of the company.
+            row (tuple): A row from get_applications_page.
         Returns:
-            list: List of tuples containing application data for the company.
+            tuple: (company_name, application_date, application_id).
+        """
+        return (row[1], row[5], row[3])
+
+    def iter_application_pages(self, page_size=DEFAULT_BATCH_SIZE):
+        """
+        Page through all applications with keyset pagination.
+        Args:
+            page_size (int): Maximum number of rows per page.
+        Yields:
+            list: Successive pages from get_applications_page.
+        """
+        after = None
+        while True:
+            page = self.get_applications_page(after, page_size)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            after = self.page_key(page[-1])
+
+    def _iter_cursor(self, cursor, batch_size):
+        """
+        Yield the rows of an executed cursor, fetching batch_size rows at a time.
+        """
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def get_application(self, application_id):
+        """
+        Retrieve a single application together with its company details.
+        Args:
+            application_id (int): The ID of the application.
+        Returns:
+            tuple: (company_id, company_name, website_url, application_id, position,
+                application_date, interview_round, last_contact_date, status),
+                or None if the application does not exist.
         """
         cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT 
+            SELECT
+                c.id,
+                c.name,
+                c.website_url,
                 a.id,
                 a.position,
                 a.application_date,
@@ -114,10 +876,10 @@ class Database:
                 a.last_contact_date,
                 a.status
             FROM applications a
-            WHERE a.company_id = ?
-            ORDER BY a.application_date DESC
-        ''', (company_id,))
-        return cursor.fetchall()
+            JOIN companies c ON c.id = a.company_id
+            WHERE a.id = ?
+        ''', (application_id,))
+        return cursor.fetchone()
 
     def update_interview_round(self, application_id, round_number):
         """
@@ -133,7 +895,7 @@ class Database:
             SET interview_round = ?, last_contact_date = ?
             WHERE id = ?
         ''', (round_number, current_time, application_id))
-        self.conn.commit()
+        self._commit('applications')
 
     def update_application_status(self, application_id, status):
         """
@@ -149,46 +911,190 @@ class Database:
             SET status = ?, last_contact_date = ?
             WHERE id = ?
         ''', (status, current_time, application_id))
-        self.conn.commit()
+        self._commit('applications')
+
+    def update_application(self, application_id, round_number, status):
+        """
+        Update the interview round, status and last contact date of an application in one statement.
+        Args:
+            application_id (int): The ID of the application.
+            round_number (int): The new interview round number.
+            status (str): The new status (e.g., 'Applied', 'Interview', 'Rejected', 'Accepted').
+        """
+        cursor = self.conn.cursor()
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        cursor.execute('''
+            UPDATE applications 
+            SET interview_round = ?, status = ?, last_contact_date = ?
+            WHERE id = ?
+        ''', (round_number, status, current_time, application_id))
+        self._commit('applications')
 
     def get_unique_companies(self):
         """
-        Retrieve a list of all unique company names in the database.
+        Retrieve a list of all unique company names in the database. Cached (see _cached).
         Returns:
             list: List of company names (str).
         """
+        return list(self._cached('unique_companies', ('companies',), self._query_unique_companies))
+
+    def _query_unique_companies(self):
         cursor = self.conn.cursor()
         cursor.execute('SELECT name FROM companies ORDER BY name')
-        return [row[0] for row in cursor.fetchall()]
+        return tuple(row[0] for row in cursor.fetchall())
 
     def get_unique_positions(self):
         """
-        Retrieve a list of all unique positions in the database.
+        Retrieve a list of all unique positions in the database. Cached (see _cached).
         Returns:
             list: List of position names (str).
         """
+        return list(self._cached('unique_positions', ('applications',), self._query_unique_positions))
+
+    def _query_unique_positions(self):
         cursor = self.conn.cursor()
-        cursor.execute('SELECT DISTINCT position FROM applications ORDER BY position')
-        return [row[0] for row in cursor.fetchall()]
+        cursor.execute(UNIQUE_POSITIONS_QUERY)
+        return tuple(row[0] for row in cursor.fetchall())
 
     def get_total_applications(self):
         """
-        Get the total number of applications in the database.
+        Get the total number of applications in the database. Cached (see _cached).
         Returns:
             int: Total number of applications.
         """
+        return self._cached('total_applications', ('applications',), self._query_total_applications)
+
+    def _query_total_applications(self):
         cursor = self.conn.cursor()
         cursor.execute('SELECT COUNT(*) FROM applications')
         return cursor.fetchone()[0]
 
+    def get_status_counts(self):
+        """
+        Count applications per status. Cached (see _cached).
+        Returns:
+            dict: Mapping of status (str) to number of applications (int).
+        """
+        return dict(self._cached('status_counts', ('applications',), self._query_status_counts))
+
+    def _query_status_counts(self):
+        cursor = self.conn.cursor()
+        cursor.execute(STATUS_COUNTS_QUERY)
+        return dict(cursor.fetchall())
+
+    def get_company_application_counts(self):
+        """
+        Count applications per company. Companies without applications are included with a count of 0.
+        Returns:
+            dict: Mapping of company name (str) to number of applications (int).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT c.name, COUNT(a.id)
+            FROM companies c
+            LEFT JOIN applications a ON a.company_id = c.id
+            GROUP BY c.id
+        ''')
+        return dict(cursor.fetchall())
+
+    def get_position_counts(self):
+        """
+        Count applications per position.
+        Returns:
+            dict: Mapping of position (str) to number of applications (int).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT position, COUNT(*) FROM applications GROUP BY position')
+        return dict(cursor.fetchall())
+
+    def search_applications(self, text, limit=None):
+        """
+        Full-text search over company names, company descriptions and positions.
+        Every word of text must match the start of a word in one of those fields,
+        so 'soft eng' finds 'Software Engineer'.
+        Args:
+            text (str): The search text.
+            limit (int, optional): Maximum number of results.
+        Returns:
+            list: Matching application IDs (int), best match (bm25 rank) first,
+                or None if text contains no searchable words. Cached (see _cached),
+                so callers must not modify it.
+        """
+        terms = SEARCH_TERM_PATTERN.findall(text)
+        if not terms:
+            return None
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return self._cached('search', ('application_search',), self._query_search, match, limit)
+
+    def _query_search(self, match, limit):
+        query = 'SELECT rowid FROM application_search WHERE application_search MATCH ? ORDER BY rank'
+        params = (match,)
+        if limit is not None:
+            query += ' LIMIT ?'
+            params += (limit,)
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_companies_missing_description(self):
+        """
+        Retrieve the names of companies that have no description yet.
+        Returns:
+            list: List of company names (str).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT name FROM companies WHERE description IS NULL OR description = '' ORDER BY name")
+        return [row[0] for row in cursor.fetchall()]
+
+    def set_company_description(self, company_name, description):
+        """
+        Store a looked-up description for a company, unless it already has one.
+        Args:
+            company_name (str): Name of the company.
+            description (str): The description.
+        Returns:
+            bool: True if the description was stored.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            UPDATE companies SET description = ?
+            WHERE name = ? AND (description IS NULL OR description = '')
+        ''', (description, company_name))
+        self._commit('companies', 'application_search')
+        return cursor.rowcount > 0
+
+    def get_company_stats(self, company_id):
+        """
+        Get the aggregates of a company, maintained by triggers on the applications table.
+        Args:
+            company_id (int): The ID of the company.
+        Returns:
+            tuple: (application_count, max_interview_round, last_activity), where last_activity is
+                the latest last contact (or application) date, or (0, 0, None) without applications.
+                Cached (see _cached).
+        """
+        return self._cached('company_stats', ('applications',), self._query_company_stats, company_id)
+
+    def _query_company_stats(self, company_id):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT application_count, max_interview_round, last_activity
+            FROM company_stats
+            WHERE company_id = ?
+        ''', (company_id,))
+        return cursor.fetchone() or (0, 0, None)
+
     def get_company_info(self, company_id):
         """
-        Retrieve the name, description, and website URL for a specific company.
+        Retrieve the name, description, and website URL for a specific company. Cached (see _cached).
         Args:
             company_id (int): The ID of the company.
         Returns:
             tuple: (name, description, website_url) for the company.
         """
+        return self._cached('company_info', ('companies',), self._query_company_info, company_id)
+
+    def _query_company_info(self, company_id):
         cursor = self.conn.cursor()
         cursor.execute('''
             SELECT name, description, website_url
@@ -197,8 +1103,29 @@ class Database:
         ''', (company_id,))
         return cursor.fetchone()
 
+    def release_connection(self):
+        """
+        Close the calling thread's connection, e.g. at the end of a worker thread.
+        A later call on this thread opens a new one.
+        """
+        with self.connections_lock:
+            conn = self.connections.pop(threading.get_ident(), None)
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        """
+        Close the connections of all threads. Call it once no other thread is using the
+        database; an in-memory database is discarded with its last connection.
+        """
+        with self.connections_lock:
+            connections = list(self.connections.values())
+            self.connections.clear()
+        for conn in connections:
+            conn.close()
+
     def __del__(self):
         """
-        Close the database connection when the Database object is deleted.
+        Close the database connections when the Database object is deleted.
         """
-        self.conn.close() 
\ No newline at end of file
+        self.close() 
\ No newline at end of file
@@ -0,0 +1,156 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QTreeWidget, QTreeWidgetItem, QFileDialog, QMessageBox)
+from PyQt6.QtCore import QTimer
+
+# Milliseconds between automatic refreshes of the diagnostics panel
+REFRESH_INTERVAL_MS = 1000
+
+# Histogram summary fields shown in the panel
+HISTOGRAM_FIELDS = ('count', 'mean', 'p50', 'p95', 'max')
+
+
+def format_value(value):
+    """
+    Format a metric value for display.
+    """
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f'{value:.1f}'
+    return str(value)
+
+
+def cache_hit_rate(counters):
+    """
+    Fraction of cache lookups answered with a usable entry (fresh, stale or negative).
+    Args:
+        counters (dict): Counter values from Metrics.snapshot().
+    Returns:
+        float: The hit rate, or None if there were no lookups.
+    """
+    hits = sum(counters.get(f'cache.{status}', 0) for status in ('fresh', 'stale', 'negative'))
+    lookups = hits + counters.get('cache.miss', 0)
+    return hits / lookups if lookups else None
+
+
+def query_cache_hit_rate(counters):
+    """
+    Fraction of cached Database queries answered without hitting SQLite.
+    Args:
+        counters (dict): Counter values from Metrics.snapshot().
+    Returns:
+        float: The hit rate, or None if there were no cached queries.
+    """
+    hits = sum(value for name, value in counters.items()
+               if name.startswith('query_cache.') and name.endswith('.hits'))
+    misses = sum(value for name, value in counters.items()
+                 if name.startswith('query_cache.') and name.endswith('.misses'))
+    return hits / (hits + misses) if hits + misses else None
+
+
+class DiagnosticsDialog(QDialog):
+    """
+    Live view of the metrics (cache effectiveness, API calls and the database query cache),
+    refreshed every second while it is shown, with buttons to reset them or save them as JSON.
+    """
+    def __init__(self, metrics, parent=None):
+        """
+        Args:
+            metrics (Metrics): Registry to display.
+        """
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setWindowTitle('Diagnostics')
+        self.resize(480, 520)
+
+        layout = QVBoxLayout(self)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(['Metric', 'Value'])
+        self.tree.setColumnWidth(0, 260)
+        layout.addWidget(self.tree)
+
+        button_layout = QHBoxLayout()
+        reset_button = QPushButton('Reset')
+        reset_button.clicked.connect(self.reset)
+        save_button = QPushButton('Save JSON...')
+        save_button.clicked.connect(self.save)
+        close_button = QPushButton('Close')
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(save_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        """
+        Show current values and start the periodic refresh.
+        """
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """
+        Stop refreshing while hidden; closing the dialog only hides it.
+        """
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """
+        Rebuild the tree from a fresh snapshot, keeping expanded groups expanded.
+        """
+        snapshot = self.metrics.snapshot()
+        collapsed = {self.tree.topLevelItem(i).text(0) for i in range(self.tree.topLevelItemCount())
+                     if not self.tree.topLevelItem(i).isExpanded()}
+        self.tree.clear()
+
+        summary = QTreeWidgetItem(['Summary'])
+        summary.addChild(QTreeWidgetItem(['Uptime (s)', format_value(snapshot['uptime'])]))
+        hit_rate = cache_hit_rate(snapshot['counters'])
+        summary.addChild(QTreeWidgetItem(
+            ['Cache hit rate', '-' if hit_rate is None else f'{hit_rate:.1%}']))
+        query_hit_rate = query_cache_hit_rate(snapshot['counters'])
+        summary.addChild(QTreeWidgetItem(
+            ['Query cache hit rate', '-' if query_hit_rate is None else f'{query_hit_rate:.1%}']))
+
+        counters = QTreeWidgetItem(['Counters'])
+        for name, value in snapshot['counters'].items():
+            counters.addChild(QTreeWidgetItem([name, format_value(value)]))
+
+        groups = [summary, counters]
+        for name, histogram in snapshot['histograms'].items():
+            group = QTreeWidgetItem([name])
+            for field in HISTOGRAM_FIELDS:
+                group.addChild(QTreeWidgetItem([field, format_value(histogram[field])]))
+            for bucket, count in histogram['buckets'].items():
+                group.addChild(QTreeWidgetItem([bucket, str(count)]))
+            groups.append(group)
+
+        self.tree.addTopLevelItems(groups)
+        for group in groups:
+            group.setExpanded(group.text(0) not in collapsed)
+
+    def reset(self):
+        """
+        Clear all metrics.
+        """
+        self.metrics.reset()
+        self.refresh()
+
+    def save(self):
+        """
+        Ask for a file and save a JSON snapshot of the metrics to it.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, 'Save Diagnostics', 'diagnostics.json', 'JSON (*.json)')
+        if not path:
+            return
+        try:
+            self.metrics.dump(path)
+        except OSError as e:
+            QMessageBox.warning(self, 'Save Failed', str(e))
@@ -0,0 +1,112 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from cache import FRESH, NEGATIVE, STALE
+from opencorporates import OpenCorporatesClient
+
+# Time to live of cached lookup errors, in seconds (not-found results use the cache's negative TTL)
+ERROR_TTL = 5 * 60
+
+
+class _LookupTask(QRunnable):
+    """
+    Runs one company lookup on the service's thread pool.
+    """
+    def __init__(self, service, company_name):
+        super().__init__()
+        self.service = service
+        self.company_name = company_name
+
+    def run(self):
+        try:
+            description = self.service.fetch(self.company_name)
+        except Exception as e:
+            self.service.lookup_done.emit(self.company_name, None, e)
+        else:
+            self.service.lookup_done.emit(self.company_name, description, None)
+
+
+class EnrichmentService(QObject):
+    """
+    Asynchronous company description lookups.
+    Requests are queued on a thread pool so the GUI thread never blocks on the network.
+    Concurrent requests for the same company are deduplicated, results (including
+    not-found results and errors) are stored in the cache, and outcomes are delivered
+    through signals on the GUI thread. A stale cached description is delivered
+    immediately while it is refreshed in the background.
+    Rate limiting and retries are handled by the shared OpenCorporatesClient.
+    """
+    description_ready = pyqtSignal(str, str, str)  # company_name, description, cache status (FRESH or STALE)
+    lookup_failed = pyqtSignal(str, str, str)      # company_name, error message, NEGATIVE if cached else ''
+
+    # Internal: emitted from worker threads, handled on the service's (GUI) thread
+    lookup_done = pyqtSignal(str, object, object)  # company_name, description or None, exception or None
+
+    def __init__(self, cache, client=None, max_workers=2, parent=None):
+        """
+        Args:
+            cache (CompanyCache): Cache for successful lookups.
+            client (OpenCorporatesClient, optional): API client; a default client is created if omitted.
+            max_workers (int): Maximum number of concurrent lookups.
+        """
+        super().__init__(parent)
+        self.cache = cache
+        self.client = client or OpenCorporatesClient()
+        self.in_flight = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self.lookup_done.connect(self._handle_lookup_done)
+
+    def request(self, company_name):
+        """
+        Request the description of a company.
+        Fresh cached descriptions and cached failures are delivered immediately; otherwise
+        a lookup is queued unless one for the same company is already in flight. Stale
+        descriptions are delivered immediately and refreshed.
+        Args:
+            company_name (str): Name of the company.
+        Returns:
+            bool: True if a new network lookup was queued.
+        """
+        data, status = self.cache.lookup(company_name)
+        if status == NEGATIVE:
+            self.lookup_failed.emit(company_name, data, status)
+            return False
+        if status in (FRESH, STALE):
+            self.description_ready.emit(company_name, data, status)
+            if status == FRESH:
+                return False
+        if company_name in self.in_flight:
+            return False
+        self.in_flight.add(company_name)
+        self.pool.start(_LookupTask(self, company_name))
+        return True
+
+    def fetch(self, company_name):
+        """
+        Perform a lookup through the API client. Runs on a worker thread.
+        """
+        return self.client.search_company(company_name)
+
+    def _handle_lookup_done(self, company_name, description, error):
+        self.in_flight.discard(company_name)
+        if description is not None:
+            self.cache.set(company_name, description)
+            self.description_ready.emit(company_name, description, FRESH)
+            return
+        if error is None:
+            message = f'No detailed information found for {company_name}'
+            self.cache.set_negative(company_name, message)
+        else:
+            message = str(error)
+            # A failed refresh keeps serving the stale description
+            if self.cache.lookup(company_name)[1] != STALE:
+                self.cache.set_negative(company_name, message, ttl=ERROR_TTL)
+        self.lookup_failed.emit(company_name, message, '')
+
+    def shutdown(self, timeout_ms=2000):
+        """
+        Drop queued lookups and wait briefly for running ones to finish.
+        """
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
+        self.client.close()
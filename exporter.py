@@ -0,0 +1,233 @@
+import csv
+import json
+import os
+import struct
+import sys
+from array import array
+
+from importer import FIELDS
+
+# Number of rows buffered per row group in the columnar format
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+# Columnar file layout ("JTC1", little-endian):
+#   magic b'JTC1', uint16 column count,
+#   per column: uint8 type (COLUMN_TEXT/COLUMN_INT), uint16 name length, UTF-8 name;
+#   then row groups: uint32 row count (0 ends the file),
+#   per column: uint32 block length, then the block:
+#     null bitmap (1 bit per row, set = NULL),
+#     text: uint32 byte length per row + concatenated UTF-8 values,
+#     int:  int64 per row.
+COLUMNAR_MAGIC = b'JTC1'
+COLUMN_TEXT = 1
+COLUMN_INT = 2
+COLUMN_TYPES = tuple(COLUMN_INT if field == 'interview_round' else COLUMN_TEXT for field in FIELDS)
+
+FORMATS = ('csv', 'jsonl', 'columnar')
+
+
+def detect_format(path):
+    """
+    Guess the output format from a file name.
+    Args:
+        path (str): Path of the output file.
+    Returns:
+        str: One of FORMATS.
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.jtc':
+        return 'columnar'
+    raise ValueError(f'Cannot detect export format of {path}; use a .csv, .jsonl or .jtc file')
+
+
+def _little_endian(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_column(values, column_type):
+    """
+    Encode one column of a row group as a block (see the layout above).
+    """
+    nulls = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is None:
+            nulls[i // 8] |= 1 << (i % 8)
+    if column_type == COLUMN_INT:
+        return bytes(nulls) + _little_endian(array('q', (value or 0 for value in values)))
+    encoded = [str(value).encode('utf-8') if value is not None else b'' for value in values]
+    return bytes(nulls) + _little_endian(array('I', map(len, encoded))) + b''.join(encoded)
+
+
+def _decode_column(block, column_type, count):
+    """
+    Decode one column block of a row group into a list of values.
+    """
+    bitmap_size = (count + 7) // 8
+    nulls = block[:bitmap_size]
+    offset = bitmap_size
+    if column_type == COLUMN_INT:
+        values = array('q')
+        values.frombytes(block[offset:offset + 8 * count])
+        if sys.byteorder != 'little':
+            values.byteswap()
+    else:
+        lengths = array('I')
+        lengths.frombytes(block[offset:offset + 4 * count])
+        if sys.byteorder != 'little':
+            lengths.byteswap()
+        offset += 4 * count
+        values = []
+        for length in lengths:
+            values.append(block[offset:offset + length].decode('utf-8'))
+            offset += length
+    return [None if nulls[i // 8] & (1 << (i % 8)) else values[i] for i in range(count)]
+
+
+def write_csv(rows, f, progress_callback=None):
+    """
+    Write rows as CSV with a header row.
+    Args:
+        rows (iterable): Rows in FIELDS order.
+        f (file): Text file opened with newline=''.
+        progress_callback (callable, optional): Called with the number of rows written so far.
+    Returns:
+        int: The number of rows written.
+    """
+    writer = csv.writer(f)
+    writer.writerow(FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(['' if value is None else value for value in row])
+        count += 1
+        if progress_callback and count % DEFAULT_ROW_GROUP_SIZE == 0:
+            progress_callback(count)
+    return count
+
+
+def write_jsonl(rows, f, progress_callback=None):
+    """
+    Write rows as JSON Lines, one object per row.
+    Args:
+        rows (iterable): Rows in FIELDS order.
+        f (file): Text file.
+        progress_callback (callable, optional): Called with the number of rows written so far.
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    for row in rows:
+        f.write(json.dumps(dict(zip(FIELDS, row))))
+        f.write('\n')
+        count += 1
+        if progress_callback and count % DEFAULT_ROW_GROUP_SIZE == 0:
+            progress_callback(count)
+    return count
+
+
+def write_columnar(rows, f, progress_callback=None, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Write rows in the compact columnar format. Only one row group is buffered at a time.
+    Args:
+        rows (iterable): Rows in FIELDS order.
+        f (file): Binary file.
+        progress_callback (callable, optional): Called with the number of rows written so far.
+        row_group_size (int): Number of rows per row group.
+    Returns:
+        int: The number of rows written.
+    """
+    f.write(COLUMNAR_MAGIC)
+    f.write(struct.pack('<H', len(FIELDS)))
+    for field, column_type in zip(FIELDS, COLUMN_TYPES):
+        name = field.encode('utf-8')
+        f.write(struct.pack('<BH', column_type, len(name)))
+        f.write(name)
+
+    count = 0
+    group = []
+
+    def flush():
+        f.write(struct.pack('<I', len(group)))
+        for column, column_type in zip(zip(*group), COLUMN_TYPES):
+            block = _encode_column(column, column_type)
+            f.write(struct.pack('<I', len(block)))
+            f.write(block)
+        group.clear()
+        if progress_callback:
+            progress_callback(count)
+
+    for row in rows:
+        group.append(row)
+        count += 1
+        if len(group) >= row_group_size:
+            flush()
+    if group:
+        flush()
+    f.write(struct.pack('<I', 0))
+    return count
+
+
+def iter_columnar(path):
+    """
+    Read back a file written by write_columnar, one row group at a time.
+    Args:
+        path (str): Path of the columnar file.
+    Yields:
+        tuple: Rows in the file's column order.
+    Raises:
+        ValueError: If the file is not a columnar export.
+    """
+    with open(path, 'rb') as f:
+        if f.read(4) != COLUMNAR_MAGIC:
+            raise ValueError(f'{path} is not a columnar export file')
+        column_count, = struct.unpack('<H', f.read(2))
+        column_types = []
+        for _ in range(column_count):
+            column_type, name_length = struct.unpack('<BH', f.read(3))
+            f.read(name_length)
+            column_types.append(column_type)
+        while True:
+            count, = struct.unpack('<I', f.read(4))
+            if count == 0:
+                return
+            columns = []
+            for column_type in column_types:
+                block_length, = struct.unpack('<I', f.read(4))
+                columns.append(_decode_column(f.read(block_length), column_type, count))
+            yield from zip(*columns)
+
+
+def export_file(db, path, format=None, statuses=None, date_from=None, date_to=None,
+                progress_callback=None):
+    """
+    Export applications joined with their companies, streaming rows from a SQLite cursor.
+    Memory use is constant regardless of database size.
+    Args:
+        db (Database): Database to export from.
+        path (str): Path of the output file.
+        format (str, optional): One of FORMATS; detected from the file name if omitted.
+        statuses (iterable, optional): Only export applications with one of these statuses.
+        date_from (str, optional): Only export applications made on or after this date (YYYY-MM-DD).
+        date_to (str, optional): Only export applications made on or before this date (YYYY-MM-DD).
+        progress_callback (callable, optional): Called periodically with the number of rows written.
+    Returns:
+        int: The number of rows exported.
+    """
+    format = format or detect_format(path)
+    if format not in FORMATS:
+        raise ValueError(f'Unsupported export format: {format}')
+    rows = db.iter_applications(statuses=statuses, date_from=date_from, date_to=date_to)
+    if format == 'columnar':
+        with open(path, 'wb') as f:
+            return write_columnar(rows, f, progress_callback)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        if format == 'csv':
+            return write_csv(rows, f, progress_callback)
+        return write_jsonl(rows, f, progress_callback)
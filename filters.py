@@ -0,0 +1,359 @@
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from metrics import DEFAULT_METRICS
+
+# Number of filter results (and full-text search results) kept, so going back to a recent
+# filter, e.g. by backspacing in the search box, needs no work
+FILTER_CACHE_SIZE = 32
+
+# Interview rounds are stored in one byte; higher rounds are counted as this one
+MAX_STORED_ROUND = 255
+
+
+def date_value(value):
+    """
+    Convert a date to the integer stored in the date column.
+    Args:
+        value (datetime): The date.
+    Returns:
+        int: Seconds since 0001-01-01, so datetime.min (a missing date) is 0.
+    """
+    return (value.toordinal() - 1) * 86400 + value.hour * 3600 + value.minute * 60 + value.second
+
+
+def intersect(bitmaps, length):
+    """
+    AND visibility bitmaps together.
+    Bitmaps hold one byte (0 or 1) per row, so ANDing them as big integers works byte by byte.
+    Args:
+        bitmaps (list): Bitmaps (bytes-like) of the same length.
+        length (int): Number of rows.
+    Returns:
+        bytes: The combined bitmap.
+    """
+    value = int.from_bytes(bitmaps[0], 'little')
+    for bitmap in bitmaps[1:]:
+        value &= int.from_bytes(bitmap, 'little')
+    return value.to_bytes(length, 'little')
+
+
+def _pad(old, length):
+    """
+    Cut or extend a bitmap to length rows; rows added since count as visible.
+    """
+    return bytes(old[:length]) + b'\x01' * (length - len(old))
+
+
+def _difference(old, new):
+    """
+    XOR two bitmaps of the same length, giving 1 for every row whose visibility differs.
+    """
+    return (int.from_bytes(old, 'little') ^ int.from_bytes(new, 'little')).to_bytes(len(new), 'little')
+
+
+def changed_positions(old, new):
+    """
+    Find the rows whose visibility differs between two bitmaps.
+    Rows beyond the end of old (added since) count as visible in it.
+    Args:
+        old (bytes): The previous bitmap.
+        new (bytes): The new bitmap.
+    Yields:
+        int: Row positions, in order.
+    """
+    diff = _difference(_pad(old, len(new)), new)
+    position = diff.find(1)
+    while position != -1:
+        yield position
+        position = diff.find(1, position + 1)
+
+
+def changed_groups(columns, old, new):
+    """
+    Find the groups (see ApplicationColumns.add) with a row whose visibility differs between
+    two bitmaps. Rows beyond the end of old count as visible in it.
+    Few changes are looked up row by row; otherwise the bitmaps are compared group by group,
+    one slice per run of positions, so the cost stays bounded by the number of groups.
+    Args:
+        columns (ApplicationColumns): The store the bitmaps were computed on.
+        old (bytes): The previous bitmap.
+        new (bytes): The new bitmap.
+    Returns:
+        set: The changed groups.
+    """
+    old = _pad(old, len(new))
+    if old == new:
+        return set()
+    diff = _difference(old, new)
+    if diff.count(1) < len(columns.group_runs):
+        groups = columns.groups
+        changed = set()
+        position = diff.find(1)
+        while position != -1:
+            if groups[position] is not None:
+                changed.add(groups[position])
+            position = diff.find(1, position + 1)
+        return changed
+    changed = set()
+    for group, runs in columns.group_runs.items():
+        for start, end in runs:
+            if old[start:end] != new[start:end]:
+                changed.add(group)
+                break
+    return changed
+
+
+class ApplicationFilter:
+    """
+    A combination of predicates; an application is visible if it matches all of them.
+    Predicates left as None are not applied. Filters are immutable and hashable, so their
+    results can be cached.
+    """
+    __slots__ = ('statuses', 'date_from', 'date_to', 'min_round', 'max_round', 'company_ids', 'text')
+
+    def __init__(self, statuses=None, date_from=None, date_to=None, min_round=None, max_round=None,
+                 company_ids=None, text=None):
+        """
+        Args:
+            statuses (iterable, optional): Statuses to show.
+            date_from (datetime, optional): Earliest application date to show.
+            date_to (datetime, optional): Latest application date to show.
+            min_round (int, optional): Lowest interview round to show.
+            max_round (int, optional): Highest interview round to show.
+            company_ids (iterable, optional): IDs of the companies to show.
+            text (str, optional): Full-text search text, see Database.search_applications.
+        """
+        self.statuses = frozenset(statuses) if statuses is not None else None
+        self.date_from = date_from
+        self.date_to = date_to
+        self.min_round = min_round
+        self.max_round = max_round
+        self.company_ids = frozenset(company_ids) if company_ids is not None else None
+        self.text = (text.strip() or None) if text else None
+
+    def key(self):
+        return (self.statuses, self.date_from, self.date_to, self.min_round, self.max_round,
+                self.company_ids, self.text)
+
+    def is_empty(self):
+        """
+        Check whether the filter shows every application.
+        """
+        return all(value is None for value in self.key())
+
+    def __eq__(self, other):
+        return isinstance(other, ApplicationFilter) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+class ApplicationColumns:
+    """
+    Column store of the loaded applications: one compact array per filterable field,
+    indexed by a row position that stays fixed while the application is loaded.
+    Removed applications leave a dead position (see alive) until the store is cleared.
+    Applications may be added under a group, such as the tree node showing them; the positions
+    of each group are kept as runs, so a group's part of a bitmap can be sliced out at once.
+    """
+    def __init__(self):
+        self.generation = 0  # Bumped on every change, so cached filter results can be told apart
+        self.clear()
+
+    def clear(self):
+        """
+        Remove all applications, e.g. before reloading.
+        """
+        self.records = []  # Position -> ApplicationRecord (None once removed)
+        self.status_codes = bytearray()  # Position -> code in status_code_map
+        self.rounds = bytearray()  # Position -> interview round, capped at MAX_STORED_ROUND
+        self.dates = array('q')  # Position -> date_value of the application date
+        self.alive = bytearray()  # Position -> 1 while the application is loaded
+        self.groups = []  # Position -> group the application was added under, or None
+        self.group_runs = {}  # Group -> [start, end) runs of its positions, in order
+        self.positions = {}  # Application ID -> position
+        self.company_positions = {}  # Company ID -> positions of its applications
+        self.status_code_map = {}  # Status -> code (1-255), assigned on first use
+        self.generation += 1
+
+    def __len__(self):
+        return len(self.records)
+
+    def status_code(self, status):
+        code = self.status_code_map.get(status)
+        if code is None:
+            code = self.status_code_map[status] = len(self.status_code_map) + 1
+        return code
+
+    def add(self, records, group=None):
+        """
+        Append applications to the store.
+        Args:
+            records (iterable): ApplicationRecord objects.
+            group (hashable, optional): Group the applications belong to. A removed application
+                stays in its group as a dead position.
+        """
+        start = len(self.records)
+        for record in records:
+            position = len(self.records)
+            self.records.append(record)
+            self.status_codes.append(self.status_code(record.status))
+            self.rounds.append(min(max(record.interview_round, 0), MAX_STORED_ROUND))
+            self.dates.append(date_value(record.applied_at))
+            self.alive.append(1)
+            self.positions[record.id] = position
+            self.company_positions.setdefault(record.company_id, []).append(position)
+            self.groups.append(group)
+        end = len(self.records)
+        if group is not None and end > start:
+            runs = self.group_runs.setdefault(group, [])
+            if runs and runs[-1][1] == start:
+                runs[-1][1] = end
+            else:
+                runs.append([start, end])
+        self.generation += 1
+
+    def remove(self, application_id):
+        """
+        Remove an application from the store. Does nothing if it is not loaded.
+        Args:
+            application_id (int): The ID of the application.
+        """
+        position = self.positions.pop(application_id, None)
+        if position is None:
+            return
+        self.records[position] = None
+        self.alive[position] = 0
+        self.generation += 1
+
+    def group_bitmap(self, bitmap, group):
+        """
+        Cut the rows of a group out of a bitmap.
+        Args:
+            bitmap (bytes): A bitmap of this store.
+            group (hashable): The group.
+        Returns:
+            bytes: The group's bytes, in position order (empty for an unknown group).
+        """
+        runs = self.group_runs.get(group, ())
+        if len(runs) == 1:
+            start, end = runs[0]
+            return bitmap[start:end]
+        return b''.join(bitmap[start:end] for start, end in runs)
+
+    def select(self, positions):
+        """
+        Build a bitmap with only the given positions set.
+        """
+        bitmap = bytearray(len(self.records))
+        for position in positions:
+            bitmap[position] = 1
+        return bitmap
+
+
+class FilterEngine:
+    """
+    Evaluates ApplicationFilters on an ApplicationColumns store.
+    Each predicate becomes a visibility bitmap (one byte per row position), computed with
+    bytes.translate lookups on the byte columns or a single pass over the date column,
+    and the bitmaps are ANDed together. The most recent results are cached per filter
+    and store generation.
+    """
+    def __init__(self, columns, search=None, cache_size=FILTER_CACHE_SIZE, metrics=None):
+        """
+        Args:
+            columns (ApplicationColumns): The store to filter.
+            search (callable, optional): Full-text search taking the text and returning matching
+                application IDs, or None if the text has no searchable words
+                (Database.search_applications). Without it, text predicates are ignored.
+            cache_size (int): Number of filter results and search results kept.
+            metrics (Metrics, optional): Registry for the filter cache hit/miss counters.
+        """
+        self.columns = columns
+        self.search = search
+        self.cache_size = cache_size
+        self.metrics = metrics or DEFAULT_METRICS
+        self.results = OrderedDict()  # (generation, filter) -> bitmap, least recently used first
+        self.search_results = OrderedDict()  # (generation, text) -> set of IDs or None
+
+    def clear_cache(self):
+        """
+        Drop all cached filter and search results.
+        """
+        self.results.clear()
+        self.search_results.clear()
+
+    def evaluate(self, application_filter):
+        """
+        Get the visibility bitmap of a filter.
+        Args:
+            application_filter (ApplicationFilter): The filter.
+        Returns:
+            bytes: One byte per position of the store, 1 if the application is visible.
+                Removed applications are never visible.
+        """
+        key = (self.columns.generation, application_filter)
+        bitmap = self.results.get(key)
+        if bitmap is not None:
+            self.results.move_to_end(key)
+            self.metrics.increment('filter_cache.hits')
+            return bitmap
+        self.metrics.increment('filter_cache.misses')
+        bitmap = self._evaluate(application_filter)
+        self.results[key] = bitmap
+        if len(self.results) > self.cache_size:
+            self.results.popitem(last=False)
+        return bitmap
+
+    def _evaluate(self, application_filter):
+        columns = self.columns
+        bitmaps = [columns.alive]
+        if application_filter.statuses is not None:
+            table = bytearray(256)
+            for status in application_filter.statuses:
+                code = columns.status_code_map.get(status)
+                if code is not None:
+                    table[code] = 1
+            bitmaps.append(columns.status_codes.translate(table))
+        if application_filter.min_round is not None or application_filter.max_round is not None:
+            low = max(application_filter.min_round or 0, 0)
+            high = MAX_STORED_ROUND if application_filter.max_round is None else application_filter.max_round
+            table = bytearray(256)
+            for value in range(low, min(high, MAX_STORED_ROUND) + 1):
+                table[value] = 1
+            bitmaps.append(columns.rounds.translate(table))
+        if application_filter.date_from is not None or application_filter.date_to is not None:
+            low = date_value(application_filter.date_from or datetime.min)
+            high = date_value(application_filter.date_to or datetime.max)
+            bitmaps.append(bytes(low <= value <= high for value in columns.dates))
+        if application_filter.company_ids is not None:
+            bitmaps.append(columns.select(
+                position for company_id in application_filter.company_ids
+                for position in columns.company_positions.get(company_id, ())))
+        if application_filter.text is not None:
+            matches = self.search_matches(application_filter.text)
+            if matches is not None:
+                positions = columns.positions
+                bitmaps.append(columns.select(positions[application_id] for application_id in matches
+                                              if application_id in positions))
+        return intersect(bitmaps, len(columns))
+
+    def search_matches(self, text):
+        """
+        Run the full-text search for a text, reusing recent results.
+        Returns:
+            set: Matching application IDs, or None if there is nothing to search for (or no search).
+        """
+        if self.search is None:
+            return None
+        key = (self.columns.generation, text)
+        if key in self.search_results:
+            self.search_results.move_to_end(key)
+            return self.search_results[key]
+        matches = self.search(text)
+        matches = set(matches) if matches is not None else None
+        self.search_results[key] = matches
+        if len(self.search_results) > self.cache_size:
+            self.search_results.popitem(last=False)
+        return matches
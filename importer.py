@@ -0,0 +1,283 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+# Number of rows written per transaction
+DEFAULT_CHUNK_SIZE = 5000
+
+# Encoding of input files: UTF-8, with or without a byte order mark
+DEFAULT_ENCODING = 'utf-8-sig'
+
+# Input columns, in the order expected by Database.add_applications_many
+FIELDS = ('company', 'position', 'description', 'website',
+          'application_date', 'interview_round', 'last_contact_date', 'status')
+
+# Alternative column names accepted in input files
+FIELD_ALIASES = {
+    'company_name': 'company',
+    'company_description': 'description',
+    'website_url': 'website',
+    'company_website': 'website',
+    'date': 'application_date',
+    'round': 'interview_round',
+    'last_contact': 'last_contact_date',
+}
+
+# Statuses known to the app; input statuses are matched case-insensitively
+STATUSES = ('Applied', 'Interview', 'Rejected', 'Accepted')
+STATUS_NAMES = {status.lower(): status for status in STATUSES}
+
+# Format of the dates stored in the database
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Other date formats accepted in input files, besides ISO 8601
+INPUT_DATE_FORMATS = ('%m/%d/%Y', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S')
+
+# Number of skipped input lines remembered for reporting
+MAX_REPORTED_SKIPS = 20
+
+
+class ImportProgress:
+    """
+    Progress of a running import.
+    """
+    def __init__(self, total_bytes):
+        self.rows = 0
+        self.skipped = 0
+        self.skipped_lines = []  # (line number, reason) of the first MAX_REPORTED_SKIPS skipped rows
+        self.bytes_read = 0
+        self.total_bytes = total_bytes
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def percent(self):
+        """
+        float: Percentage of the input file consumed so far.
+        """
+        if not self.total_bytes:
+            return 100.0
+        return min(100.0, 100.0 * self.bytes_read / self.total_bytes)
+
+    @property
+    def rows_per_second(self):
+        """
+        float: Import throughput so far.
+        """
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def skip(self, line, reason):
+        """
+        Count a skipped input row.
+        Args:
+            line (int): Line number of the row in the input file.
+            reason (str): Why it was skipped.
+        """
+        self.skipped += 1
+        if len(self.skipped_lines) < MAX_REPORTED_SKIPS:
+            self.skipped_lines.append((line, reason))
+
+    def __str__(self):
+        return (f'{self.rows} rows imported, {self.skipped} skipped '
+                f'({self.percent:.0f}%, {self.rows_per_second:.0f} rows/s)')
+
+
+def detect_format(path):
+    """
+    Guess the input format from a file name.
+    Args:
+        path (str): Path of the input file.
+    Returns:
+        str: 'csv', 'jsonl' or 'json'.
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.json':
+        return 'json'
+    raise ValueError(f'Cannot detect import format of {path}; use a .csv, .jsonl or .json file')
+
+
+def _iter_lines(f, progress, encoding):
+    """
+    Yield decoded lines of a binary file, counting consumed bytes in progress.
+    A line that cannot be decoded is counted as skipped and yielded as an empty line,
+    so the parsers pass over it and later line numbers stay right.
+    """
+    for line_number, line in enumerate(f, 1):
+        progress.bytes_read += len(line)
+        try:
+            yield line.decode(encoding)
+        except UnicodeDecodeError:
+            progress.skip(line_number, f'cannot be decoded as {encoding}')
+            yield '\n'
+
+
+def _normalize_key(key):
+    key = (key or '').strip().lower().replace(' ', '_')
+    return FIELD_ALIASES.get(key, key)
+
+
+def normalize_date(value):
+    """
+    Convert an input date to the format stored in the database.
+    Accepts ISO 8601 dates and times (a UTC offset is converted to local time) and US-style
+    MM/DD/YYYY dates.
+    Args:
+        value (str): The date.
+    Returns:
+        str: The date as 'YYYY-MM-DD HH:MM:SS'.
+    Raises:
+        ValueError: If the date cannot be parsed.
+    """
+    if not isinstance(value, str):
+        raise ValueError(f'invalid date {value!r}')
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00') if value.endswith('Z') else value)
+    except ValueError:
+        parsed = None
+        for date_format in INPUT_DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                pass
+        if parsed is None:
+            raise ValueError(f'invalid date {value!r}')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime(DATE_FORMAT)
+
+
+def _to_row(record):
+    """
+    Convert a parsed record (dict) to an add_applications_many tuple.
+    Dates are normalized to DATE_FORMAT and the status to one of STATUSES.
+    Returns:
+        tuple: The row.
+    Raises:
+        ValueError: If the record is not an object, is missing required fields or has an
+            invalid round, date or status.
+    """
+    if not isinstance(record, dict):
+        raise ValueError('not an object')
+    values = {_normalize_key(key): value for key, value in record.items()}
+    row = []
+    for field in FIELDS:
+        value = values.get(field)
+        if isinstance(value, str):
+            value = value.strip() or None
+        row.append(value)
+    if not row[0] or not row[1]:
+        raise ValueError('missing company or position')
+    if row[5] is not None:
+        try:
+            row[5] = int(row[5])
+        except (TypeError, ValueError):
+            raise ValueError(f'invalid interview round {row[5]!r}') from None
+    for index in (4, 6):
+        if row[index] is not None:
+            row[index] = normalize_date(row[index])
+    if row[7] is not None:
+        status = STATUS_NAMES.get(str(row[7]).lower())
+        if status is None:
+            raise ValueError(f'unknown status {row[7]!r}')
+        row[7] = status
+    return tuple(row)
+
+
+def iter_records(f, format, progress, encoding=DEFAULT_ENCODING):
+    """
+    Stream-parse an open binary file into records.
+    CSV and JSON Lines files are decoded line by line; lines that cannot be decoded are
+    counted as skipped in progress. In JSON Lines files a line that is not valid JSON is
+    yielded as None so the import can skip it and go on. A JSON file must hold an array of
+    objects and is parsed as a whole, since a JSON array cannot be checked piece by piece.
+    Args:
+        f (file): File opened in binary mode.
+        format (str): 'csv', 'jsonl' or 'json'.
+        progress (ImportProgress): Updated with the number of bytes consumed.
+        encoding (str): Text encoding of the file. For CSV and JSON Lines it must encode
+            line breaks as single bytes, as UTF-8 and the 8-bit code pages do.
+    Yields:
+        tuple: (line, record): the line number of the row (the item number in a JSON array)
+            and the parsed record (normally a dict), or None if it could not be parsed.
+    Raises:
+        ValueError: If a JSON file is not valid JSON or not an array.
+    """
+    if format == 'csv':
+        reader = csv.DictReader(_iter_lines(f, progress, encoding))
+        for record in reader:
+            yield reader.line_num, record
+    elif format == 'jsonl':
+        for line_number, line in enumerate(_iter_lines(f, progress, encoding), 1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError:
+                    yield line_number, None
+    elif format == 'json':
+        data = f.read()
+        progress.bytes_read = len(data)
+        try:
+            records = json.loads(data.decode(encoding))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f'Invalid JSON file: {e}') from None
+        if not isinstance(records, list):
+            raise ValueError('A JSON file must contain an array of applications')
+        yield from enumerate(records, 1)
+    else:
+        raise ValueError(f'Unsupported import format: {format}')
+
+
+def import_file(db, path, format=None, chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None,
+                encoding=DEFAULT_ENCODING):
+    """
+    Import applications from a CSV, JSON Lines or JSON file.
+    The file is parsed as a stream and written in chunks of chunk_size rows, one transaction
+    per chunk, so memory use does not depend on the file size (except for JSON arrays, which
+    are read whole). Companies are deduplicated against the companies table by
+    Database.add_applications_many. Rows that cannot be decoded or parsed or that have
+    invalid values are skipped and counted in ImportProgress.skipped.
+    Args:
+        db (Database): Database to import into.
+        path (str): Path of the input file.
+        format (str, optional): 'csv', 'jsonl' or 'json'; detected from the file name if omitted.
+        chunk_size (int): Number of rows written per transaction.
+        progress_callback (callable, optional): Called with the ImportProgress after every chunk.
+        encoding (str): Text encoding of the file, e.g. 'cp1252' for files saved by older Excel versions.
+    Returns:
+        ImportProgress: Final statistics of the import.
+    """
+    format = format or detect_format(path)
+    progress = ImportProgress(os.path.getsize(path))
+    chunk = []
+
+    def flush():
+        progress.rows += db.add_applications_many(chunk)
+        chunk.clear()
+        progress.elapsed = time.perf_counter() - progress.started
+        if progress_callback:
+            progress_callback(progress)
+
+    with open(path, 'rb') as f:
+        for line, record in iter_records(f, format, progress, encoding):
+            if record is None:
+                progress.skip(line, 'invalid JSON')
+                continue
+            try:
+                row = _to_row(record)
+            except ValueError as e:
+                progress.skip(line, str(e))
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                flush()
+    flush()
+    return progress
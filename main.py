@@ -1,33 +1,72 @@
 import sys
-import requests
-import time
 import re
+from bisect import bisect_right
+from datetime import datetime, time
 from urllib.parse import urlparse
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QLabel, QLineEdit, QPushButton,
-                            QComboBox, QTreeWidget, QTreeWidgetItem, QMessageBox,
-                            QCompleter, QHeaderView, QToolBar, QTabWidget)
-from PyQt6.QtCore import Qt, QStringListModel, QUrl
-from PyQt6.QtGui import QDesktopServices
-from database import Database
-from cache import CompanyCache
+                            QComboBox, QTreeView, QMessageBox, QDateEdit,
+                            QCompleter, QHeaderView, QToolBar, QTabWidget, QFileDialog)
+from PyQt6.QtCore import Qt, QDate, QStringListModel, QUrl, QModelIndex, QTimer
+from PyQt6.QtGui import QDesktopServices, QAction
+from application_model import (ApplicationRecord, ApplicationTreeModel, COMPANY_SORT_OPTIONS,
+                               SORT_OPTIONS, STATUS_COLORS)
+from database import DEFAULT_DATABASE_PATH, Database
+from diagnostics import DiagnosticsDialog
+from filters import ApplicationColumns, ApplicationFilter, FilterEngine, changed_groups
+from metrics import DEFAULT_METRICS
+from cache import NEGATIVE, CompanyCache
+from suggestions import SuggestionIndex
+from workers import EnrichWorker, ExportWorker, ImportWorker, LoadWorker
+
+# Delay after the last keystroke before the search is run
+SEARCH_DEBOUNCE_MS = 200
+
+# Lowest value of the date filters, shown as 'Any' and meaning no limit
+ANY_DATE = QDate(1900, 1, 1)
 
 class JobTrackerApp(QMainWindow):
     """
     Main application window for the Job Application Tracker.
     Handles UI setup, user interactions, and communication with the database.
     """
-    def __init__(self):
+    def __init__(self, database_path=DEFAULT_DATABASE_PATH):
         """
         Initialize the main window, database, and UI components.
+        Args:
+            database_path (str): Path of the database file, or ':memory:'.
         """
         super().__init__()
-        self.db = Database()
-        self.cache = CompanyCache()
-        self.last_api_call = 0
-        self.min_api_interval = 1  # Minimum seconds between API calls
+        self.db = Database(database_path)
+        self.cache = CompanyCache(write_behind=True)
+        # Company description lookups; created on first use (see enrichment_service)
+        self.enrichment = None
+        self.task_worker = None  # Running background task (loading, import, export or enrichment), if any
+        # Filterable fields of the loaded applications, and the visibility last applied to the trees
+        self.columns = ApplicationColumns()
+        self.filter_engine = FilterEngine(self.columns, self.db.search_applications)
+        self.visibility = b''
+        self.hidden_companies = set()  # CompanyNodes whose rows the filter has hidden
+        self.status_counts = {}
+        # Filled in by the background loader; see load_applications
+        self.build_suggestion_indexes({}, {})
         self.init_ui()
 
+    def build_suggestion_indexes(self, company_counts, position_counts):
+        """
+        Build the in-memory company and position suggestion indexes.
+        Counts come from aggregate queries when the data is loaded; afterwards the
+        indexes are updated incrementally as applications are added.
+        Args:
+            company_counts (dict): Mapping of company name to number of applications.
+            position_counts (dict): Mapping of position to number of applications.
+        """
+        self.company_index = SuggestionIndex(company_counts)
+        self.position_index = SuggestionIndex(position_counts)
+        # Index version currently shown by each completer model (None when empty)
+        self.company_model_version = None
+        self.position_model_version = None
+
     def init_ui(self):
         """
         Set up the user interface, including all widgets, layouts, and signals.
@@ -35,6 +74,29 @@ class JobTrackerApp(QMainWindow):
         self.setWindowTitle('Job Application Tracker')
         self.setGeometry(100, 100, 1000, 700)  
 
+        # File menu
+        file_menu = self.menuBar().addMenu('File')
+        self.import_action = QAction('Import Applications...', self)
+        self.import_action.triggered.connect(self.import_applications)
+        file_menu.addAction(self.import_action)
+        self.export_action = QAction('Export Applications...', self)
+        self.export_action.triggered.connect(self.export_applications)
+        file_menu.addAction(self.export_action)
+        self.enrich_action = QAction('Enrich Company Descriptions', self)
+        self.enrich_action.triggered.connect(self.enrich_companies)
+        file_menu.addAction(self.enrich_action)
+        self.stop_enrich_action = QAction('Stop Enrichment', self)
+        self.stop_enrich_action.triggered.connect(self.stop_enrichment)
+        self.stop_enrich_action.setEnabled(False)
+        file_menu.addAction(self.stop_enrich_action)
+
+        # View menu
+        view_menu = self.menuBar().addMenu('View')
+        diagnostics_action = QAction('Diagnostics...', self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        view_menu.addAction(diagnostics_action)
+        self.diagnostics_dialog = None
+
         # Create central widget and layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -68,6 +130,7 @@ class JobTrackerApp(QMainWindow):
         self.company_completer.setFilterMode(Qt.MatchFlag.MatchContains)
         self.company_input.setCompleter(self.company_completer)
         self.company_input.textChanged.connect(self.update_company_suggestions)
+        self.company_input.editingFinished.connect(self.request_company_description)
         self.update_company_completer()  # Initial population
         company_layout.addWidget(company_label)
         company_layout.addWidget(self.company_input)
@@ -120,9 +183,9 @@ class JobTrackerApp(QMainWindow):
         form_layout.addLayout(status_layout)
 
         # Add button
-        add_button = QPushButton('Add Application')
-        add_button.clicked.connect(self.add_application)
-        form_layout.addWidget(add_button)
+        self.add_button = QPushButton('Add Application')
+        self.add_button.clicked.connect(self.add_application)
+        form_layout.addWidget(self.add_button)
 
         layout.addLayout(form_layout)
 
@@ -132,8 +195,13 @@ class JobTrackerApp(QMainWindow):
         # Search input
         search_label = QLabel('Search:')
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText('Search companies, positions, or status...')
-        self.search_input.textChanged.connect(self.filter_applications)
+        self.search_input.setPlaceholderText('Search companies, descriptions, or positions...')
+        # Search is debounced: it runs once typing pauses, not on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_applications)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         
@@ -144,6 +212,14 @@ class JobTrackerApp(QMainWindow):
         self.status_filter.currentTextChanged.connect(self.filter_applications)
         search_layout.addWidget(status_label)
         search_layout.addWidget(self.status_filter)
+
+        # Filter by application date range
+        self.date_from_filter = self.create_date_filter()
+        self.date_to_filter = self.create_date_filter()
+        search_layout.addWidget(QLabel('From:'))
+        search_layout.addWidget(self.date_from_filter)
+        search_layout.addWidget(QLabel('To:'))
+        search_layout.addWidget(self.date_to_filter)
         
         # Clear filters button
         clear_filters_btn = QPushButton('Clear Filters')
@@ -159,24 +235,30 @@ class JobTrackerApp(QMainWindow):
         # Active Applications tab
         active_tab = QWidget()
         active_layout = QVBoxLayout(active_tab)
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(['Company/Position', 'Website', 'Application Date', 'Interview Round', 'Last Contact', 'Status'])
+        self.model = ApplicationTreeModel(self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
         self.tree.setColumnWidth(0, 200)
         self.tree.setColumnWidth(1, 200)
         self.tree.setAlternatingRowColors(True)
-        self.tree.itemClicked.connect(self.handle_tree_click)
+        self.tree.setUniformRowHeights(True)  # Lets the view lay out rows without asking each one's size
+        self.tree.clicked.connect(self.handle_tree_click)
+        self.model.rowsInserted.connect(self.filter_inserted_rows)
         active_layout.addWidget(self.tree)
         self.tabs.addTab(active_tab, 'Active Applications')
 
         # Rejected Applications tab
         rejected_tab = QWidget()
         rejected_layout = QVBoxLayout(rejected_tab)
-        self.rejected_tree = QTreeWidget()
-        self.rejected_tree.setHeaderLabels(['Company/Position', 'Website', 'Application Date', 'Interview Round', 'Last Contact', 'Status'])
+        self.rejected_model = ApplicationTreeModel(self)
+        self.rejected_tree = QTreeView()
+        self.rejected_tree.setModel(self.rejected_model)
         self.rejected_tree.setColumnWidth(0, 200)
         self.rejected_tree.setColumnWidth(1, 200)
         self.rejected_tree.setAlternatingRowColors(True)
-        self.rejected_tree.itemClicked.connect(self.handle_tree_click)
+        self.rejected_tree.setUniformRowHeights(True)  # Lets the view lay out rows without asking each one's size
+        self.rejected_tree.clicked.connect(self.handle_tree_click)
+        self.rejected_model.rowsInserted.connect(self.filter_inserted_rows)
         rejected_layout.addWidget(self.rejected_tree)
         self.tabs.addTab(rejected_tab, 'Rejected Applications')
 
@@ -197,12 +279,18 @@ class JobTrackerApp(QMainWindow):
         tree_controls.addWidget(sort_label)
         
         self.sort_combo = QComboBox()
-        self.sort_combo.addItems(['Date (Newest First)', 'Date (Oldest First)', 
-                                'Position (A-Z)', 'Position (Z-A)',
-                                'Status (A-Z)', 'Status (Z-A)',
-                                'Interview Round (High-Low)', 'Interview Round (Low-High)'])
-        self.sort_combo.currentIndexChanged.connect(self.sort_applications)
+        self.sort_combo.addItems(list(SORT_OPTIONS))
+        self.sort_combo.currentIndexChanged.connect(self.sort_all_applications)
         tree_controls.addWidget(self.sort_combo)
+
+        # Company order, by name or per-company aggregates
+        company_sort_label = QLabel('Companies:')
+        tree_controls.addWidget(company_sort_label)
+
+        self.company_sort_combo = QComboBox()
+        self.company_sort_combo.addItems(list(COMPANY_SORT_OPTIONS))
+        self.company_sort_combo.currentIndexChanged.connect(self.sort_all_companies)
+        tree_controls.addWidget(self.company_sort_combo)
         
         tree_controls.addStretch()  # Push controls to the left
         layout.addLayout(tree_controls)
@@ -228,78 +316,58 @@ class JobTrackerApp(QMainWindow):
         update_layout.addWidget(self.update_status_combo)
 
         # Update button
-        update_button = QPushButton('Update Status')
-        update_button.clicked.connect(self.update_application)
-        update_layout.addWidget(update_button)
+        self.update_button = QPushButton('Update Status')
+        self.update_button.clicked.connect(self.update_application)
+        update_layout.addWidget(self.update_button)
 
         layout.addLayout(update_layout)
 
-        # Load initial data
+        # Load initial data in the background; the window is shown right away
         self.load_applications()
 
     def update_company_suggestions(self, text):
         """
         Update the company autocomplete suggestions based on user input.
         Only show suggestions if the input is at least 3 characters.
+        The model is only touched when the shown ranking actually changes.
         """
         if len(text) < 3:
-            self.company_model.setStringList([])
+            if self.company_model_version is not None:
+                self.company_model.setStringList([])
+                self.company_model_version = None
         else:
-            companies = self.db.get_unique_companies()
-            # Sort companies by frequency of use (most used first)
-            company_counts = {}
-            for app in self.db.get_all_applications_grouped():
-                company_name = app[1]  # company_name is at index 1
-                if app[3] is not None:  # Only count if there's an application
-                    company_counts[company_name] = company_counts.get(company_name, 0) + 1
-            companies.sort(key=lambda x: (-company_counts.get(x, 0), x.lower()))
-            self.company_model.setStringList(companies)
+            self.update_company_completer()
 
     def update_position_suggestions(self, text):
         """
         Update the position autocomplete suggestions based on user input.
         Only show suggestions if the input is at least 3 characters.
+        The model is only touched when the shown ranking actually changes.
         """
         if len(text) < 3:
-            self.position_model.setStringList([])
+            if self.position_model_version is not None:
+                self.position_model.setStringList([])
+                self.position_model_version = None
         else:
-            positions = self.db.get_unique_positions()
-            # Sort positions by frequency of use (most used first)
-            position_counts = {}
-            for app in self.db.get_all_applications_grouped():
-                position = app[4]  # position is at index 4
-                if app[3] is not None:  # Only count if there's an application
-                    position_counts[position] = position_counts.get(position, 0) + 1
-            positions.sort(key=lambda x: (-position_counts.get(x, 0), x.lower()))
-            self.position_model.setStringList(positions)
+            self.update_position_completer()
 
     def update_company_completer(self):
         """
-        Refresh the company autocomplete model with sorted suggestions.
+        Refresh the company autocomplete model from the suggestion index
+        (most used first), if the index changed since the last refresh.
         """
-        companies = self.db.get_unique_companies()
-        # Sort companies by frequency of use (most used first)
-        company_counts = {}
-        for app in self.db.get_all_applications_grouped():
-            company_name = app[1]  # company_name is at index 1
-            if app[3] is not None:  # Only count if there's an application
-                company_counts[company_name] = company_counts.get(company_name, 0) + 1
-        companies.sort(key=lambda x: (-company_counts.get(x, 0), x.lower()))
-        self.company_model.setStringList(companies)
+        if self.company_model_version != self.company_index.version:
+            self.company_model.setStringList(self.company_index.ranked())
+            self.company_model_version = self.company_index.version
 
     def update_position_completer(self):
         """
-        Refresh the position autocomplete model with sorted suggestions.
+        Refresh the position autocomplete model from the suggestion index
+        (most used first), if the index changed since the last refresh.
         """
-        positions = self.db.get_unique_positions()
-        # Sort positions by frequency of use (most used first)
-        position_counts = {}
-        for app in self.db.get_all_applications_grouped():
-            position = app[4]  # position is at index 4
-            if app[3] is not None:  # Only count if there's an application
-                position_counts[position] = position_counts.get(position, 0) + 1
-        positions.sort(key=lambda x: (-position_counts.get(x, 0), x.lower()))
-        self.position_model.setStringList(positions)
+        if self.position_model_version != self.position_index.version:
+            self.position_model.setStringList(self.position_index.ranked())
+            self.position_model_version = self.position_index.version
 
     def validate_url(self, url):
         """
@@ -338,9 +406,11 @@ class JobTrackerApp(QMainWindow):
             return
 
         # Add to database
-        self.db.add_application(company, position, description, website)
+        application_id = self.db.add_application(company, position, description, website)
         
-        # Update completers with new values
+        # Update suggestion indexes and completers with new values
+        self.company_index.add(company)
+        self.position_index.add(position)
         self.update_company_completer()
         self.update_position_completer()
         
@@ -350,264 +420,383 @@ class JobTrackerApp(QMainWindow):
         self.website_input.clear()
         self.description_input.clear()
         
-        # Reload data
-        self.load_applications()
+        # Insert just the new row into the tree and adjust counters
+        row = self.db.get_application(application_id)
+        self.insert_application_row(row)
+        self.adjust_counters(None, row[8])
 
-    def get_company_description(self, company_name):
-        # Check cache first
-        cached_data = self.cache.get(company_name)
-        if cached_data:
-            return cached_data
+    def enrichment_service(self):
+        """
+        Get the company description lookup service, creating it on first use.
+        The enrichment module pulls in the HTTP client stack (requests, urllib3, ...),
+        so it is only imported once a lookup is actually needed, keeping startup fast.
+        Returns:
+            EnrichmentService: The service; descriptions are delivered by signal.
+        """
+        if self.enrichment is None:
+            from enrichment import EnrichmentService
+            self.enrichment = EnrichmentService(self.cache, parent=self)
+            self.enrichment.description_ready.connect(self.company_description_ready)
+            self.enrichment.lookup_failed.connect(self.company_lookup_failed)
+        return self.enrichment
+
+    def request_company_description(self):
+        """
+        Look up a description for the company in the form, if the description field is empty.
+        The lookup runs in the background; see company_description_ready.
+        """
+        company = self.company_input.text().strip()
+        if company and not self.description_input.text().strip():
+            self.enrichment_service().request(company)
 
-        try:
-            # Rate limiting
-            current_time = time.time()
-            time_since_last_call = current_time - self.last_api_call
-            if time_since_last_call < self.min_api_interval:
-                time.sleep(self.min_api_interval - time_since_last_call)
-            
-            # OpenCorporates API endpoint
-            url = f"https://api.opencorporates.com/v0.4/companies/search"
-            params = {
-                'q': company_name,
-                'api_token': 'YOUR_API_TOKEN'  # You'll need to sign up for a free API token
-            }
-            
-            response = requests.get(url, params=params)
-            self.last_api_call = time.time()
-
-            # Handle rate limiting response
-            if response.status_code == 429:  # Too Many Requests
-                retry_after = int(response.headers.get('Retry-After', 60))
-                QMessageBox.warning(
-                    self,
-                    'Rate Limit Reached',
-                    f'API rate limit reached. Please wait {retry_after} seconds before trying again.'
-                )
-                return f"Description for {company_name} (Rate limited)"
-            
-            # Handle other error responses
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data['results']['companies']:
-                company = data['results']['companies'][0]['company']
-                description = f"{company.get('name', '')} - "
-                description += f"Founded: {company.get('incorporation_date', 'Unknown')}, "
-                description += f"Status: {company.get('current_status', 'Unknown')}, "
-                description += f"Jurisdiction: {company.get('jurisdiction_code', 'Unknown')}"
-                
-                # Cache the result
-                self.cache.set(company_name, description)
-                return description
-            else:
-                return f"No detailed information found for {company_name}"
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching company data: {e}")
-            return f"Description for {company_name} (API error)"
+    def company_description_ready(self, company_name, description, status):
+        """
+        Fill in the description field with a looked-up description,
+        if the form still shows that company and the field is still empty.
+        Args:
+            company_name (str): Name of the company that was looked up.
+            description (str): The description found.
+            status (str): Cache status; STALE descriptions are being refreshed in the background.
+        """
+        if (self.company_input.text().strip() == company_name
+                and not self.description_input.text().strip()):
+            self.description_input.setText(description)
+
+    def company_lookup_failed(self, company_name, message, status):
+        """
+        Report a failed company lookup in the status bar.
+        Args:
+            company_name (str): Name of the company that was looked up.
+            message (str): The error message.
+            status (str): NEGATIVE if the failure was remembered from an earlier lookup.
+        """
+        if status == NEGATIVE:
+            message += ' (cached)'
+        self.statusBar().showMessage(f'Could not look up {company_name}: {message}', 10000)
+
+    def get_sort_order(self):
+        """
+        Get the field and direction of the selected sort option.
+        Returns:
+            tuple: (field, descending), see SORT_OPTIONS.
+        """
+        return SORT_OPTIONS[self.sort_combo.currentText()]
 
     def sort_applications(self, tree=None):
         """
         Sort the applications within each company based on the selected sort option.
         If tree is None, sorts the main (active) tree. Otherwise, sorts the given tree.
+        Expanded companies and the selection are preserved by the model.
         """
         if tree is None:
             tree = self.tree
-        sort_option = self.sort_combo.currentText()
-        expanded_companies = set()
-        for i in range(tree.topLevelItemCount()):
-            item = tree.topLevelItem(i)
-            if item.isExpanded():
-                expanded_companies.add(item.text(0))
-        for i in range(tree.topLevelItemCount()):
-            company_item = tree.topLevelItem(i)
-            applications = []
-            for j in range(company_item.childCount()):
-                app_item = company_item.child(j)
-                applications.append(app_item)
-                company_item.removeChild(app_item)
-            if sort_option == 'Date (Newest First)':
-                applications.sort(key=lambda x: x.text(2), reverse=True)
-            elif sort_option == 'Date (Oldest First)':
-                applications.sort(key=lambda x: x.text(2))
-            elif sort_option == 'Position (A-Z)':
-                applications.sort(key=lambda x: x.text(0))
-            elif sort_option == 'Position (Z-A)':
-                applications.sort(key=lambda x: x.text(0), reverse=True)
-            elif sort_option == 'Status (A-Z)':
-                applications.sort(key=lambda x: x.text(5))
-            elif sort_option == 'Status (Z-A)':
-                applications.sort(key=lambda x: x.text(5), reverse=True)
-            elif sort_option == 'Interview Round (High-Low)':
-                applications.sort(key=lambda x: int(x.text(3)), reverse=True)
-            elif sort_option == 'Interview Round (Low-High)':
-                applications.sort(key=lambda x: int(x.text(3)))
-            for app in applications:
-                company_item.addChild(app)
-        for i in range(tree.topLevelItemCount()):
-            item = tree.topLevelItem(i)
-            if item.text(0) in expanded_companies:
-                item.setExpanded(True)
+        tree.model().sort_applications(*self.get_sort_order())
 
-    def filter_applications(self):
+    def sort_all_applications(self):
         """
-        Filter the displayed applications based on search text and status filter.
-        Only shows companies and applications that match the criteria in the current tab.
+        Sort both the active and rejected trees by the selected sort option.
+        Keeping both trees sorted lets single rows be inserted in place.
+        """
+        self.sort_applications()
+        self.sort_applications(tree=self.rejected_tree)
+
+    def get_company_sort_order(self):
+        """
+        Get the field and direction of the selected company sort option.
+        Returns:
+            tuple: (field, descending), see COMPANY_SORT_OPTIONS.
+        """
+        return COMPANY_SORT_OPTIONS[self.company_sort_combo.currentText()]
+
+    def sort_all_companies(self):
+        """
+        Order the company rows of both trees by the selected company sort option.
+        """
+        field, descending = self.get_company_sort_order()
+        self.model.sort_companies(field, descending)
+        self.rejected_model.sort_companies(field, descending)
+
+    def refresh_company_stats(self, company_id):
+        """
+        Reload a company's aggregates after one of its applications changed, moving its rows
+        if the companies are ordered by an aggregate.
+        Args:
+            company_id (int): The ID of the company.
+        """
+        stats = self.db.get_company_stats(company_id)
+        self.model.update_company_stats(company_id, stats)
+        self.rejected_model.update_company_stats(company_id, stats)
+
+    def search_applications(self):
+        """
+        Filter the applications by the current search text (run once typing pauses).
+        """
+        self.filter_applications()
+
+    def create_date_filter(self):
+        """
+        Create a date filter field, initially set to 'Any'.
+        Returns:
+            QDateEdit: The field; changing it filters the applications.
+        """
+        date_edit = QDateEdit()
+        date_edit.setDisplayFormat('yyyy-MM-dd')
+        date_edit.setCalendarPopup(True)
+        date_edit.setMinimumDate(ANY_DATE)
+        date_edit.setSpecialValueText('Any')
+        date_edit.setDate(ANY_DATE)
+        date_edit.dateChanged.connect(self.filter_applications)
+        return date_edit
+
+    def filter_date(self, date_edit):
+        """
+        Get the date selected in a date filter field.
+        Returns:
+            date: The date, or None if the field is set to 'Any'.
+        """
+        value = date_edit.date()
+        return None if value == ANY_DATE else value.toPyDate()
+
+    def current_filter(self):
+        """
+        Build the filter selected by the search box, the status filter and the date range.
+        Returns:
+            ApplicationFilter: The filter.
         """
-        search_text = self.search_input.text().lower()
         status_filter = self.status_filter.currentText()
-        # Use the correct tree for the current tab
-        current_tree = self.tree if self.tabs.currentIndex() == 0 else self.rejected_tree
-        expanded_companies = set()
-        for i in range(current_tree.topLevelItemCount()):
-            item = current_tree.topLevelItem(i)
-            if item.isExpanded():
-                expanded_companies.add(item.text(0))
-        for i in range(current_tree.topLevelItemCount()):
-            company_item = current_tree.topLevelItem(i)
-            company_name = company_item.text(0).lower()
-            company_visible = False
-            if search_text in company_name:
-                company_visible = True
-            for j in range(company_item.childCount()):
-                app_item = company_item.child(j)
-                position = app_item.text(0).lower()
-                status = app_item.text(5)
-                app_visible = True
-                if search_text and search_text not in position:
-                    app_visible = False
-                if status_filter != 'All' and status != status_filter:
-                    app_visible = False
-                app_item.setHidden(not app_visible)
-                if app_visible:
-                    company_visible = True
-            company_item.setHidden(not company_visible)
-            if company_visible and company_item.text(0) in expanded_companies:
-                company_item.setExpanded(True)
+        date_from = self.filter_date(self.date_from_filter)
+        date_to = self.filter_date(self.date_to_filter)
+        return ApplicationFilter(statuses=None if status_filter == 'All' else [status_filter],
+                                 date_from=date_from and datetime.combine(date_from, time.min),
+                                 date_to=date_to and datetime.combine(date_to, time.max),
+                                 text=self.search_input.text())
+
+    def filter_applications(self):
+        """
+        Evaluate the current filter on the column store and apply the resulting visibility
+        bitmap to both trees. Only companies with an application whose visibility changed
+        since the last call are touched (see changed_groups).
+        """
+        visibility = self.filter_engine.evaluate(self.current_filter())
+        changed = changed_groups(self.columns, self.visibility, visibility)
+        self.visibility = visibility
+        active_nodes = self.model.company_nodes
+        rejected_nodes = self.rejected_model.company_nodes
+        for node in changed:
+            # Skip nodes whose company row has been removed since their applications were added
+            if active_nodes.get(node.company_id) is node:
+                self.filter_company(self.tree, node)
+            elif rejected_nodes.get(node.company_id) is node:
+                self.filter_company(self.rejected_tree, node)
+
+    def filter_company(self, tree, node):
+        """
+        Show or hide a single company row and its applications according to the visibility
+        bitmap. A company is shown if any of its applications is, whether fetched or not.
+        The company row is only shown or hidden when that changes, as every call makes the
+        view lay out its rows again.
+        Args:
+            tree (QTreeView): The view showing the company.
+            node (CompanyNode): The company to filter.
+        Returns:
+            bool: True if the company row is visible.
+        """
+        visibility = self.visibility
+        if node.fetched:
+            company_index = tree.model().company_index(node)
+            positions = self.columns.positions
+            for row, record in enumerate(node.applications):
+                # Applications not in the column store yet are shown until they are added
+                position = positions.get(record.id)
+                tree.setRowHidden(row, company_index, position is not None and not visibility[position])
+        company_visible = 1 in self.columns.group_bitmap(visibility, node)
+        if company_visible == (node in self.hidden_companies):
+            tree.setRowHidden(node.row, QModelIndex(), not company_visible)
+            if company_visible:
+                self.hidden_companies.discard(node)
+            else:
+                self.hidden_companies.add(node)
+        return company_visible
+
+    def filter_inserted_rows(self, parent, first, last):
+        """
+        Apply the current filter to rows that were just added to a model, e.g. when a
+        company node is expanded and its children are fetched, or companies are loaded.
+        New company rows are handled by filter_applications, as their applications are
+        new positions in the column store.
+        """
+        self.filter_applications()
+        if parent.isValid() and not self.current_filter().is_empty():
+            tree = self.tree if self.sender() is self.model else self.rejected_tree
+            node = tree.model().node(parent)
+            if node is not None:
+                self.filter_company(tree, node)
 
     def clear_filters(self):
         """
         Clear all search and filter fields and show all applications.
         """
         self.search_input.clear()
+        self.search_timer.stop()
         self.status_filter.setCurrentText('All')
+        self.date_from_filter.setDate(ANY_DATE)
+        self.date_to_filter.setDate(ANY_DATE)
         self.filter_applications()
 
-    def handle_tree_click(self, item, column):
+    def handle_tree_click(self, index):
         """
-        Handle clicks on the tree widget. Opens the company website if the website column is clicked.
+        Handle clicks on the tree view. Opens the company website if the website column is clicked.
         Args:
-            item (QTreeWidgetItem): The clicked item.
-            column (int): The column index that was clicked.
+            index (QModelIndex): The clicked model index.
         """
         # If the website column is clicked and it has a valid URL, open it
-        if column == 1:
-            url = item.text(1)
+        if index.column() == 1:
+            url = index.data()
             if url and urlparse(url).scheme in ('http', 'https'):
                 QDesktopServices.openUrl(QUrl(url))
 
     def get_status_color(self, status):
-        colors = {
-            'Applied': '#4a90e2',    # Blue
-            'Interview': '#f5a623',  # Orange
-            'Rejected': '#d0021b',   # Red
-            'Accepted': '#7ed321'    # Green
-        }
-        return colors.get(status, '#000000')  # Default to black if status not found
+        return STATUS_COLORS.get(status, '#000000')  # Default to black if status not found
 
     def load_applications(self):
         """
-        Load all applications from the database and display them in the appropriate tree views.
-        Updates the company combo box and application counters.
+        Clear the views and load all applications on a background thread.
+        Counters and suggestions arrive first, then the trees and company combo box are
+        filled chunk by chunk, so the window stays responsive however large the database is.
+        Adding and updating applications is disabled until loading finishes (see task_finished).
         """
-        self.tree.clear()
-        self.rejected_tree.clear()
         self.company_combo.clear()
-
-        # Get all applications grouped by company
-        applications = self.db.get_all_applications_grouped()
-
-        # Dictionaries to store company items for each tree
-        company_items = {}
-        rejected_company_items = {}
-
-        # Counters
-        total_apps = 0
-        interview_count = 0
-        rejected_count = 0
-
-        for app in applications:
-            company_id = app[0]
-            company_name = app[1]
-            company_description = app[2]
-            application_id = app[3]
-            if application_id is None:
-                continue
-            position = app[4]
-            application_date = app[5]
-            interview_round = app[6]
-            last_contact = app[7]
-            status = app[8]
-
-            # Count for stats
-            total_apps += 1
-            if status == 'Interview':
-                interview_count += 1
-            if status == 'Rejected':
-                rejected_count += 1
-
-            # Choose which tree to display in
-            if status == 'Rejected':
-                # Rejected tab
-                if company_id not in rejected_company_items:
-                    company_info = self.db.get_company_info(company_id)
-                    website = ''
-                    if company_info:
-                        _, _, website = company_info
-                    company_item = QTreeWidgetItem(self.rejected_tree)
-                    company_item.setText(0, company_name)
-                    company_item.setText(1, website or '')
-                    rejected_company_items[company_id] = company_item
-                app_item = QTreeWidgetItem(rejected_company_items[company_id])
-                app_item.setText(0, position)
-                app_item.setText(1, '')
-                app_item.setText(2, application_date)
-                app_item.setText(3, str(interview_round))
-                app_item.setText(4, str(last_contact or ''))
-                app_item.setText(5, status)
-                app_item.setData(0, Qt.ItemDataRole.UserRole, application_id)
-            else:
-                # Active tab
-                if company_id not in company_items:
-                    company_info = self.db.get_company_info(company_id)
-                    website = ''
-                    if company_info:
-                        _, _, website = company_info
-                    company_item = QTreeWidgetItem(self.tree)
-                    company_item.setText(0, company_name)
-                    company_item.setText(1, website or '')
-                    company_items[company_id] = company_item
-                    self.company_combo.addItem(f"{company_name}", company_id)
-                app_item = QTreeWidgetItem(company_items[company_id])
-                app_item.setText(0, position)
-                app_item.setText(1, '')
-                app_item.setText(2, application_date)
-                app_item.setText(3, str(interview_round))
-                app_item.setText(4, str(last_contact or ''))
-                app_item.setText(5, status)
-                app_item.setData(0, Qt.ItemDataRole.UserRole, application_id)
-
-        # Apply initial sort (newest first) for both trees
+        self.columns.clear()
+        self.visibility = b''
+        self.hidden_companies.clear()
+        self.model.set_companies([])
+        self.rejected_model.set_companies([])
+        # Initial sort (newest first), which SQLite applies to the loaded rows
         self.sort_combo.setCurrentText('Date (Newest First)')
-        self.sort_applications()
-        self.sort_applications(tree=self.rejected_tree)
+        self.counter_label.setText('Loading applications...')
+        self.interview_counter_label.setText('')
+        self.rejected_counter_label.setText('')
+        self.add_button.setEnabled(False)
+        self.update_button.setEnabled(False)
+
+        worker = LoadWorker(self.db, self.get_sort_order(), self.get_company_sort_order(), parent=self)
+        worker.aggregates_loaded.connect(self.applications_aggregates_loaded)
+        worker.chunk_loaded.connect(self.applications_chunk_loaded)
+        self.start_task(worker, 'Loading', self.load_finished)
+
+    def applications_aggregates_loaded(self, aggregates):
+        """
+        Show the counters and build the suggestion indexes from the loader's aggregate counts.
+        Args:
+            aggregates (dict): status_counts, company_counts and position_counts.
+        """
+        self.build_suggestion_indexes(aggregates['company_counts'], aggregates['position_counts'])
+        self.update_company_completer()
+        self.update_position_completer()
+        self.status_counts = aggregates['status_counts']
+        self.show_counters()
+
+    def applications_chunk_loaded(self, active_nodes, rejected_nodes, sort_order, company_sort_order):
+        """
+        Append a chunk of loaded companies to the trees. The models re-sort only if a sort
+        option was changed while loading.
+        Args:
+            active_nodes (list): CompanyNode for the active tree.
+            rejected_nodes (list): CompanyNode for the rejected tree.
+            sort_order (tuple): (field, descending) the chunk's applications are sorted by.
+            company_sort_order (tuple): (field, descending) the chunk's companies are sorted by.
+        """
+        for node in active_nodes:
+            self.company_combo.addItem(node.name, node.company_id)
+        # Applications enter the column store right before their rows enter a model, so the
+        # filter applied when the rows are inserted (filter_inserted_rows) can find them
+        for model, nodes in ((self.model, active_nodes), (self.rejected_model, rejected_nodes)):
+            for node in nodes:
+                self.columns.add(node.applications, node)
+            model.append_companies(nodes, sort_order, company_sort_order)
+
+    def load_finished(self, company_count):
+        """
+        Report that loading has finished.
+        Args:
+            company_count (int): Number of companies loaded.
+        """
+        # The company combo box lists companies by name, whatever order they were loaded in
+        self.company_combo.model().sort(0)
+        self.statusBar().showMessage(f'Loaded {company_count} companies', 5000)
+
+    def insert_application_row(self, row):
+        """
+        Insert a single application into the appropriate tree without reloading.
+        The company row is created if needed and placed, like the application,
+        according to the selected sort options.
+        Args:
+            row (tuple): Application row as returned by Database.get_application.
+        Returns:
+            ApplicationRecord: The inserted application.
+        """
+        (company_id, company_name, website, application_id, position,
+         application_date, interview_round, last_contact, status) = row
+        record = ApplicationRecord(application_id, company_id, position, application_date,
+                                   interview_round, last_contact, status)
+        rejected = status == 'Rejected'
+        tree = self.rejected_tree if rejected else self.tree
+        model = tree.model()
+
+        new_company = model.company_node(company_id) is None
+        node = model.insert_application(company_id, company_name, website, record)
+        self.columns.add([record], node)
+        if new_company and not rejected:
+            names = [self.company_combo.itemText(i) for i in range(self.company_combo.count())]
+            self.company_combo.insertItem(bisect_right(names, company_name), f"{company_name}", company_id)
+        self.refresh_company_stats(company_id)
+        self.filter_applications()
+        # The company row may have been created hidden, or hidden before this application
+        self.filter_company(tree, node)
+        return record
+
+    def take_application_row(self, application_id):
+        """
+        Remove a single application from whichever tree shows it.
+        Removes the company row as well if it has no applications left.
+        Args:
+            application_id (int): The ID of the application.
+        Returns:
+            ApplicationRecord: The removed application, or None if it was not shown.
+        """
+        for tree in (self.tree, self.rejected_tree):
+            record, company_removed = tree.model().remove_application(application_id)
+            if record is not None:
+                self.columns.remove(application_id)
+                if company_removed:
+                    if tree is self.tree:
+                        self.company_combo.removeItem(self.company_combo.findData(record.company_id))
+                else:
+                    # The company may have lost its only visible application
+                    self.filter_applications()
+                    self.filter_company(tree, tree.model().company_node(record.company_id))
+                return record
+        return None
+
+    def adjust_counters(self, old_status, new_status):
+        """
+        Adjust the counters by delta for a single added or changed application.
+        Args:
+            old_status (str): Previous status, or None for a new application.
+            new_status (str): New status.
+        """
+        if old_status is not None:
+            self.status_counts[old_status] = self.status_counts.get(old_status, 0) - 1
+        self.status_counts[new_status] = self.status_counts.get(new_status, 0) + 1
+        self.show_counters()
 
-        # Update counters
-        self.counter_label.setText(f'Total Applications: {total_apps}')
-        self.interview_counter_label.setText(f'Interviews: {interview_count}')
-        self.rejected_counter_label.setText(f'Rejections: {rejected_count}')
+    def show_counters(self):
+        """
+        Display the current status counts in the counter labels.
+        """
+        self.counter_label.setText(f'Total Applications: {sum(self.status_counts.values())}')
+        self.interview_counter_label.setText(f"Interviews: {self.status_counts.get('Interview', 0)}")
+        self.rejected_counter_label.setText(f"Rejections: {self.status_counts.get('Rejected', 0)}")
 
     def update_application(self):
         """
@@ -618,34 +807,193 @@ class JobTrackerApp(QMainWindow):
             QMessageBox.warning(self, 'Error', 'Please select a company')
             return
 
-        # Get the selected application ID from the tree
-        selected_items = self.tree.selectedItems()
-        if not selected_items:
+        # Get the selected application from the tree
+        selected_indexes = self.tree.selectionModel().selectedIndexes()
+        if not selected_indexes:
             QMessageBox.warning(self, 'Error', 'Please select an application to update')
             return
             
-        selected_item = selected_items[0]
+        selected_record = self.model.record(selected_indexes[0])
         # Only allow updating individual applications, not company groups
-        if selected_item.parent() is None:
+        if selected_record is None:
             QMessageBox.warning(self, 'Error', 'Please select a specific application to update')
             return
             
-        application_id = selected_item.data(0, Qt.ItemDataRole.UserRole)
+        application_id = selected_record.id
         round_number = int(self.round_combo.currentText())
         status = self.update_status_combo.currentText()
         
-        self.db.update_interview_round(application_id, round_number)
-        self.db.update_application_status(application_id, status)
+        old_status = selected_record.status
+        self.db.update_application(application_id, round_number, status)
+
+        # Move just this row (possibly into the other tree) and adjust counters
+        self.take_application_row(application_id)
+        self.insert_application_row(self.db.get_application(application_id))
+        index = self.model.application_index(application_id)
+        if index.isValid():
+            self.tree.setCurrentIndex(index)
+        self.adjust_counters(old_status, status)
+
+    def import_applications(self):
+        """
+        Ask for a CSV, JSON Lines or JSON file and import it on a background thread.
+        Progress is shown in the status bar; the views are reloaded when the import ends,
+        whether it completes or fails.
+        """
+        path, _ = QFileDialog.getOpenFileName(
+            self, 'Import Applications', '',
+            'Application files (*.csv *.jsonl *.ndjson *.json);;All files (*)')
+        if not path:
+            return
+        worker = ImportWorker(self.db, path, parent=self)
+        # Chunks written before a failure stay committed, so show them as well
+        worker.failed.connect(lambda message: self.reload_all())
+        self.start_task(worker, 'Import', self.import_finished)
+
+    def import_finished(self, result):
+        """
+        Reload all views after a successful import.
+        Args:
+            result (ImportProgress): Final statistics of the import.
+        """
+        message = f'Import complete: {result}'
+        if result.skipped_lines:
+            message += '; skipped lines: ' + ', '.join(str(line) for line, _ in result.skipped_lines)
+        self.statusBar().showMessage(message, 10000)
+        self.reload_all()
+
+    def export_applications(self):
+        """
+        Ask for an output file and export applications on a background thread.
+        The status filter and the date range are applied to the export when they are set.
+        """
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, 'Export Applications', '',
+            'CSV (*.csv);;JSON Lines (*.jsonl);;Columnar (*.jtc)')
+        if not path:
+            return
+        formats = {'CSV (*.csv)': 'csv', 'JSON Lines (*.jsonl)': 'jsonl', 'Columnar (*.jtc)': 'columnar'}
+        status_filter = self.status_filter.currentText()
+        statuses = None if status_filter == 'All' else [status_filter]
+        date_from = self.filter_date(self.date_from_filter)
+        date_to = self.filter_date(self.date_to_filter)
+        worker = ExportWorker(self.db, path, format=formats.get(selected_filter), statuses=statuses,
+                              date_from=date_from and date_from.isoformat(),
+                              date_to=date_to and date_to.isoformat(), parent=self)
+        self.start_task(worker, 'Export', lambda count: self.statusBar().showMessage(
+            f'Exported {count} applications to {path}', 10000))
+
+    def enrich_companies(self):
+        """
+        Look up descriptions for all companies that have none in the background.
+        """
+        worker = EnrichWorker(self.db, self.enrichment_service().client, self.cache, parent=self)
+        self.start_task(worker, 'Enrichment', self.enrich_finished)
+        self.stop_enrich_action.setEnabled(True)
+
+    def stop_enrichment(self):
+        """
+        Cancel a running batch enrichment after the lookup in progress.
+        """
+        if isinstance(self.task_worker, EnrichWorker):
+            self.task_worker.cancel()
+            self.stop_enrich_action.setEnabled(False)
+            self.statusBar().showMessage('Stopping enrichment...')
+
+    def enrich_finished(self, results):
+        """
+        Report the result of a batch enrichment.
+        The trees do not show descriptions, so they are kept as they are; only an active
+        search can match the new descriptions (the search index follows them through
+        triggers), so it is run again.
+        Args:
+            results (dict): Mapping of company name to description.
+        """
+        message = f'Stored descriptions for {len(results)} companies'
+        if self.task_worker is not None and self.task_worker.is_cancelled():
+            message = f'Enrichment stopped. {message}'
+        self.statusBar().showMessage(message, 10000)
+        if results and self.search_input.text().strip():
+            self.filter_engine.clear_cache()
+            self.filter_applications()
+
+    def show_diagnostics(self):
+        """
+        Show the diagnostics panel with cache and API metrics.
+        """
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(DEFAULT_METRICS, parent=self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
+    def start_task(self, worker, name, on_completed):
+        """
+        Start a background task (loading, import, export or enrichment), showing its progress
+        in the status bar. Import, export and enrichment are disabled until the task finishes.
+        Args:
+            worker (DatabaseTask): The task to run.
+            name (str): Name of the operation (e.g. 'Import') used in messages.
+            on_completed (callable): Called with the task result when it succeeds.
+        """
+        self.import_action.setEnabled(False)
+        self.export_action.setEnabled(False)
+        self.enrich_action.setEnabled(False)
+        self.statusBar().showMessage(f'{name} started...')
+        self.task_worker = worker
+        worker.progress.connect(lambda progress: self.statusBar().showMessage(f'{name}: {progress}'))
+        worker.completed.connect(on_completed)
+        worker.failed.connect(lambda message: QMessageBox.warning(self, f'{name} Failed', message))
+        worker.finished.connect(lambda: self.task_finished(worker))
+        worker.start()
+
+    def task_finished(self, worker):
+        """
+        Re-enable the actions disabled for a background task once its thread has finished.
+        Ignored if another task has been started meanwhile, e.g. the reload after an import.
+        Args:
+            worker (DatabaseTask): The task that finished.
+        """
+        if worker is not self.task_worker:
+            return
+        self.import_action.setEnabled(True)
+        self.export_action.setEnabled(True)
+        self.enrich_action.setEnabled(True)
+        self.stop_enrich_action.setEnabled(False)
+        self.add_button.setEnabled(True)
+        self.update_button.setEnabled(True)
+        self.task_worker = None
+
+    def reload_all(self):
+        """
+        Reload the suggestion indexes, completers, trees and counters from the database.
+        Used after bulk changes made outside the UI, such as an import.
+        """
+        # The change may come from another process, which the query cache cannot see
+        self.db.clear_query_cache()
         self.load_applications()
 
     def closeEvent(self, event):
         """
-        Handle the window close event. Clears expired cache entries.
+        Handle the window close event. Cancels a running batch enrichment and waits for a
+        running background task to end, clears expired cache entries and writes pending
+        cache entries to disk.
         Args:
             event (QCloseEvent): The close event.
         """
+        # The focused Company field emits editingFinished while the window closes;
+        # no new lookups may start once the cache is being shut down
+        self.company_input.blockSignals(True)
+        if self.task_worker is not None:
+            # A batch enrichment stops after the lookup in progress; other tasks run to the end
+            self.task_worker.cancel()
+            self.task_worker.wait()
+        if self.enrichment is not None:
+            self.enrichment.shutdown()
         # Clear expired cache entries when closing the application
         self.cache.clear_expired()
+        # Final write-behind flush
+        self.cache.close()
+        self.db.close()
         super().closeEvent(event)
 
 def main():
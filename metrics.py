@@ -0,0 +1,167 @@
+import bisect
+import json
+import threading
+import time
+
+# Upper bounds (milliseconds) of the latency histogram buckets; larger values go in an overflow bucket
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of observed values, with count, sum, min and max.
+    Not thread-safe on its own; Metrics serialises access.
+    """
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        """
+        Args:
+            bounds (tuple): Sorted upper bounds of the buckets.
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        """
+        Estimate a percentile from the buckets.
+        Args:
+            fraction (float): Percentile as a fraction, e.g. 0.95.
+        Returns:
+            float: The upper bound of the bucket holding the percentile (the maximum
+                for the overflow bucket), or None if nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'buckets': {**{f'<={bound}': count for bound, count in zip(self.bounds, self.counts)},
+                        f'>{self.bounds[-1]}': self.counts[-1]},
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of named counters and histograms.
+    Counters and histograms are created on first use, so instrumented code just
+    calls increment() or observe() with a dotted name such as 'cache.hit'.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}
+
+    def increment(self, name, amount=1):
+        """
+        Add to a counter.
+        Args:
+            name (str): Counter name.
+            amount (int): Amount to add.
+        """
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        """
+        Record a value in a histogram.
+        Args:
+            name (str): Histogram name.
+            value (float): The value, e.g. a latency in milliseconds.
+        """
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def timer(self, name):
+        """
+        Time a block of code into a histogram, in milliseconds:
+
+            with metrics.timer('api.latency_ms'):
+                ...
+        """
+        return _Timer(self, name)
+
+    def counter(self, name):
+        """
+        Get the current value of a counter (0 if never incremented).
+        """
+        with self.lock:
+            return self.counters.get(name, 0)
+
+    def snapshot(self):
+        """
+        Get a copy of all metrics.
+        Returns:
+            dict: {'started', 'uptime', 'counters': {name: value}, 'histograms': {name: summary}}.
+        """
+        with self.lock:
+            return {
+                'started': self.started,
+                'uptime': time.time() - self.started,
+                'counters': dict(sorted(self.counters.items())),
+                'histograms': {name: histogram.to_dict()
+                               for name, histogram in sorted(self.histograms.items())},
+            }
+
+    def dump(self, path):
+        """
+        Write a snapshot of all metrics to a JSON file.
+        Args:
+            path (str): Path of the output file.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def reset(self):
+        """
+        Clear all counters and histograms.
+        """
+        with self.lock:
+            self.started = time.time()
+            self.counters.clear()
+            self.histograms.clear()
+
+
+class _Timer:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+# Shared registry used by the cache and API client unless another one is passed in
+DEFAULT_METRICS = Metrics()
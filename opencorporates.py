@@ -0,0 +1,401 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import FRESH, NEGATIVE
+from metrics import DEFAULT_METRICS
+
+# OpenCorporates API base URL; point it at a local stub server for testing
+OPENCORPORATES_URL = os.environ.get('OPENCORPORATES_URL', 'https://api.opencorporates.com/v0.4')
+
+# Sign up at opencorporates.com for a free API token
+OPENCORPORATES_API_TOKEN = os.environ.get('OPENCORPORATES_API_TOKEN')
+
+# Default request rate (requests per second) and burst size
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 1
+
+# HTTP statuses that are retried with backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# HTTP statuses that end a batch, since every other lookup would fail the same way
+AUTH_FAILURE_STATUSES = {401, 403}
+
+# Fraction of a token treated as rounding error by TokenBucket
+TOKEN_TOLERANCE = 1e-9
+
+
+class RateLimitedError(Exception):
+    """
+    Raised when the API keeps answering 429 Too Many Requests after all retries.
+    """
+    def __init__(self, retry_after):
+        super().__init__(f'API rate limit reached, retry after {retry_after:.0f} seconds')
+        self.retry_after = retry_after
+
+
+class UnexpectedResponseError(Exception):
+    """
+    Raised when a successful API response is not JSON of the expected shape.
+    """
+
+
+class LookupCancelled(Exception):
+    """
+    Raised when a wait is cut short because the batch it belongs to was cancelled.
+    """
+
+
+def wait(sleep, seconds, stop_event=None):
+    """
+    Wait for a number of seconds, or until stop_event is set.
+    Args:
+        sleep (callable): Function used to wait when there is no stop event.
+        seconds (float): Time to wait.
+        stop_event (threading.Event, optional): Event that cancels the wait.
+    Raises:
+        LookupCancelled: If stop_event is set before or during the wait.
+    """
+    if stop_event is None:
+        sleep(seconds)
+    elif stop_event.wait(seconds):
+        raise LookupCancelled()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Tokens are added at `rate` per second up to `capacity`; each request takes one.
+    """
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST, clock=time.monotonic, sleep=time.sleep,
+                 metrics=None):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens (burst size).
+            clock (callable): Monotonic clock, in seconds.
+            sleep (callable): Function used to wait.
+            metrics (Metrics, optional): Registry for time spent waiting for tokens.
+        """
+        self.metrics = metrics or DEFAULT_METRICS
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """
+        Take a token if one is available right now.
+        Returns:
+            float: 0 if a token was taken, otherwise the number of seconds to wait before retrying.
+        """
+        with self.lock:
+            now = self.clock()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self._refill(now)
+            # Allow for rounding: after waiting the computed time the bucket may hold 0.999...
+            # tokens, and the remaining wait would be too short for the clock to register
+            if self.tokens >= 1 - TOKEN_TOLERANCE:
+                self.tokens = max(0.0, self.tokens - 1)
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, stop_event=None):
+        """
+        Take a token, blocking until one is available.
+        Args:
+            stop_event (threading.Event, optional): Event that cancels the wait.
+        Raises:
+            LookupCancelled: If stop_event is set while waiting.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                break
+            wait(self.sleep, delay, stop_event)
+            waited += delay
+        if waited:
+            self.metrics.increment('api.throttled')
+            self.metrics.observe('api.throttle_wait_ms', waited * 1000)
+
+    def pause(self, seconds):
+        """
+        Hand out no tokens for the given number of seconds, e.g. after a 429 with Retry-After.
+        """
+        with self.lock:
+            now = self.clock()
+            self.paused_until = max(self.paused_until, now + seconds)
+            # Do not let tokens accumulate while paused
+            self.tokens = 0.0
+            self.updated = self.paused_until
+
+
+def parse_retry_after(value, default=60.0):
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+    Args:
+        value (str): The header value (may be None).
+        default (float): Value used when the header is missing or invalid.
+    Returns:
+        float: Seconds to wait.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def format_description(company):
+    """
+    Build a one-line description from an OpenCorporates company record.
+    Args:
+        company (dict): The 'company' object of a search result.
+    Returns:
+        str: The description.
+    """
+    description = f"{company.get('name', '')} - "
+    description += f"Founded: {company.get('incorporation_date', 'Unknown')}, "
+    description += f"Status: {company.get('current_status', 'Unknown')}, "
+    description += f"Jurisdiction: {company.get('jurisdiction_code', 'Unknown')}"
+    return description
+
+
+class OpenCorporatesClient:
+    """
+    OpenCorporates API client with a persistent keep-alive session, a token-bucket
+    rate limiter shared by all threads using the client, and automatic retries:
+    429 responses are rescheduled after Retry-After, and server/network errors are
+    retried with jittered exponential backoff.
+    """
+    def __init__(self, base_url=OPENCORPORATES_URL, api_token=OPENCORPORATES_API_TOKEN,
+                 rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_retries=4, backoff_base=1.0,
+                 backoff_max=60.0, timeout=10, pool_size=4, sleep=time.sleep, metrics=None):
+        """
+        Args:
+            base_url (str): Base URL of the API (or a local stub).
+            api_token (str, optional): OpenCorporates API token.
+            rate (float): Maximum requests per second.
+            burst (int): Maximum number of requests sent back to back.
+            max_retries (int): Retries per request before giving up.
+            backoff_base (float): First backoff delay in seconds; doubles on every retry.
+            backoff_max (float): Upper bound for a single backoff delay.
+            timeout (float): Request timeout in seconds.
+            pool_size (int): Number of keep-alive connections kept open.
+            sleep (callable): Function used to wait.
+            metrics (Metrics, optional): Registry for request, retry and latency metrics.
+        """
+        self.metrics = metrics or DEFAULT_METRICS
+        self.base_url = base_url
+        self.api_token = api_token
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.sleep = sleep
+        self.bucket = TokenBucket(rate, burst, sleep=sleep, metrics=self.metrics)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def backoff_delay(self, attempt):
+        """
+        Get the jittered exponential backoff delay for a retry.
+        Args:
+            attempt (int): Number of the retry (0 for the first retry).
+        Returns:
+            float: Seconds to wait ("full jitter": uniform between 0 and the exponential bound).
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, path, params, stop_event=None):
+        """
+        Send a rate-limited GET request, retrying on 429, 5xx and network errors.
+        Args:
+            path (str): Path relative to base_url.
+            params (dict): Query parameters (the API token is added automatically).
+            stop_event (threading.Event, optional): Event that cancels waits between attempts.
+        Returns:
+            requests.Response: The successful response.
+        Raises:
+            RateLimitedError: If the API still answers 429 after all retries.
+            LookupCancelled: If stop_event is set while waiting.
+            requests.exceptions.RequestException: On other errors after all retries.
+        """
+        params = dict(params)
+        if self.api_token:
+            params['api_token'] = self.api_token
+        url = f'{self.base_url}/{path}'
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if attempt:
+                self.metrics.increment('api.retries')
+            self.bucket.acquire(stop_event)
+            self.metrics.increment('api.requests')
+            try:
+                with self.metrics.timer('api.latency_ms'):
+                    response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.metrics.increment('api.network_errors')
+                if last_attempt:
+                    self.metrics.increment('api.failures')
+                    raise
+                wait(self.sleep, self.backoff_delay(attempt), stop_event)
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                if not response.ok:
+                    self.metrics.increment('api.failures')
+                response.raise_for_status()
+                return response
+            if response.status_code == 429:
+                self.metrics.increment('api.rate_limited')
+                # Reschedule after Retry-After (plus jitter) and hold back every other caller too
+                retry_after = parse_retry_after(response.headers.get('Retry-After'),
+                                                default=self.backoff_delay(attempt))
+                if last_attempt:
+                    self.metrics.increment('api.failures')
+                    raise RateLimitedError(retry_after)
+                self.bucket.pause(retry_after + random.uniform(0, self.backoff_base))
+                continue
+            self.metrics.increment('api.server_errors')
+            if last_attempt:
+                self.metrics.increment('api.failures')
+                response.raise_for_status()
+            wait(self.sleep, self.backoff_delay(attempt), stop_event)
+
+    def search_company(self, company_name, stop_event=None):
+        """
+        Look up a company and build a one-line description of the best match.
+        Args:
+            company_name (str): Name of the company to search for.
+            stop_event (threading.Event, optional): Event that cancels waits for the rate limiter and retries.
+        Returns:
+            str: The description, or None if no company was found.
+        Raises:
+            UnexpectedResponseError: If the response is not a search result.
+            LookupCancelled: If stop_event is set while waiting.
+        """
+        response = self.get('companies/search', {'q': company_name}, stop_event)
+        try:
+            companies = response.json()['results']['companies']
+            if not companies:
+                return None
+            return format_description(companies[0]['company'])
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            self.metrics.increment('api.invalid_responses')
+            raise UnexpectedResponseError(f'Unexpected response for {company_name}: {e!r}') from e
+
+    def enrich_companies(self, company_names, callback=None, stop_event=None):
+        """
+        Look up many companies one after another, as fast as the rate limiter allows.
+        A failed lookup (including an unexpected response) is reported and the batch goes on,
+        except for authentication failures, which every other lookup would repeat.
+        Args:
+            company_names (iterable): Names of the companies to look up.
+            callback (callable, optional): Called with (company_name, description, error)
+                after each lookup; description is None if not found or failed.
+            stop_event (threading.Event, optional): Event that cancels the batch. It is checked
+                between companies and interrupts waits; a request already sent is finished.
+        Returns:
+            dict: Mapping of company name to description for the companies that were found
+                before the batch ended.
+        Raises:
+            requests.exceptions.HTTPError: If the API rejects the request as unauthorized.
+        """
+        results = {}
+        for company_name in company_names:
+            if stop_event is not None and stop_event.is_set():
+                break
+            try:
+                description = self.search_company(company_name, stop_event)
+            except LookupCancelled:
+                break
+            except (RateLimitedError, UnexpectedResponseError, requests.exceptions.RequestException) as e:
+                if callback:
+                    callback(company_name, None, e)
+                response = getattr(e, 'response', None)
+                if response is not None and response.status_code in AUTH_FAILURE_STATUSES:
+                    raise
+                continue
+            if description is not None:
+                results[company_name] = description
+            if callback:
+                callback(company_name, description, None)
+        return results
+
+    def close(self):
+        """
+        Close the keep-alive connections.
+        """
+        self.session.close()
+
+
+def enrich_database(db, client, cache=None, progress_callback=None, stop_event=None):
+    """
+    Look up descriptions for every company in the database that has none and store them.
+    With a cache, fresh cached descriptions are used without a request, companies with a
+    cached "not found" are skipped, and new results (found or not) are cached.
+    Args:
+        db (Database): Database to enrich.
+        client (OpenCorporatesClient): Client used for the lookups.
+        cache (CompanyCache, optional): Cache of earlier lookups.
+        progress_callback (callable, optional): Called after each company with
+            (done, total, company_name, error); error is None unless the lookup failed.
+        stop_event (threading.Event, optional): Event that cancels the lookups still to do;
+            descriptions already found stay stored.
+    Returns:
+        dict: Mapping of company name to the description stored.
+    """
+    results = {}
+    to_fetch = []
+    for company_name in db.get_companies_missing_description():
+        data, status = cache.lookup(company_name) if cache else (None, None)
+        if status == FRESH:
+            results[company_name] = data
+            db.set_company_description(company_name, data)
+        elif status != NEGATIVE:
+            to_fetch.append(company_name)
+    total = len(to_fetch)
+    done = 0
+
+    def store(company_name, description, error):
+        nonlocal done
+        done += 1
+        if description is not None:
+            results[company_name] = description
+            db.set_company_description(company_name, description)
+            if cache:
+                cache.set(company_name, description)
+        elif error is None and cache:
+            cache.set_negative(company_name, f'No detailed information found for {company_name}')
+        if progress_callback:
+            progress_callback(done, total, company_name, error)
+
+    client.enrich_companies(to_fetch, callback=store, stop_event=stop_event)
+    return results
+
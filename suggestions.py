@@ -0,0 +1,83 @@
+from bisect import bisect_left, insort
+
+
+class SuggestionIndex:
+    """
+    In-memory index of suggestion names ranked by usage count.
+    Names are ordered by descending count, then alphabetically (case-insensitive).
+    The ranking is maintained incrementally so lookups never touch the database.
+    """
+    def __init__(self, counts=None):
+        """
+        Initialize the index.
+        Args:
+            counts (dict, optional): Mapping of name (str) to usage count (int).
+        """
+        self.counts = {}
+        self._keys = []
+        self._names = None
+        self.version = 0
+        if counts:
+            self.rebuild(counts)
+
+    @staticmethod
+    def _rank_key(name, count):
+        return (-count, name.lower(), name)
+
+    def rebuild(self, counts):
+        """
+        Replace the whole index with the given counts.
+        Args:
+            counts (dict): Mapping of name (str) to usage count (int).
+        """
+        self.counts = dict(counts)
+        self._keys = sorted(self._rank_key(name, count) for name, count in self.counts.items())
+        self._names = None
+        self.version += 1
+
+    def add(self, name, count=1):
+        """
+        Record usage of a name, inserting it if it is new.
+        Args:
+            name (str): The name that was used.
+            count (int): How much to increase its usage count by.
+        Returns:
+            bool: True if the ranking changed, False otherwise.
+        """
+        old_count = self.counts.get(name)
+        new_count = (old_count or 0) + count
+        if old_count is not None:
+            if new_count == old_count:
+                return False
+            old_key = self._rank_key(name, old_count)
+            position = bisect_left(self._keys, old_key)
+            del self._keys[position]
+            new_key = self._rank_key(name, new_count)
+            self.counts[name] = new_count
+            if bisect_left(self._keys, new_key) == position:
+                # Same slot as before, so the visible ordering is unchanged
+                self._keys.insert(position, new_key)
+                return False
+            insort(self._keys, new_key)
+        else:
+            self.counts[name] = new_count
+            insort(self._keys, self._rank_key(name, new_count))
+        self._names = None
+        self.version += 1
+        return True
+
+    def ranked(self):
+        """
+        Get all names ordered by usage (most used first).
+        Returns:
+            list: List of names (str).
+        """
+        if self._names is None:
+            self._names = [key[2] for key in self._keys]
+        return self._names
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, name):
+        return name in self.counts
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+
+# The app is a set of top-level modules, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from database import Database
+from metrics import Metrics
+from opencorporates import OpenCorporatesClient, TokenBucket
+from stub_server import FakeClock, StubServer
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def metrics():
+    return Metrics()
+
+
+@pytest.fixture
+def db(tmp_path, metrics):
+    database = Database(str(tmp_path / 'job_tracker.db'), metrics=metrics)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_client(stub, clock, metrics):
+    clients = []
+
+    def make(**kwargs):
+        options = dict(base_url=stub.url, api_token='secret', rate=1000, burst=100, max_retries=2,
+                       backoff_base=1.0, sleep=clock.sleep, metrics=metrics)
+        options.update(kwargs)
+        client = OpenCorporatesClient(**options)
+        # Let rate limiting pauses pass in fake time too
+        client.bucket = TokenBucket(options['rate'], options['burst'], clock=clock, sleep=clock.sleep,
+                                    metrics=metrics)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
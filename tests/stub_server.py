@@ -0,0 +1,70 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def search_result(name):
+    return {'results': {'companies': [{'company': {'name': name, 'incorporation_date': '2001-02-03',
+                                                   'current_status': 'Active',
+                                                   'jurisdiction_code': 'us_de'}}]}}
+
+
+class FakeClock:
+    """
+    Clock whose sleep advances time instantly and records each wait.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class StubServer:
+    """
+    Local HTTP server that answers each request with the next scripted response:
+    (status, headers, body); a dict body is sent as JSON. When the script runs out,
+    companies are found under the name searched for, unless listed in unknown.
+    """
+    def __init__(self):
+        self.responses = []
+        self.unknown = set()
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                stub.requests.append((urlparse(self.path).path, query))
+                if stub.responses:
+                    status, headers, body = stub.responses.pop(0)
+                elif query['q'][0] in stub.unknown:
+                    status, headers, body = 200, {}, {'results': {'companies': []}}
+                else:
+                    status, headers, body = 200, {}, search_result(query['q'][0])
+                data = json.dumps(body).encode() if isinstance(body, (dict, list)) else body.encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/v0.4'
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05},
+                                       daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
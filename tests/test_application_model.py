@@ -0,0 +1,142 @@
+from datetime import datetime
+
+import pytest
+from PyQt6.QtCore import QModelIndex, QPersistentModelIndex
+from PyQt6.QtTest import QAbstractItemModelTester
+
+from application_model import ApplicationRecord, ApplicationTreeModel, CompanyNode, parse_date
+
+
+def record(id, company_id, position='Engineer', date='2024-01-01 09:00:00', round=0, status='Applied'):
+    return ApplicationRecord(id, company_id, position, date, round, None, status)
+
+
+def company_names(model):
+    return [node.name for node in model.companies]
+
+
+def positions(node):
+    return [application.position for application in node.applications]
+
+
+def make_model():
+    model = ApplicationTreeModel()
+    model.set_companies([
+        CompanyNode(1, 'Acme', 'acme.example', [record(1, 1, 'Engineer', '2024-03-01 09:00:00'),
+                                                record(2, 1, 'Analyst', '2024-01-01 09:00:00')],
+                    stats=(2, 0, '2024-03-01 09:00:00')),
+        CompanyNode(3, 'Gamma', None, [record(3, 3, 'Designer', '2024-02-01 09:00:00', 10)],
+                    stats=(1, 10, '2024-02-01 09:00:00')),
+    ])
+    return model
+
+
+@pytest.fixture
+def model(qapp):
+    model = make_model()
+    # Checks every change against the QAbstractItemModel contract; it fetches all rows
+    model.tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+    return model
+
+
+def test_insert_application_keeps_company_and_application_order(model):
+    node = model.insert_application(2, 'Beta', None, record(4, 2))
+    assert company_names(model) == ['Acme', 'Beta', 'Gamma']
+    assert [company.row for company in model.companies] == [0, 1, 2]
+    assert model.company_node(2) is node
+
+    acme = model.company_node(1)
+    model.fetchMore(model.company_index(acme))
+    model.insert_application(1, 'Acme', None, record(5, 1, 'Manager', '2024-02-01 09:00:00'))
+    # Newest first, the default order
+    assert positions(acme) == ['Engineer', 'Manager', 'Analyst']
+    assert model.rowCount(model.company_index(acme)) == 3
+    assert model.application_index(5).row() == 1
+
+
+def test_remove_application_drops_empty_companies(model):
+    assert model.remove_application(99) == (None, False)
+    removed, company_removed = model.remove_application(2)
+    assert removed.id == 2 and not company_removed
+    removed, company_removed = model.remove_application(1)
+    assert company_removed
+    assert company_names(model) == ['Gamma']
+    assert model.company_node(1) is None
+    assert model.companies[0].row == 0
+
+
+def test_applications_are_exposed_lazily(qapp):
+    model = make_model()
+    acme_index = model.index(0, 0)
+    assert model.hasChildren(acme_index)
+    assert model.rowCount(acme_index) == 0
+    assert model.application_index(1) == QModelIndex()
+    assert model.canFetchMore(acme_index)
+
+    model.fetchMore(acme_index)
+    assert not model.canFetchMore(acme_index)
+    assert model.rowCount(acme_index) == 2
+    child = model.index(1, 5, acme_index)
+    assert model.data(child) == 'Applied'
+    assert model.record(child).id == 2
+    assert model.parent(child) == acme_index
+    assert model.data(model.index(0, 1)) == 'acme.example'
+    assert model.index(2, 0, acme_index) == QModelIndex()
+
+
+def test_sort_applications_keeps_persistent_indexes(model):
+    acme_index = model.index(0, 0)
+    model.fetchMore(acme_index)
+    model.insert_application(1, 'Acme', None, record(6, 1, 'Tester', '2024-02-01 09:00:00', 9))
+    model.insert_application(1, 'Acme', None, record(7, 1, 'Director', '2024-02-02 09:00:00', 10))
+    selected = QPersistentModelIndex(model.application_index(2))
+
+    model.sort_applications('interview_round', True)
+    acme = model.company_node(1)
+    # Rounds compare as numbers, not text
+    assert positions(acme) == ['Director', 'Tester', 'Analyst', 'Engineer']
+    assert selected.row() == 2
+    assert model.record(QModelIndex(selected)).id == 2
+
+    model.sort_applications('position', False)
+    assert positions(acme) == ['Analyst', 'Director', 'Engineer', 'Tester']
+    assert selected.row() == 0
+    # New rows follow the model's order
+    model.insert_application(1, 'Acme', None, record(8, 1, 'Bookkeeper'))
+    assert positions(acme)[1] == 'Bookkeeper'
+
+
+def test_parse_date():
+    assert parse_date('2024-01-15') == datetime(2024, 1, 15)
+    assert parse_date('2024-01-15 09:30:00') == datetime(2024, 1, 15, 9, 30)
+    assert parse_date(None) == datetime.min
+    assert parse_date('not a date') == datetime.min
+    # Dates with an offset become naive local times, so they compare with the rest
+    assert parse_date('2024-01-15T09:30:00+00:00').tzinfo is None
+    assert parse_date('0001-01-01T00:00:00+14:00') == datetime.min
+
+
+def test_sort_companies_by_aggregates(model):
+    model.insert_application(2, 'Beta', None, record(4, 2))
+    model.company_node(2).set_stats((1, 3, '2024-04-01 09:00:00'))
+    gamma_index = QPersistentModelIndex(model.index(2, 0))
+
+    model.sort_companies('last_activity', True)
+    assert company_names(model) == ['Beta', 'Acme', 'Gamma']
+    model.sort_companies('max_interview_round', True)
+    assert company_names(model) == ['Gamma', 'Beta', 'Acme']
+    assert gamma_index.row() == 0
+    model.sort_companies('application_count', True)
+    assert company_names(model) == ['Acme', 'Gamma', 'Beta']
+    assert [node.row for node in model.companies] == [0, 1, 2]
+
+
+def test_update_company_stats_moves_the_row(model):
+    model.sort_companies('application_count', True)
+    model.update_company_stats(3, (5, 10, '2024-02-01 09:00:00'))
+    assert company_names(model) == ['Gamma', 'Acme']
+    model.update_company_stats(3, (1, 10, '2024-02-01 09:00:00'))
+    assert company_names(model) == ['Acme', 'Gamma']
+    # New companies are placed by the current order too
+    model.insert_application(2, 'Beta', None, record(4, 2))
+    assert company_names(model) == ['Acme', 'Gamma', 'Beta']
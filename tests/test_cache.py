@@ -0,0 +1,113 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from cache import FRESH, MISS, NEGATIVE, STALE, CompanyCache
+
+
+@pytest.fixture
+def make_cache(tmp_path, metrics):
+    caches = []
+
+    def make(**kwargs):
+        cache = CompanyCache(cache_file=str(tmp_path / 'company_cache.db'), json_file=None,
+                             metrics=metrics, **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_entries_persist_and_expired_ones_are_cleared(make_cache):
+    cache = make_cache(stale_ttl=0)
+    cache.set('Acme', 'Rocket skates')
+    cache.set('Beta', 'Expired', ttl=-1)
+    cache.set_negative('Gamma', 'Not found', ttl=-1)
+    assert cache.clear_expired() == 2
+    cache.close()
+
+    reopened = make_cache()
+    assert reopened.lookup('Acme') == ('Rocket skates', FRESH)
+    assert reopened.lookup('Beta') == (None, MISS)
+
+
+def test_memory_front_is_bounded(make_cache, metrics):
+    cache = make_cache(max_memory_entries=2)
+    for name in ('Acme', 'Beta', 'Gamma'):
+        cache.set(name, f'{name} description')
+    assert list(cache.memory) == ['Beta', 'Gamma']
+    assert metrics.counter('cache.evictions') == 1
+    # Evicted entries are still read from the file
+    assert cache.get('Acme') == 'Acme description'
+
+
+def test_migrates_legacy_json_cache(tmp_path, metrics):
+    json_file = str(tmp_path / 'company_cache.json')
+    with open(json_file, 'w') as f:
+        json.dump({
+            'Acme': {'data': 'Rocket skates', 'timestamp': datetime.now().isoformat()},
+            'Beta': {'data': 'Old description', 'timestamp': (datetime.now() - timedelta(days=33)).isoformat()},
+            'Broken': {'data': 'No timestamp'},
+        }, f)
+    cache = CompanyCache(cache_file=str(tmp_path / 'company_cache.db'), json_file=json_file, metrics=metrics)
+    try:
+        assert not os.path.exists(json_file)
+        assert cache.lookup('Acme') == ('Rocket skates', FRESH)
+        # Entries keep their age, so old ones come back stale
+        assert cache.lookup('Beta') == ('Old description', STALE)
+        assert cache.lookup('Broken') == (None, MISS)
+
+        # Entries already in the SQLite cache win over the JSON file
+        with open(json_file, 'w') as f:
+            json.dump({'Acme': {'data': 'Older', 'timestamp': datetime.now().isoformat()}}, f)
+        assert cache.migrate_json(json_file) == 1
+        assert cache.get('Acme') == 'Rocket skates'
+    finally:
+        cache.close()
+
+
+def test_write_behind_flushes_on_close(make_cache, metrics):
+    cache = make_cache(write_behind=True, flush_interval=3600)
+    cache.set('Acme', 'Rocket skates')
+    assert cache.dirty
+    cache.close()
+    assert make_cache().get('Acme') == 'Rocket skates'
+
+
+def test_fresh_stale_and_expired_entries(make_cache):
+    cache = make_cache(stale_ttl=60)
+    cache.set('Acme', 'Rocket skates')
+    cache.set('Beta', 'Old description', ttl=-1)
+    cache.set('Gamma', 'Ancient description', ttl=-120)
+    assert cache.lookup('Acme') == ('Rocket skates', FRESH)
+    assert cache.lookup('Beta') == ('Old description', STALE)
+    assert cache.get('Beta') is None
+    assert cache.lookup('Gamma') == (None, MISS)
+    assert cache.lookup('Delta') == (None, MISS)
+
+
+def test_negative_entries(make_cache, metrics):
+    cache = make_cache()
+    cache.set('Acme', 'Rocket skates')
+    cache.set_negative('Acme', 'No detailed information found for Acme')
+    assert cache.lookup('Acme') == ('No detailed information found for Acme', NEGATIVE)
+    assert cache.get('Acme') is None
+    # Expired negative entries are never served as stale
+    cache.set_negative('Beta', 'Lookup failed', ttl=-1)
+    assert cache.lookup('Beta') == (None, MISS)
+    assert metrics.counter('cache.negative') == 2  # lookup and get
+
+
+def test_closed_cache_ignores_calls(make_cache, metrics):
+    cache = make_cache(write_behind=True)
+    cache.set('Acme', 'Rocket skates')
+    cache.close()
+    assert cache.lookup('Acme') == (None, MISS)
+    cache.set('Beta', 'Too late')
+    cache.set_negative('Gamma', 'Too late')
+    assert metrics.counter('cache.writes_after_close') == 2
+    assert make_cache().get('Acme') == 'Rocket skates'
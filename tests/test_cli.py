@@ -0,0 +1,31 @@
+import pytest
+
+import cli
+
+
+def test_export_dates_are_validated(capsys):
+    parser = cli.build_parser()
+    args = parser.parse_args(['export', 'out.csv', '--from', '2024-01-01', '--to', '2024-06-30'])
+    assert (args.date_from, args.date_to) == ('2024-01-01', '2024-06-30')
+    for value in ('2024-13-45', '06/30/2024'):
+        with pytest.raises(SystemExit):
+            parser.parse_args(['export', 'out.csv', '--to', value])
+        assert 'expected YYYY-MM-DD' in capsys.readouterr().err
+
+
+def test_import_encoding_is_validated(capsys):
+    parser = cli.build_parser()
+    assert parser.parse_args(['import', 'jobs.csv']).encoding == 'utf-8-sig'
+    assert parser.parse_args(['import', 'jobs.csv', '--encoding', 'cp1252']).encoding == 'cp1252'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['import', 'jobs.csv', '--encoding', 'klingon'])
+    assert 'unknown encoding' in capsys.readouterr().err
+
+
+def test_export_statuses_are_validated(capsys):
+    parser = cli.build_parser()
+    args = parser.parse_args(['export', 'out.csv', '--status', 'rejected', '--status', 'Interview'])
+    assert args.status == ['Rejected', 'Interview']
+    with pytest.raises(SystemExit):
+        parser.parse_args(['export', 'out.csv', '--status', 'Bogus'])
+    assert 'expected one of Applied, Interview, Rejected, Accepted' in capsys.readouterr().err
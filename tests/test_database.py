@@ -0,0 +1,147 @@
+import sqlite3
+
+import pytest
+
+from database import SCHEMA_VERSION, Database
+
+
+def application_names(db):
+    return sorted(row[0] for row in db.conn.execute(
+        'SELECT c.name FROM applications a JOIN companies c ON c.id = a.company_id'))
+
+
+def test_keyset_pages_cover_all_rows_in_order(db):
+    rows = [('Acme', f'Role {i}', None, None, '2024-01-01 09:00:00') for i in range(5)]
+    rows += [('Beta', 'Engineer', None, None, f'2024-01-0{day} 09:00:00') for day in (3, 1, 2)]
+    db.add_applications_many(rows)
+
+    pages = list(db.iter_application_pages(page_size=3))
+    assert [len(page) for page in pages] == [3, 3, 2]
+    keys = [Database.page_key(row) for page in pages for row in page]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 8
+
+
+def test_migrates_pre_versioning_database(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE companies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            description TEXT,
+            website_url TEXT
+        );
+        CREATE TABLE applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL,
+            position TEXT NOT NULL,
+            application_date TIMESTAMP NOT NULL,
+            interview_round INTEGER DEFAULT 0,
+            last_contact_date TIMESTAMP,
+            status TEXT DEFAULT 'Applied'
+        );
+        INSERT INTO companies (name, description) VALUES ('Acme', 'Rocket skates');
+        INSERT INTO applications (company_id, position, application_date, interview_round, last_contact_date)
+        VALUES (1, 'Software Engineer', '2024-01-10 09:00:00', 2, '2024-02-01 10:00:00');
+        INSERT INTO applications (company_id, position, application_date)
+        VALUES (1, 'Analyst', '2024-03-05 09:00:00');
+    ''')
+    conn.close()
+
+    db = Database(path)
+    try:
+        assert db.get_schema_version() == SCHEMA_VERSION
+        # Existing rows are indexed for search and counted in the company aggregates
+        assert db.search_applications('rocket') is not None
+        assert len(db.search_applications('rocket')) == 2
+        assert db.get_company_stats(1) == (2, 2, '2024-03-05 09:00:00')
+    finally:
+        db.close()
+
+
+def test_refuses_newer_schema(tmp_path):
+    path = str(tmp_path / 'newer.db')
+    conn = sqlite3.connect(path)
+    conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION + 1}')
+    conn.close()
+    with pytest.raises(RuntimeError):
+        Database(path)
+
+
+def test_nested_transaction_failure_rolls_back_only_inner_writes(db):
+    with db.transaction():
+        db.add_application('Acme', 'Engineer')
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.add_application('Beta', 'Engineer')
+                raise RuntimeError
+        db.add_application('Gamma', 'Engineer')
+    assert application_names(db) == ['Acme', 'Gamma']
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.add_application('Delta', 'Engineer')
+            raise RuntimeError
+    assert application_names(db) == ['Acme', 'Gamma']
+    assert db.get_total_applications() == 2
+
+
+def test_search_index_follows_inserts_and_updates(db):
+    application_id = db.add_application('Acme', 'Software Engineer')
+    db.add_application('Beta', 'Data Analyst')
+    assert db.search_applications('soft eng') == [application_id]
+    assert db.search_applications('   ') is None
+
+    db.conn.execute('UPDATE applications SET position = ? WHERE id = ?', ('Product Manager', application_id))
+    db.conn.commit()
+    db.clear_query_cache()
+    assert db.search_applications('soft eng') == []
+    assert db.search_applications('product') == [application_id]
+
+    assert db.set_company_description('Acme', 'Makes rocket skates')
+    assert db.search_applications('rocket') == [application_id]
+
+
+def test_query_cache_invalidation(db, metrics):
+    application_id = db.add_application('Acme', 'Software Engineer')
+    assert db.get_status_counts() == {'Applied': 1}
+    assert db.get_status_counts() == {'Applied': 1}
+    assert metrics.counter('query_cache.status_counts.hits') == 1
+
+    db.search_applications('soft')
+    db.update_application_status(application_id, 'Interview')
+    # Status updates do not change the search index, so the search stays cached
+    db.search_applications('soft')
+    assert metrics.counter('query_cache.search.hits') == 1
+    assert db.get_status_counts() == {'Interview': 1}
+
+    db.add_application('Beta', 'Software Architect')
+    assert len(db.search_applications('soft')) == 2
+
+
+def test_companies_ordered_by_aggregates_use_indexes(db):
+    db.add_applications_many([
+        ('Acme', 'Engineer', None, None, '2024-01-10 09:00:00', 3),
+        ('Acme', 'Analyst', None, None, '2024-01-20 09:00:00', 1),
+        ('Beta', 'Designer', None, None, '2024-03-01 09:00:00', 1),
+        ('Gamma', 'Manager', None, None, '2024-02-01 09:00:00', 5),
+    ])
+    db.conn.execute("INSERT INTO companies (name) VALUES ('Delta')")
+    db.conn.commit()
+    assert all(uses_index for uses_index, _ in db.verify_query_plans().values())
+
+    def companies(**order):
+        return [(name, len(applications))
+                for _, name, _, _, applications, _ in db.iter_companies_with_applications(**order)]
+
+    # Companies without applications have no aggregates and sort like NULL: first ascending, last descending
+    assert companies(company_order_by='last_activity', company_descending=True) == [
+        ('Beta', 1), ('Gamma', 1), ('Acme', 2), ('Delta', 0)]
+    assert companies(company_order_by='max_interview_round', company_descending=False) == [
+        ('Delta', 0), ('Beta', 1), ('Acme', 2), ('Gamma', 1)]
+    assert companies(company_order_by='application_count', company_descending=True)[:2] == [
+        ('Acme', 2), ('Gamma', 1)]
+    acme = next(applications for _, name, _, _, applications, _ in db.iter_companies_with_applications(
+        company_order_by='application_count', company_descending=True) if name == 'Acme')
+    assert [application[1] for application in acme] == ['Analyst', 'Engineer']
@@ -0,0 +1,27 @@
+from PyQt6.QtCore import Qt
+
+from diagnostics import DiagnosticsDialog, cache_hit_rate, query_cache_hit_rate
+
+
+def test_hit_rates():
+    assert cache_hit_rate({}) is None
+    assert cache_hit_rate({'cache.fresh': 2, 'cache.stale': 1, 'cache.negative': 1, 'cache.miss': 4}) == 0.5
+    assert query_cache_hit_rate({'query_cache.search.hits': 3, 'query_cache.search.misses': 1,
+                                 'query_cache.status_counts.misses': 4}) == 0.375
+
+
+def test_refreshes_only_while_shown(qapp, metrics):
+    dialog = DiagnosticsDialog(metrics)
+    assert not dialog.refresh_timer.isActive()
+    metrics.increment('cache.fresh')
+    dialog.show()
+    assert dialog.refresh_timer.isActive()
+    counters = dialog.tree.findItems('Counters', Qt.MatchFlag.MatchExactly)[0]
+    assert counters.child(0).text(0) == 'cache.fresh'
+    dialog.close()
+    assert not dialog.refresh_timer.isActive()
+    dialog.show()
+    assert dialog.refresh_timer.isActive()
+    dialog.reject()
+    assert not dialog.refresh_timer.isActive()
+
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from cache import FRESH, NEGATIVE, STALE, CompanyCache
+from enrichment import EnrichmentService
+
+ACME = 'Acme - Founded: 2001-02-03, Status: Active, Jurisdiction: us_de'
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out waiting for the lookup'
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def service(qapp, make_client, tmp_path, metrics):
+    cache = CompanyCache(cache_file=str(tmp_path / 'company_cache.db'), json_file=None, metrics=metrics)
+    service = EnrichmentService(cache, make_client(max_retries=0))
+    service.ready = []
+    service.failed = []
+    service.description_ready.connect(lambda *args: service.ready.append(args))
+    service.lookup_failed.connect(lambda *args: service.failed.append(args))
+    yield service
+    service.shutdown()
+    cache.close()
+
+
+def test_lookup_is_delivered_and_cached(qapp, service, stub):
+    assert service.request('Acme')
+    # A second request while the first is in flight does not start another lookup
+    assert not service.request('Acme')
+    wait_until(qapp, lambda: service.ready)
+    assert service.ready == [('Acme', ACME, FRESH)]
+    assert not service.in_flight
+    assert len(stub.requests) == 1
+
+    # Fresh cache entries are delivered without a lookup
+    assert not service.request('Acme')
+    assert service.ready[-1] == ('Acme', ACME, FRESH)
+    assert len(stub.requests) == 1
+
+
+def test_stale_description_is_delivered_then_refreshed(qapp, service, stub):
+    service.cache.set('Acme', 'Old description', ttl=-1)
+    assert service.request('Acme')
+    assert service.ready == [('Acme', 'Old description', STALE)]
+    wait_until(qapp, lambda: len(service.ready) == 2)
+    assert service.ready[1] == ('Acme', ACME, FRESH)
+    assert service.cache.lookup('Acme') == (ACME, FRESH)
+
+
+def test_not_found_is_cached_as_negative(qapp, service, stub):
+    stub.unknown.add('Nobody')
+    assert service.request('Nobody')
+    wait_until(qapp, lambda: service.failed)
+    message = 'No detailed information found for Nobody'
+    assert service.failed == [('Nobody', message, '')]
+
+    assert not service.request('Nobody')
+    assert service.failed[-1] == ('Nobody', message, NEGATIVE)
+    assert len(stub.requests) == 1
+
+
+def test_failed_refresh_keeps_stale_description(qapp, service, stub):
+    service.cache.set('Acme', 'Old description', ttl=-1)
+    stub.responses.append((404, {}, 'missing'))
+    service.request('Acme')
+    wait_until(qapp, lambda: service.failed)
+    assert service.cache.lookup('Acme') == ('Old description', STALE)
+
+    # Without a stale description the error is cached for a short while
+    stub.responses.append((200, {}, {'unexpected': True}))
+    service.request('Beta')
+    wait_until(qapp, lambda: len(service.failed) == 2)
+    assert service.cache.lookup('Beta')[1] == NEGATIVE
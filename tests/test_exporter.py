@@ -0,0 +1,50 @@
+import csv
+import json
+
+import pytest
+
+import exporter
+
+
+@pytest.fixture
+def rows(db):
+    rows = [
+        ('Acme', 'Engineer', 'Rocket skates', 'https://acme.example', '2024-01-15 09:00:00', 2,
+         '2024-02-01 10:00:00', 'Interview'),
+        ('Acme', 'Analyst', 'Rocket skates', 'https://acme.example', '2024-03-01 09:00:00', 0, None, 'Applied'),
+        ('Börse', 'Développeur', None, None, '2024-02-10 09:00:00', 1, None, 'Rejected'),
+    ]
+    db.add_applications_many(rows)
+    return list(db.iter_applications())
+
+
+def test_columnar_round_trip(db, rows, tmp_path):
+    path = str(tmp_path / 'export.jtc')
+    progress = []
+    with open(path, 'wb') as f:
+        assert exporter.write_columnar(iter(rows), f, progress.append, row_group_size=2) == 3
+    assert progress == [2, 3]
+    assert list(exporter.iter_columnar(path)) == rows
+
+    # An empty export is still a valid file
+    with open(path, 'wb') as f:
+        assert exporter.write_columnar(iter([]), f) == 0
+    assert list(exporter.iter_columnar(path)) == []
+
+    with open(path, 'wb') as f:
+        f.write(b'not columnar')
+    with pytest.raises(ValueError):
+        list(exporter.iter_columnar(path))
+
+
+def test_export_file_filters(db, rows, tmp_path):
+    path = str(tmp_path / 'export.csv')
+    assert exporter.export_file(db, path, statuses=['Interview', 'Rejected'], date_to='2024-02-10') == 2
+    with open(path, newline='', encoding='utf-8') as f:
+        exported = list(csv.DictReader(f))
+    assert [row['position'] for row in exported] == ['Engineer', 'Développeur']
+
+    path = str(tmp_path / 'export.jsonl')
+    assert exporter.export_file(db, path, date_from='2024-02-01') == 2
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['company'] for line in f] == ['Acme', 'Börse']
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pytest
+
+from application_model import ApplicationRecord
+from filters import (ApplicationColumns, ApplicationFilter, FilterEngine, changed_groups,
+                     changed_positions, intersect)
+
+
+def record(id, company_id, status='Applied', round=0, date='2024-01-01 09:00:00'):
+    return ApplicationRecord(id, company_id, f'Position {id}', date, round, None, status)
+
+
+@pytest.fixture
+def columns():
+    columns = ApplicationColumns()
+    columns.add([record(1, 10, 'Applied', 0, '2024-01-05 09:00:00'),
+                 record(2, 10, 'Interview', 2, '2024-02-05 09:00:00')], group='acme')
+    columns.add([record(3, 20, 'Interview', 4, '2024-03-05 09:00:00'),
+                 record(4, 20, 'Rejected', 1, '2024-04-05 09:00:00')], group='beta')
+    return columns
+
+
+def visible_ids(columns, bitmap):
+    return [record.id for record, visible in zip(columns.records, bitmap) if visible]
+
+
+def test_filter_equality_and_emptiness():
+    assert ApplicationFilter().is_empty()
+    assert ApplicationFilter(text='   ').is_empty()
+    assert ApplicationFilter(statuses=['Applied', 'Interview']) == ApplicationFilter(statuses=('Interview', 'Applied'))
+    assert hash(ApplicationFilter(text='eng')) == hash(ApplicationFilter(text=' eng '))
+    assert not ApplicationFilter(min_round=0).is_empty()
+
+
+def test_predicates(columns):
+    engine = FilterEngine(columns)
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter())) == [1, 2, 3, 4]
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(statuses=['Interview']))) == [2, 3]
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(statuses=['Unknown']))) == []
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(min_round=1, max_round=2))) == [2, 4]
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(
+        date_from=datetime(2024, 2, 1), date_to=datetime(2024, 3, 31)))) == [2, 3]
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(company_ids=[20]))) == [3, 4]
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(statuses=['Interview'], company_ids=[20]))) == [3]
+
+
+def test_text_predicate_uses_search(columns):
+    searches = []
+
+    def search(text):
+        searches.append(text)
+        return [4, 2, 99] if text == 'eng' else None
+
+    engine = FilterEngine(columns, search)
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(text='eng'))) == [2, 4]
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(text='eng', statuses=['Rejected']))) == [4]
+    # No searchable words: the text predicate is ignored
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter(text='!!'))) == [1, 2, 3, 4]
+    assert searches == ['eng', '!!']
+
+
+def test_results_are_cached_per_generation(columns, metrics):
+    engine = FilterEngine(columns, metrics=metrics)
+    application_filter = ApplicationFilter(statuses=['Interview'])
+    first = engine.evaluate(application_filter)
+    assert engine.evaluate(application_filter) is first
+    assert metrics.counter('filter_cache.hits') == 1
+
+    columns.add([record(5, 30, 'Interview')], group='gamma')
+    assert visible_ids(columns, engine.evaluate(application_filter)) == [2, 3, 5]
+    assert metrics.counter('filter_cache.misses') == 2
+
+
+def test_removed_applications_are_never_visible(columns):
+    engine = FilterEngine(columns)
+    columns.remove(2)
+    columns.remove(2)
+    assert visible_ids(columns, engine.evaluate(ApplicationFilter())) == [1, 3, 4]
+    assert 2 not in columns.positions
+
+
+def test_intersect():
+    assert intersect([b'\x01\x01\x00', b'\x01\x00\x01'], 3) == b'\x01\x00\x00'
+
+
+def test_changed_positions_treats_new_rows_as_visible():
+    assert list(changed_positions(b'\x01\x00\x01', b'\x00\x00\x01')) == [0]
+    assert list(changed_positions(b'\x01', b'\x01\x00\x01')) == [1]
+    assert list(changed_positions(b'', b'')) == []
+
+
+def test_changed_groups(columns):
+    everything = bytes([1, 1, 1, 1])
+    assert changed_groups(columns, everything, everything) == set()
+    # Few changes are looked up row by row, many are compared group by group
+    assert changed_groups(columns, everything, bytes([1, 1, 1, 0])) == {'beta'}
+    assert changed_groups(columns, everything, bytes([0, 1, 0, 1])) == {'acme', 'beta'}
+
+    # A later application of a group lands in a second run of positions
+    columns.add([record(5, 30)], group='gamma')
+    columns.add([record(6, 10)], group='acme')
+    assert columns.group_runs['acme'] == [[0, 2], [5, 6]]
+    assert columns.group_bitmap(bytes([1, 0, 1, 1, 1, 0]), 'acme') == b'\x01\x00\x00'
+    assert changed_groups(columns, everything, bytes([1, 1, 1, 1, 1, 0])) == {'acme'}
+    assert changed_groups(columns, everything, bytes([1, 1, 1, 1, 1, 1])) == set()
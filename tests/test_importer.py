@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+import importer
+
+
+def test_detect_format():
+    assert importer.detect_format('jobs.CSV') == 'csv'
+    assert importer.detect_format('jobs.ndjson') == 'jsonl'
+    assert importer.detect_format('jobs.json') == 'json'
+    with pytest.raises(ValueError):
+        importer.detect_format('jobs.xlsx')
+
+
+def test_normalize_date():
+    assert importer.normalize_date('2024-01-15') == '2024-01-15 00:00:00'
+    assert importer.normalize_date('2024-01-15T09:30:00') == '2024-01-15 09:30:00'
+    assert importer.normalize_date('01/15/2024') == '2024-01-15 00:00:00'
+    # Dates with an offset are stored as naive local time
+    assert len(importer.normalize_date('2024-02-01T09:30:00+00:00')) == 19
+    for value in ('yesterday', '2024-13-45', 20240115):
+        with pytest.raises(ValueError):
+            importer.normalize_date(value)
+
+
+def test_import_csv_normalizes_values(db, tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_text('Company Name,Position,Date,Round,Status\n'
+                    'Acme,Engineer,01/15/2024,2,rejected\n'
+                    'Beta,Analyst,2024-02-01,,\n'
+                    ',Missing company,,,\n'
+                    'Gamma,Designer,2024-03-01,two,Applied\n'
+                    'Delta,Manager,2024-03-01,,Ghosted\n', encoding='utf-8')
+    result = importer.import_file(db, str(path))
+    assert (result.rows, result.skipped) == (2, 3)
+    assert [line for line, _ in result.skipped_lines] == [4, 5, 6]
+    rows = db.conn.execute('SELECT position, application_date, interview_round, status '
+                           'FROM applications ORDER BY id').fetchall()
+    assert rows == [('Engineer', '2024-01-15 00:00:00', 2, 'Rejected'),
+                    ('Analyst', '2024-02-01 00:00:00', 0, 'Applied')]
+
+
+def test_import_jsonl_skips_unreadable_lines(db, tmp_path):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('\n'.join([
+        json.dumps({'company': 'Acme', 'position': 'Engineer'}),
+        '[1, 2]',
+        '{not json',
+        '',
+        json.dumps({'company': 'Beta', 'position': 'Analyst', 'last_contact': '2024-02-03'}),
+    ]), encoding='utf-8')
+    progress = []
+    result = importer.import_file(db, str(path), chunk_size=1, progress_callback=progress.append)
+    assert (result.rows, result.skipped) == (2, 2)
+    assert result.skipped_lines == [(2, 'not an object'), (3, 'invalid JSON')]
+    assert progress and result.percent == 100.0
+    assert db.get_total_applications() == 2
+
+
+def test_import_json_array(db, tmp_path):
+    path = tmp_path / 'jobs.json'
+    path.write_text(json.dumps([{'company': 'Acme', 'position': 'Engineer'}, 'oops']), encoding='utf-8')
+    result = importer.import_file(db, str(path))
+    assert (result.rows, result.skipped_lines) == (1, [(2, 'not an object')])
+
+    path.write_text(json.dumps({'company': 'Acme'}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        importer.import_file(db, str(path))
+
+
+def test_undecodable_lines_are_skipped(db, tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_bytes('Company Name,Position\n'
+                     'Acme,Engineer\n'
+                     'Café Müller,Barista\n'
+                     'Beta,Analyst\n'.encode('cp1252'))
+    result = importer.import_file(db, str(path), chunk_size=1)
+    assert result.rows == 2
+    assert result.skipped_lines == [(3, 'cannot be decoded as utf-8-sig')]
+
+    result = importer.import_file(db, str(path), encoding='cp1252')
+    assert (result.rows, result.skipped) == (3, 0)
+    assert 'Café Müller' in db.get_unique_companies()
+
+    path = tmp_path / 'jobs.jsonl'
+    path.write_bytes(b'{"company": "Gamma", "position": "Designer"}\n{"company": "Caf\xe9", "position": "Cook"}\n')
+    result = importer.import_file(db, str(path))
+    assert (result.rows, result.skipped_lines) == (1, [(2, 'cannot be decoded as utf-8-sig')])
@@ -0,0 +1,145 @@
+import csv
+import sys
+import time
+
+import pytest
+from PyQt6.QtCore import QDate, QModelIndex
+from PyQt6.QtTest import QTest
+
+from database import Database
+from main import JobTrackerApp
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out waiting for the window'
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def window(qapp, tmp_path, monkeypatch):
+    # The company cache lives in the working directory
+    monkeypatch.chdir(tmp_path)
+    # Exceptions raised in slots are reported through sys.excepthook
+    errors = []
+    monkeypatch.setattr(sys, 'excepthook', lambda *exc_info: errors.append(exc_info[1]))
+    window = JobTrackerApp(str(tmp_path / 'job_tracker.db'))
+    window.errors = errors
+    window.show()
+    wait_until(qapp, lambda: window.task_worker is None)
+    yield window
+    window.close()
+
+
+def test_close_with_focused_company_field(qapp, window):
+    window.activateWindow()
+    window.company_input.setFocus()
+    QTest.keyClicks(window.company_input, 'Acme')
+    window.close()
+    qapp.processEvents()
+    assert window.errors == []
+    assert window.enrichment is None
+
+
+def test_close_cancels_batch_enrichment(qapp, window, make_client):
+    for name in ('Acme', 'Beta', 'Gamma'):
+        window.db.add_application(name, 'Engineer')
+    client = make_client(rate=0.001, burst=1)
+    window.enrichment_service().client = client
+    window.enrich_companies()
+    assert window.stop_enrich_action.isEnabled()
+    # The first lookup uses the only token; the next one would wait for about 1000 seconds
+    wait_until(qapp, lambda: window.db.get_companies_missing_description() != ['Acme', 'Beta', 'Gamma'])
+    started = time.monotonic()
+    window.close()
+    assert time.monotonic() - started < 5
+    assert window.errors == []
+
+
+def test_stop_enrichment_from_menu(qapp, window, make_client):
+    window.db.add_application('Acme', 'Engineer')
+    window.db.add_application('Beta', 'Engineer')
+    window.enrichment_service().client = make_client(rate=0.001, burst=1)
+    messages = []
+    window.statusBar().messageChanged.connect(messages.append)
+    window.enrich_companies()
+    worker = window.task_worker
+    wait_until(qapp, lambda: len(window.db.get_companies_missing_description()) == 1)
+    window.stop_enrich_action.trigger()
+    wait_until(qapp, lambda: window.task_worker is not worker)
+    assert worker.is_cancelled()
+    assert any(message.startswith('Enrichment stopped') for message in messages)
+    assert window.db.get_companies_missing_description() == ['Beta']
+
+
+def test_enrichment_keeps_trees_and_refreshes_search(qapp, tmp_path, monkeypatch, make_client):
+    monkeypatch.chdir(tmp_path)
+    db = Database(str(tmp_path / 'job_tracker.db'))
+    db.add_application('Acme', 'Engineer')
+    db.add_application('Beta', 'Analyst')
+    db.close()
+    window = JobTrackerApp(str(tmp_path / 'job_tracker.db'))
+    try:
+        wait_until(qapp, lambda: window.task_worker is None)
+        companies = list(window.model.companies)
+        acme = window.model.company_node(companies[0].company_id)
+        window.tree.expand(window.model.company_index(acme))
+        window.search_input.setText('jurisdiction')
+        window.search_applications()
+        assert window.tree.isRowHidden(acme.row, QModelIndex())
+
+        window.enrichment_service().client = make_client()
+        window.enrich_companies()
+        wait_until(qapp, lambda: window.task_worker is None)
+        # No reload: the same rows stay expanded, and the search now matches the descriptions
+        assert window.model.companies == companies
+        assert window.tree.isExpanded(window.model.company_index(acme))
+        assert not window.tree.isRowHidden(acme.row, QModelIndex())
+    finally:
+        window.close()
+
+
+def test_failed_import_shows_committed_rows(qapp, window, monkeypatch):
+    def import_file(db, path, **kwargs):
+        db.add_applications_many([('Acme', 'Engineer')])
+        raise OSError('disk went away')
+
+    warnings = []
+    monkeypatch.setattr('importer.import_file', import_file)
+    monkeypatch.setattr('main.QFileDialog.getOpenFileName', lambda *args: ('jobs.csv', ''))
+    monkeypatch.setattr('main.QMessageBox.warning', lambda parent, title, message: warnings.append(message))
+    window.import_applications()
+    wait_until(qapp, lambda: window.task_worker is None and window.model.companies)
+    assert warnings == ['disk went away']
+    assert [node.name for node in window.model.companies] == ['Acme']
+
+
+def test_date_range_filters_view_and_export(qapp, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = Database(str(tmp_path / 'job_tracker.db'))
+    db.add_applications_many([('Acme', 'Engineer', None, None, '2024-01-15 09:00:00'),
+                              ('Beta', 'Analyst', None, None, '2024-02-20 23:30:00'),
+                              ('Gamma', 'Designer', None, None, '2024-03-05 09:00:00')])
+    db.close()
+    window = JobTrackerApp(str(tmp_path / 'job_tracker.db'))
+    try:
+        wait_until(qapp, lambda: window.task_worker is None)
+        window.date_from_filter.setDate(QDate(2024, 2, 1))
+        window.date_to_filter.setDate(QDate(2024, 2, 20))
+        hidden = [node.name for node in window.model.companies if window.tree.isRowHidden(node.row, QModelIndex())]
+        assert hidden == ['Acme', 'Gamma']
+
+        path = str(tmp_path / 'export.csv')
+        monkeypatch.setattr('main.QFileDialog.getSaveFileName', lambda *args: (path, 'CSV (*.csv)'))
+        window.export_applications()
+        wait_until(qapp, lambda: window.task_worker is None)
+        with open(path, newline='', encoding='utf-8') as f:
+            assert [row['company'] for row in csv.DictReader(f)] == ['Beta']
+
+        window.clear_filters()
+        assert window.date_from_filter.text() == 'Any'
+        assert not any(window.tree.isRowHidden(node.row, QModelIndex()) for node in window.model.companies)
+    finally:
+        window.close()
@@ -0,0 +1,181 @@
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from cache import FRESH, NEGATIVE, CompanyCache
+from opencorporates import (LookupCancelled, RateLimitedError, TokenBucket, UnexpectedResponseError,
+                            enrich_database, parse_retry_after)
+from stub_server import search_result
+
+ACME = 'Acme - Founded: 2001-02-03, Status: Active, Jurisdiction: us_de'
+
+
+def test_token_bucket_limits_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+    clock.now += 10
+    # Tokens never accumulate beyond the capacity
+    waits = [bucket.try_acquire() for _ in range(3)]
+    assert waits[:2] == [0, 0] and waits[2] > 0
+
+
+def test_token_bucket_pause(clock):
+    bucket = TokenBucket(rate=1, capacity=5, clock=clock, sleep=clock.sleep)
+    bucket.pause(30)
+    assert bucket.try_acquire() == pytest.approx(30)
+    clock.now += 30
+    # No tokens were saved up during the pause
+    assert bucket.try_acquire() == pytest.approx(1)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('12') == 12
+    assert parse_retry_after(None, default=3) == 3
+    assert parse_retry_after('soon', default=3) == 3
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=90)
+    assert 80 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 90
+
+
+def test_search_company(stub, make_client):
+    client = make_client()
+    assert client.search_company('Acme') == ACME
+    path, query = stub.requests[0]
+    assert path == '/v0.4/companies/search'
+    assert query == {'q': ['Acme'], 'api_token': ['secret']}
+
+    stub.responses.append((200, {}, {'results': {'companies': []}}))
+    assert client.search_company('Nobody') is None
+
+
+def test_rate_limited_request_waits_for_retry_after(stub, make_client, clock, metrics):
+    client = make_client(backoff_base=0.0)
+    stub.responses.append((429, {'Retry-After': '7'}, {}))
+    assert client.search_company('Acme').startswith('Acme')
+    assert len(stub.requests) == 2
+    assert clock.sleeps[0] == pytest.approx(7)
+    assert sum(clock.sleeps) == pytest.approx(7, abs=0.01)
+    assert metrics.counter('api.rate_limited') == 1
+    assert metrics.counter('api.retries') == 1
+
+
+def test_rate_limit_error_after_all_retries(stub, make_client, metrics):
+    client = make_client(max_retries=1, backoff_base=0.0)
+    stub.responses.extend([(429, {'Retry-After': '1'}, {}), (429, {'Retry-After': '5'}, {})])
+    with pytest.raises(RateLimitedError) as error:
+        client.search_company('Acme')
+    assert error.value.retry_after == 5
+    assert metrics.counter('api.failures') == 1
+
+
+def test_server_errors_are_retried_with_backoff(stub, make_client, clock, metrics):
+    client = make_client(max_retries=2, backoff_base=1.0)
+    stub.responses.extend([(503, {}, 'busy'), (502, {}, 'busy')])
+    assert client.search_company('Acme').startswith('Acme')
+    assert len(clock.sleeps) == 2
+    # Full jitter: each delay is at most the doubling exponential bound
+    assert 0 <= clock.sleeps[0] <= 1 and 0 <= clock.sleeps[1] <= 2
+    assert metrics.counter('api.server_errors') == 2
+
+    stub.responses.extend([(500, {}, 'down')] * 3)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.search_company('Acme')
+
+
+def test_client_errors_are_not_retried(stub, make_client):
+    client = make_client()
+    stub.responses.append((404, {}, 'missing'))
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.search_company('Acme')
+    assert len(stub.requests) == 1
+
+
+def test_enrich_companies_continues_after_failures(stub, make_client, metrics):
+    client = make_client(max_retries=0)
+    stub.responses.extend([
+        (200, {}, search_result('Acme')),
+        (200, {}, {'unexpected': True}),
+        (200, {}, 'not json'),
+        (404, {}, 'missing'),
+        (200, {}, {'results': {'companies': []}}),
+        (200, {}, search_result('Delta')),
+    ])
+    outcomes = []
+    results = client.enrich_companies(['Acme', 'Beta', 'Gamma', 'Missing', 'Nobody', 'Delta'],
+                                      callback=lambda name, description, error: outcomes.append(
+                                          (name, description is not None, type(error).__name__ if error else None)))
+    assert sorted(results) == ['Acme', 'Delta']
+    assert outcomes == [('Acme', True, None),
+                        ('Beta', False, UnexpectedResponseError.__name__),
+                        ('Gamma', False, UnexpectedResponseError.__name__),
+                        ('Missing', False, 'HTTPError'),
+                        ('Nobody', False, None),
+                        ('Delta', True, None)]
+    assert metrics.counter('api.invalid_responses') == 2
+
+
+def test_enrich_database_uses_and_fills_cache(stub, make_client, db, tmp_path, metrics):
+    for name in ('Acme', 'Beta', 'Gamma', 'Delta'):
+        db.add_application(name, 'Engineer')
+    cache = CompanyCache(cache_file=str(tmp_path / 'company_cache.db'), json_file=None, metrics=metrics)
+    try:
+        cache.set('Acme', 'Cached description')
+        cache.set_negative('Beta', 'Not found earlier')
+        stub.unknown.add('Gamma')
+        progress = []
+        results = enrich_database(db, make_client(), cache,
+                                  progress_callback=lambda *args: progress.append(args))
+        assert results == {'Acme': 'Cached description',
+                           'Delta': 'Delta - Founded: 2001-02-03, Status: Active, Jurisdiction: us_de'}
+        # Only the companies without a usable cache entry were looked up
+        assert sorted(query['q'][0] for _, query in stub.requests) == ['Delta', 'Gamma']
+        assert [(done, total) for done, total, _, _ in progress] == [(1, 2), (2, 2)]
+        assert cache.lookup('Gamma')[1] == NEGATIVE
+        assert cache.lookup('Delta')[1] == FRESH
+        assert sorted(db.get_companies_missing_description()) == ['Beta', 'Gamma']
+    finally:
+        cache.close()
+
+
+def test_enrich_companies_can_be_cancelled(stub, make_client):
+    client = make_client()
+    stop_event = threading.Event()
+    outcomes = []
+
+    def callback(name, description, error):
+        outcomes.append(name)
+        stop_event.set()
+
+    assert client.enrich_companies(['Acme', 'Beta'], callback=callback, stop_event=stop_event) == {'Acme': ACME}
+    assert outcomes == ['Acme']
+    assert len(stub.requests) == 1
+
+
+def test_cancel_interrupts_waits(stub, make_client):
+    client = make_client()
+    client.bucket.pause(3600)
+    stop_event = threading.Event()
+    threading.Timer(0.05, stop_event.set).start()
+    started = time.monotonic()
+    with pytest.raises(LookupCancelled):
+        client.search_company('Acme', stop_event)
+    assert time.monotonic() - started < 5
+    assert client.enrich_companies(['Acme'], stop_event=stop_event) == {}
+    assert stub.requests == []
+
+
+def test_authentication_failure_ends_batch(stub, make_client):
+    client = make_client()
+    stub.responses.append((401, {}, 'invalid token'))
+    outcomes = []
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.enrich_companies(['Acme', 'Beta'], callback=lambda *args: outcomes.append(args[0]))
+    assert outcomes == ['Acme']
+    assert len(stub.requests) == 1
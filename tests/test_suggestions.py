@@ -0,0 +1,29 @@
+from suggestions import SuggestionIndex
+
+
+def test_ranked_by_count_then_name():
+    index = SuggestionIndex({'beta': 2, 'Alpha': 2, 'gamma': 5, 'delta': 1})
+    assert index.ranked() == ['gamma', 'Alpha', 'beta', 'delta']
+    assert len(index) == 4
+    assert 'beta' in index and 'omega' not in index
+
+
+def test_add_reports_ranking_changes():
+    index = SuggestionIndex({'a': 3, 'b': 1})
+    version = index.version
+    # Still below 'a', so the visible ordering does not change
+    assert not index.add('b')
+    assert index.version == version
+    assert index.add('b', 2)
+    assert index.ranked() == ['b', 'a']
+    assert index.add('c')
+    assert index.ranked() == ['b', 'a', 'c']
+    assert index.counts == {'a': 3, 'b': 4, 'c': 1}
+    assert index.version == version + 2
+
+
+def test_rebuild_replaces_counts():
+    index = SuggestionIndex({'a': 1})
+    index.rebuild({'x': 1, 'y': 2})
+    assert index.ranked() == ['y', 'x']
+    assert 'a' not in index
@@ -0,0 +1,164 @@
+import copy
+import threading
+from itertools import islice
+from PyQt6.QtCore import QThread, pyqtSignal
+from application_model import DEFAULT_COMPANY_SORT_ORDER, DEFAULT_SORT_ORDER, build_company_nodes
+import exporter
+import importer
+
+# Number of companies delivered to the views per chunk while loading
+LOAD_CHUNK_SIZE = 500
+
+
+class DatabaseTask(QThread):
+    """
+    Background thread running a long database operation so the UI stays responsive.
+    Shares the window's Database, which gives the worker thread its own connection.
+    Subclasses implement work(db) and call report_progress while running; tasks that can
+    stop early also override cancel().
+    """
+    progress = pyqtSignal(object)   # Progress snapshot, reported periodically
+    completed = pyqtSignal(object)  # Result of work()
+    failed = pyqtSignal(str)
+
+    def __init__(self, db, parent=None):
+        """
+        Args:
+            db (Database): The database to work on.
+        """
+        super().__init__(parent)
+        self.db = db
+
+    def run(self):
+        """
+        Run the task on the worker thread, reporting through signals.
+        """
+        try:
+            result = self.work(self.db)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        finally:
+            # Each worker runs on a new thread, so do not leave its connection open
+            self.db.release_connection()
+        self.completed.emit(result)
+
+    def work(self, db):
+        raise NotImplementedError
+
+    def cancel(self):
+        """
+        Ask the task to stop early. Tasks that cannot be stopped run to completion.
+        """
+
+    def report_progress(self, progress):
+        # Emit a snapshot, since the task keeps updating the same object
+        self.progress.emit(copy.copy(progress))
+
+
+class LoadWorker(DatabaseTask):
+    """
+    Loads everything the main window shows, so startup never waits for the database.
+    Aggregate counts are delivered first, then the companies in chunks of tree nodes,
+    in display order, with companies and their applications ordered by SQLite.
+    Progress is a 'N companies loaded' string; the result is the number of companies
+    loaded.
+    """
+    aggregates_loaded = pyqtSignal(object)  # dict of status_counts, company_counts, position_counts
+    # active CompanyNodes, rejected CompanyNodes, application sort order, company sort order
+    chunk_loaded = pyqtSignal(object, object, object, object)
+
+    def __init__(self, db, sort_order=DEFAULT_SORT_ORDER, company_sort_order=DEFAULT_COMPANY_SORT_ORDER,
+                 chunk_size=LOAD_CHUNK_SIZE, parent=None):
+        """
+        Args:
+            sort_order (tuple): (field, descending) to order each company's applications by.
+            company_sort_order (tuple): (field, descending) to order the companies by.
+        """
+        super().__init__(db, parent)
+        self.sort_order = sort_order
+        self.company_sort_order = company_sort_order
+        self.chunk_size = chunk_size
+
+    def work(self, db):
+        self.aggregates_loaded.emit({
+            'status_counts': db.get_status_counts(),
+            'company_counts': db.get_company_application_counts(),
+            'position_counts': db.get_position_counts(),
+        })
+        field, descending = self.sort_order
+        company_field, company_descending = self.company_sort_order
+        companies = db.iter_companies_with_applications(order_by=field, descending=descending,
+                                                        company_order_by=company_field,
+                                                        company_descending=company_descending)
+        loaded = 0
+        while True:
+            chunk = list(islice(companies, self.chunk_size))
+            if not chunk:
+                return loaded
+            loaded += len(chunk)
+            self.chunk_loaded.emit(*build_company_nodes(chunk), self.sort_order, self.company_sort_order)
+            self.report_progress(f'{loaded} companies loaded')
+
+
+class ImportWorker(DatabaseTask):
+    """
+    Imports a CSV, JSON Lines or JSON file. Progress and result are ImportProgress objects.
+    """
+    def __init__(self, db, path, format=None, chunk_size=importer.DEFAULT_CHUNK_SIZE, parent=None):
+        super().__init__(db, parent)
+        self.path = path
+        self.format = format
+        self.chunk_size = chunk_size
+
+    def work(self, db):
+        return importer.import_file(db, self.path, format=self.format,
+                                    chunk_size=self.chunk_size,
+                                    progress_callback=self.report_progress)
+
+
+class ExportWorker(DatabaseTask):
+    """
+    Exports applications to a file. Progress and result are the number of rows written.
+    """
+    def __init__(self, db, path, format=None, statuses=None, date_from=None, date_to=None, parent=None):
+        super().__init__(db, parent)
+        self.path = path
+        self.format = format
+        self.statuses = statuses
+        self.date_from = date_from
+        self.date_to = date_to
+
+    def work(self, db):
+        return exporter.export_file(db, self.path, format=self.format, statuses=self.statuses,
+                                    date_from=self.date_from, date_to=self.date_to,
+                                    progress_callback=self.report_progress)
+
+
+class EnrichWorker(DatabaseTask):
+    """
+    Looks up descriptions for every company that has none, as fast as the client's rate
+    limiter allows, and stores them in the database and the cache. Progress is a
+    'done/total companies' string; the result maps company names to the descriptions stored.
+    cancel() ends the batch after the lookup in progress; descriptions found so far stay stored.
+    """
+    def __init__(self, db, client, cache, parent=None):
+        super().__init__(db, parent)
+        self.client = client
+        self.cache = cache
+        self.stop_event = threading.Event()
+
+    def cancel(self):
+        self.stop_event.set()
+
+    def is_cancelled(self):
+        return self.stop_event.is_set()
+
+    def work(self, db):
+        # Imported here so the HTTP client stack is not loaded at startup
+        import opencorporates
+        return opencorporates.enrich_database(
+            db, self.client, self.cache,
+            progress_callback=lambda done, total, company_name, error:
+                self.report_progress(f'{done}/{total} companies'),
+            stop_event=self.stop_event)